@@ -1,4 +1,11 @@
 from XarrayActive.active_xarray import ActiveDataset    # Used by CFAPyX 
 from XarrayActive.active_dask import DaskActiveArray    # Used by CFAPyX
 from XarrayActive.active_chunk import ActiveChunk       # Used by CFAPyX
-from XarrayActive.backend import ActiveBackendEntrypoint
\ No newline at end of file
+from XarrayActive.backend import ActiveBackendEntrypoint
+from XarrayActive.chunk_index import build_chunk_index
+from XarrayActive.active_client import set_active_backend
+from XarrayActive.local_server import LocalActiveServer
+from XarrayActive.instrumentation import ActiveStats
+from XarrayActive.multifile import open_active_mfdataset
+from XarrayActive.metadata_cache import MetadataCache
+from XarrayActive.result_cache import ResultCache
\ No newline at end of file
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+import dask
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial as bind
+
+from dask.array.core import _concatenate2
+from dask.utils import deepmap
+
+from .active_dask import DaskActiveArray, partition_method
+from .instrumentation import record_fallback
+
+class ActiveAsyncScheduler:
+    """
+    Schedules the partition requests of awaitable active reductions. All reductions
+    sharing a scheduler share one pool of threads, which limits the number of
+    requests in flight across every query served by the event loop.
+    """
+
+    description = "Scheduler for awaitable active reductions."
+
+    def __init__(self, max_requests=32):
+        self.max_requests = max_requests
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_requests,
+                    thread_name_prefix='ActiveAsync')
+            return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function in the scheduler's thread pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), bind(func, *args, **kwargs))
+
+    def shutdown(self):
+        """
+        Shut down the thread pool, a new one is created if the scheduler is reused.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+default_scheduler = ActiveAsyncScheduler()
+
+async def active_reduce(array, method, axis=None, skipna=None, scheduler=None):
+    """
+    Awaitable active reduction of a ``DaskActiveArray``. The blocks are resolved to
+    partitions and the partial for each is computed by the same ``partition_method``
+    used by the dask reductions, in the scheduler's thread pool, then the partials are
+    combined on the event loop.
+
+    :param array:       (obj) A DaskActiveArray object.
+
+    :param method:      (str) The reduction to apply, one of mean/max/min/sum.
+
+    :param axis:        (int | tuple) The axes over which to perform the reduction.
+
+    :param skipna:      (bool) Skip NaN values when calculating the reduction.
+
+    :param scheduler:   (obj) The ActiveAsyncScheduler to use, defaults to a shared
+                        scheduler for this process.
+
+    :returns:       A numpy array with the reduced axes removed.
+    """
+    scheduler = scheduler or default_scheduler
+    skipna    = array._get_skipna(skipna)
+
+    if axis is None:
+        axis = tuple(range(array.ndim))
+    elif isinstance(axis, int):
+        axis = (axis,)
+    axis = tuple(a % array.ndim for a in axis)
+
+    # Resolving the blocks gives the partition objects, no data is read here. Any
+    # tasks applied to the partitions (e.g. selections) may still block, so they are
+    # run in the thread pool.
+    blocks = array.to_delayed()
+    partitions = await scheduler.run(dask.compute, *blocks.ravel(), scheduler='sync')
+
+    partials = await asyncio.gather(*[
+        scheduler.run(
+            partition_method, p, method, axis=axis, skipna=skipna, keepdims=True)
+        for p in partitions
+    ])
+
+    grid = np.empty(blocks.shape, dtype=object)
+    for position, p in zip(np.ndindex(blocks.shape), partials):
+        grid[position] = p
+
+    # Partials keep the reduced dimensions, so the grid concatenates to one array
+    # before the reduced axes are removed.
+    def concatenate(field=None):
+        if field is None:
+            pairs = grid.tolist()
+        else:
+            pairs = deepmap(lambda p: p[field], grid.tolist())
+        return _concatenate2(pairs, axes=list(range(array.ndim)))
+
+    if method == 'mean':
+        n     = concatenate('n').sum(axis=axis)
+        total = concatenate('total').sum(axis=axis)
+        return np.divide(total, n).astype(array.dtype, copy=False)
+
+    aggregates = {
+        'max': (np.fmax if skipna else np.maximum).reduce,
+        'min': (np.fmin if skipna else np.minimum).reduce,
+        'sum': np.sum
+    }
+    return aggregates[method](concatenate(), axis=axis).astype(array.dtype, copy=False)
+
+class ActiveAsyncMethods:
+    """
+    Awaitable active reductions for an ``ActiveDataArray``, available as the ``active``
+    property. For example: ``await da.active.amean(dim='time')``.
+    """
+
+    description = "Awaitable active reductions for an ActiveDataArray."
+
+    def __init__(self, dataarray, scheduler=None):
+        self._obj = dataarray
+        self.scheduler = scheduler
+
+    async def amean(self, dim=None, *, skipna=None, keep_attrs=None):
+        return await self._areduce('mean', dim=dim, skipna=skipna, keep_attrs=keep_attrs)
+
+    async def amax(self, dim=None, *, skipna=None, keep_attrs=None):
+        return await self._areduce('max', dim=dim, skipna=skipna, keep_attrs=keep_attrs)
+
+    async def amin(self, dim=None, *, skipna=None, keep_attrs=None):
+        return await self._areduce('min', dim=dim, skipna=skipna, keep_attrs=keep_attrs)
+
+    async def asum(self, dim=None, *, skipna=None, keep_attrs=None):
+        return await self._areduce('sum', dim=dim, skipna=skipna, keep_attrs=keep_attrs)
+
+    async def _areduce(self, method, dim=None, skipna=None, keep_attrs=None):
+        """
+        Compute the reduction without blocking the event loop, then wrap the result
+        in a DataArray with the reduced dimension(s) removed.
+        """
+        obj = self._obj
+        if dim is None or dim is ...:
+            axis = None
+        else:
+            axis = obj.get_axis_num(dim)
+
+        data = obj.variable.data
+        if isinstance(data, DaskActiveArray):
+            result = await active_reduce(
+                data, method, axis=axis, skipna=skipna, scheduler=self.scheduler)
+        else:
+            print("ActiveWarning: Unable to compute active reduction - using standard method.")
+            record_fallback('standard_reduction')
+            scheduler = self.scheduler or default_scheduler
+            reduced = await scheduler.run(
+                lambda: getattr(obj, method)(dim=dim, skipna=skipna).compute())
+            result = reduced.data
+
+        return obj.reduce(
+            lambda *args, **kwargs: result,
+            dim=dim,
+            keep_attrs=keep_attrs)
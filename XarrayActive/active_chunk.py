@@ -1,5 +1,12 @@
 import numpy as np
 from itertools import product
+from dask.utils import parse_bytes
+from concurrent.futures import ThreadPoolExecutor
+
+from .active_client import get_active_class, get_active_backend, active_client
+from .chunk_index import get_chunk_index
+from .instrumentation import record, record_fallback, send_request, context_map
+from .result_cache import get_result_cache, get_result_key
 
 
 class ActiveOptionsContainer:
@@ -15,29 +22,208 @@ class ActiveOptionsContainer:
         return {
             'chunks': self._active_chunks,
             'chunk_limits': self._chunk_limits,
+            'chunk_bytes': self._chunk_bytes,
+            'chunk_index': self._chunk_index,
+            'max_requests': self._max_requests,
+            'backend': self._backend,
+            'slab_bytes': self._slab_bytes,
+            'result_cache': self._result_cache,
+            'column_requests': self._column_requests,
+        }
+
+    @property
+    def partition_options(self):
+        """
+        Subset of the ``active_options`` applied by each ActiveChunk.
+        """
+        return {
+            'chunk_index': self._chunk_index,
+            'max_requests': self._max_requests,
+            'backend': self._backend,
+            'slab_bytes': self._slab_bytes,
+            'result_cache': self._result_cache,
+            'column_requests': self._column_requests,
         }
     
     @active_options.setter
     def active_options(self, value):
         self._set_active_options(**value)
 
-    def _set_active_options(self, chunks={}, chunk_limits=True):
-
-        # Auto chunking is not currently supported - 23/08/24
+    @property
+    def _auto_chunks(self):
+        """
+        Automatic chunking is applied to all dimensions not given an explicit size,
+        if ``chunks`` is 'auto' or any dimension is chunked as 'auto'.
+        """
+        if self._active_chunks == 'auto':
+            return True
+        return 'auto' in self._active_chunks.values()
+
+    def _set_active_options(
+            self,
+            chunks={},
+            chunk_limits=True,
+            chunk_bytes=None,
+            chunk_index=None,
+            max_requests=None,
+            backend=None,
+            slab_bytes=None,
+            result_cache=None,
+            column_requests=False):
+
+        # Default chunking is aligned with the chunks in storage.
         if chunks == {}:
-            raise NotImplementedError(
-                'Default chunking is not implemented, please provide a chunk scheme '
-                ' - active_options = {"chunks": {}}'
-            )
-        
-        if 'auto' in chunks.items():
-            raise NotImplementedError(
-                'Auto chunking is not implemented, please provide a chunk scheme '
-                ' - active_options = {"chunks": {}}'
-            )
+            chunks = 'auto'
 
         self._active_chunks = chunks
         self._chunk_limits = chunk_limits
+        self._chunk_bytes = chunk_bytes
+        self._chunk_index = chunk_index
+        self._max_requests = max_requests
+        self._backend = backend
+        self._slab_bytes = slab_bytes
+        self._result_cache = result_cache
+        self._column_requests = column_requests
+
+class ActivePartial(dict):
+    """
+    Partial result of an active mean for a single chunk, holding the number of
+    valid elements ``n`` and the ``total`` of those elements. Missing values are
+    not counted, so the partials of chunks with different amounts of missing data
+    are combined correctly. As a ``dict`` the partials are concatenated and
+    combined by the dask mean reductions.
+    """
+
+    __slots__ = ()
+
+    description = "Partial result of an active mean for a single chunk."
+
+    def __init__(self, n, total):
+        super().__init__(n=n, total=total)
+
+    @property
+    def n(self):
+        return self['n']
+
+    @property
+    def total(self):
+        return self['total']
+
+def accumulator_dtype(dtype):
+    """
+    Data type used to accumulate totals, float64 for any floating point input and
+    64-bit integers for integer input.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return np.result_type(dtype, 'f8')
+    if dtype.kind in 'iu':
+        return np.dtype(f'{dtype.kind}8')
+    return dtype
+
+def get_missing_values(attributes):
+    """
+    Find the missing data attributes of a variable, in the same order used by
+    PyActiveStorage.
+
+    :param attributes:  (dict) The attributes of the variable.
+
+    :returns:       A tuple of (_FillValue, missing_value, valid_min, valid_max), or
+                    None if the variable defines no missing values.
+    """
+    valid_min = attributes.get('valid_min')
+    valid_max = attributes.get('valid_max')
+    if 'valid_range' in attributes:
+        valid_min, valid_max = attributes['valid_range']
+
+    missing = (
+        attributes.get('_FillValue'),
+        attributes.get('missing_value'),
+        valid_min,
+        valid_max
+    )
+    if all(m is None for m in missing):
+        return None
+    return missing
+
+def mask_missing(data, missing=None):
+    """
+    Replace the missing values of ``data`` with NaN, where a value is missing if it is
+    masked or matches the ``missing`` attributes of the variable. Integer data is only
+    cast to floating point if any values are missing.
+
+    :param data:        (obj) A numpy array or masked array.
+
+    :param missing:     (tuple) The (_FillValue, missing_value, valid_min, valid_max)
+                        of the variable, as given by ``get_missing_values``.
+
+    :returns:       A numpy array.
+    """
+    mask = np.ma.getmaskarray(data) if np.ma.isMaskedArray(data) else None
+    data = np.ma.getdata(data)
+
+    if data.dtype.kind not in 'iuf':
+        return data
+
+    if missing is not None:
+        fill_value, missing_value, valid_min, valid_max = missing
+
+        invalid = np.zeros(data.shape, dtype=bool)
+        if mask is not None:
+            invalid |= mask
+        for value in (fill_value, missing_value):
+            if value is not None:
+                invalid |= np.isin(data, value)
+        if valid_min is not None:
+            invalid |= data < valid_min
+        if valid_max is not None:
+            invalid |= data > valid_max
+        mask = invalid
+
+    if mask is None or not mask.any():
+        return data
+    return np.where(mask, np.nan, data.astype(np.result_type(data.dtype, 'f4'), copy=False))
+
+def reduce_data(data, method, axis, skipna=None):
+    """
+    Standard reduction of the data for a chunk, where missing values have been replaced
+    with NaN. The reduced axes are kept with length 1.
+
+    :param method:      (str) The reduction to apply, one of mean/max/min/sum/count.
+
+    :param axis:        (tuple) The axes over which to perform the reduction.
+
+    :param skipna:      (bool) Skip NaN values, otherwise any NaN gives a NaN result.
+
+    :returns:       A numpy array, or an ``ActivePartial`` of the number of valid values
+                    and their total for the mean.
+    """
+    if method == 'count':
+        return np.sum(~np.isnan(data), axis=axis, dtype='i8', keepdims=True)
+
+    if method in ('mean', 'sum'):
+        dtype = accumulator_dtype(data.dtype)
+        if skipna:
+            total = np.nansum(data, axis=axis, dtype=dtype, keepdims=True)
+        else:
+            total = np.sum(data, axis=axis, dtype=dtype, keepdims=True)
+
+        if method == 'sum':
+            return total
+
+        if skipna:
+            n = np.sum(~np.isnan(data), axis=axis, dtype='i8', keepdims=True)
+        else:
+            size = int(np.prod([data.shape[i] for i in axis]))
+            n = np.broadcast_to(np.int64(size), total.shape)
+        return ActivePartial(n, total)
+
+    # The 'fmax' and 'fmin' ufuncs ignore NaN values without any warnings for all-NaN slices.
+    reduction = {
+        'max': np.fmax if skipna else np.maximum,
+        'min': np.fmin if skipna else np.minimum,
+    }[method]
+    return reduction.reduce(data, axis=axis, keepdims=True)
 
 class ActiveChunk:
     """
@@ -46,6 +232,25 @@ class ActiveChunk:
     """
 
     description = "Container class for Active routines performed on each chunk."
+
+    # Shape of the chunks in storage, if known.
+    storage_chunks = None
+
+    # Options applied to the active methods for this chunk.
+    active_options = {}
+
+    # Missing data attributes of the source variable, if any.
+    missing = None
+
+    # Data is decoded as it is read, with the (scale_factor, add_offset) to unpack it if set.
+    masked = False
+    scale  = None
+
+    # Size of the slabs read when reducing without Active, if not set in the active options.
+    slab_bytes = 64 * 2**20
+
+    # Location (offset, dtype, shape) of the source variable if it may be memory-mapped.
+    memmap = None
     
     def _post_process_data(self, data):
         """
@@ -53,32 +258,183 @@ class ActiveChunk:
         """
         return data
 
+    def _decode_data(self, data):
+        """
+        Replace the missing values in the raw data for this chunk with NaN, then apply the
+        scale factor and offset if the data is packed.
+        """
+        data = mask_missing(data, self.missing)
+        if self.scale is not None:
+            scale_factor, add_offset = self.scale
+            data = data * scale_factor + add_offset
+        return data
+
+    def _read_data(self):
+        """
+        Read the data for this chunk without Active, overriden where a faster
+        read is available.
+        """
+        return np.array(self)
+
+    def _get_active_class(self):
+        """
+        The backend given in the active options for this chunk, otherwise the Active class
+        or backend for this process.
+        """
+        return self.active_options.get('backend') or get_active_class()
+
+    def _reduce_memmap(self):
+        """
+        Memory-mapped data is reduced here unless a backend is set for this chunk or
+        process, as the Active package would only read the same local file.
+        """
+        return (
+            self.memmap is not None and 
+            not self.active_options.get('backend') and 
+            get_active_backend() is None)
+
+    def _get_data(self, Active=None):
+        """
+        Read the raw data for this chunk, from the Active client if available, with any
+        missing values replaced by NaN.
+        """
+        if Active is None:
+            data = self._read_data()
+            record(local_reads=1, bytes_local=data.nbytes)
+        else:
+            extent = tuple(self.get_extent())
+            with active_client(Active, self.filename, self.address) as active:
+                data = self._post_process_data(send_request(active, extent))
+
+        if self.masked:
+            # Already decoded by the post-processing.
+            return data
+        return mask_missing(data, self.missing)
+
+    def _packed_method(self, method):
+        """
+        The reduction of the packed values which gives ``method`` once unpacked. Unpacking
+        is monotonic, so the max and min are swapped for a negative scale factor.
+        """
+        if self.scale is not None and self.scale[0] < 0:
+            return {'max': 'min', 'min': 'max'}.get(method, method)
+        return method
+
+    def _unpack_result(self, method, value, n):
+        """
+        Apply the scale factor and offset to the reduction of packed values. Unpacking is
+        linear, so applies to the total of the ``n`` valid values by adding the offset once
+        for each value.
+        """
+        if self.scale is None:
+            return value
+
+        scale_factor, add_offset = self.scale
+        if method in ('mean', 'sum'):
+            return value * scale_factor + add_offset * n
+        return value * scale_factor + add_offset
+
+    def _standard_mean(self, axes=None, skipna=None, **kwargs):
+        """
+        Standard mean routine if Active not available, giving the number of valid values
+        and their total so the results from all chunks may be combined.
+        """
+        return self._standard_reduce('mean', axes, skipna=skipna)
+
     def _standard_sum(self, axes=None, skipna=None, **kwargs):
         """
         Standard sum routine matches the normal routine for dask, required at this
         stage if Active mean/sum not available.
         """
+        return self._standard_reduce('sum', axes, skipna=skipna)
 
-        arr = np.array(self)
-        if skipna:
-            total = np.nansum(arr, axis=axes, **kwargs)
-        else:
-            total = np.sum(arr, axis=axes, **kwargs)
-        return total
+    def _standard_count(self, axes=None, skipna=None, **kwargs):
+        """
+        Standard count of the non-NaN values if Active not available.
+        """
+        return self._standard_reduce('count', axes)
     
     def _standard_max(self, axes=None, skipna=None, **kwargs):
         """
         Standard max routine if Active not available, warning will be given.
-        Kwargs may be necessary to add here.
+        NaN values are ignored if ``skipna`` is set.
         """
-        return np.max(self, axis=axes)
+        return self._standard_reduce('max', axes, skipna=skipna)
     
     def _standard_min(self, axes=None, skipna=None, **kwargs):
         """
         Standard min routine if Active not available, warning will be given.
-        Kwargs may be necessary to add here.
+        NaN values are ignored if ``skipna`` is set.
+        """
+        return self._standard_reduce('min', axes, skipna=skipna)
+
+    def _standard_reduce(self, method, axes=None, skipna=None, Active=None):
+        """
+        Reduce this chunk here rather than by Active, reading the data in slabs of at
+        most ``slab_bytes`` so the memory used does not depend on the size of the chunk.
+        The partial result of each slab is folded into accumulators of the output size.
+
+        :param Active:      (class) Read the raw data of each slab with a request to
+                            Active, otherwise the data is read locally.
+
+        :returns:       The same result as ``active_method``.
         """
-        return np.min(self, axis=axes)
+        if axes is None:
+            axes = tuple(range(self.ndim))
+
+        slabs = plan_slabs(
+            self.shape,
+            np.dtype(self.dtype).itemsize,
+            self.active_options.get('slab_bytes') or self.slab_bytes,
+            storage_chunks=self.storage_chunks)
+
+        if len(slabs) == 1:
+            return reduce_data(self._get_data(Active), method, axes, skipna=skipna)
+
+        newshape = [1 if dim in axes else size for dim, size in enumerate(self.shape)]
+
+        total  = None
+        count  = np.zeros(newshape, dtype='i8')
+        filled = np.zeros(newshape, dtype=bool)
+
+        combine = {
+            'max': np.fmax if skipna else np.maximum,
+            'min': np.fmin if skipna else np.minimum,
+        }
+
+        def reduce_slab(slab):
+            return reduce_data(
+                self.copy(extent=list(slab))._get_data(Active), method, axes, skipna=skipna)
+
+        if Active is None:
+            partials = map(reduce_slab, slabs)
+        else:
+            partials = self._map_requests(reduce_slab, slabs)
+
+        for slab, partial in zip(slabs, partials):
+            region  = tuple(
+                slice(0, 1) if dim in axes else ext for dim, ext in enumerate(slab))
+
+            if method == 'mean':
+                count[region] += partial.n
+                partial = partial.total
+
+            if total is None:
+                total = np.zeros(newshape, dtype=partial.dtype)
+            elif not np.can_cast(partial.dtype, total.dtype):
+                # Integer partials become floating point if any values are missing.
+                total = total.astype(np.result_type(total.dtype, partial.dtype))
+
+            if method in ('mean', 'sum', 'count'):
+                total[region] += partial
+            else:
+                total[region] = np.where(
+                    filled[region], combine[method](total[region], partial), partial)
+                filled[region] = True
+
+        if method == 'mean':
+            return ActivePartial(count, total)
+        return total
 
     def _numel(self, method, axes=None):
         """
@@ -86,122 +442,451 @@ class ActiveChunk:
         dask to combine reductions from all different chunks.
         Example:
             (2,3,4) chunk reduced along second dimension. Will
-            give a (2,3) array where each value is 4 - for the 
+            give a (2,1,4) view where each value is 3 - for the 
             length of the dimension along which a reduction
             took place.
 
+        The count is the same for every element, so a read-only
+        broadcast view of a single value is returned.
         """
-        # Applied reduction across all axes
-        if not axes:
-            return self.size
-        
+        if axes is None:
+            axes = range(self.ndim)
+
         size = 1
         for i in axes:
             size *= self.shape[i]
-        newshape = list(self.shape)
-        for ax in axes:
-            newshape[ax] = 1
+        newshape = [1 if dim in axes else s for dim, s in enumerate(self.shape)]
 
-        return np.full(newshape, size)
+        return np.broadcast_to(np.int64(size), newshape)
 
     def active_method(self, method, axis=None, skipna=None, **kwargs):
         """
         Use PyActiveStorage package functionality to perform mean of this Fragment.
+        Missing values are never included in the result, and NaN values are ignored
+        if ``skipna`` is set.
 
         :param axis:        (int) The axes over which to perform the active_mean operation.
 
         :param skipna:      (bool) Skip NaN values when calculating the mean.
 
         :returns:       A ``duck array`` (numpy-like) with the reduced array or scalar value, 
-                        as specified by the axes parameter.
+                        as specified by the axes parameter. For the mean an ``ActivePartial``
+                        of the number of valid values and their total is returned instead, 
+                        for combining with the other chunks.
+        """
+
+        # Properly format the 'axis' kwarg.
+        if axis is None:
+            axis = tuple([i for i in range(self.ndim)])
+
+        cache = get_result_cache(self.active_options.get('result_cache'))
+        if cache is None:
+            return self._compute_method(method, axis, skipna=skipna, **kwargs)
+
+        key = get_result_key(
+            self.filename,
+            self.address,
+            self.get_extent(),
+            method,
+            axis,
+            skipna=skipna,
+            decoding=(self.masked, self.scale, self.missing),
+            **kwargs)
+        if key is None:
+            return self._compute_method(method, axis, skipna=skipna, **kwargs)
+
+        result = cache.get(key)
+        if result is not None:
+            record(cached=1)
+            return result
+
+        result = self._compute_method(method, axis, skipna=skipna, **kwargs)
+        cache.put(key, result)
+        return result
+
+    def _compute_method(self, method, axis, skipna=None, **kwargs):
+        """
+        Compute the reduction of this chunk for ``active_method``, using the chunk index,
+        Active or the standard methods in that order.
         """
 
         standard_methods = {
-            'mean': self._standard_sum,
+            'mean': self._standard_mean,
             'sum' : self._standard_sum,
             'max' : self._standard_max,
-            'min' : self._standard_min
+            'min' : self._standard_min,
+            'count': self._standard_count
         }
-        partial = None
-        n = self._numel(method, axes=axis)
 
-        try:
-            from activestorage.active import Active
-        except ImportError:
+        if len(axis) == self.ndim:
+            # Reductions over whole chunks in storage may be answered by the chunk index.
+            indexed = self._indexed_method(method, skipna=skipna)
+            if indexed is not None:
+                return indexed
+
+        if method in ('var', 'argmax', 'argmin'):
+            record(raw_reductions=1)
+            return self._raw_method(method, axis, skipna=skipna)
+
+        if self._reduce_memmap():
+            return standard_methods[method](axes=axis, skipna=skipna, **kwargs)
+
+        Active = self._get_active_class()
+        if Active is None:
             # Unable to import Active package. Default to using normal mean.
             print("ActiveWarning: Unable to import active module - defaulting to standard method.")
-            partial = {
-                'n': n,
-                'total': standard_methods[method](axes=axis, skipna=skipna, **kwargs)
-            }
-
-        if not partial:
-            
-            # Create Active client
-            active = Active(self.filename, self.address)
-            active.method = method
-
-            # Fetch extent for this chunk instance.
-            extent = tuple(self.get_extent())
+            record_fallback('no_active')
+            return standard_methods[method](axes=axis, skipna=skipna, **kwargs)
 
-            # Properly format the 'axis' kwarg.
-            if axis == None:
-                axis = tuple([i for i in range(self.ndim)])
-
-            # Determine reduction parameter for combining chunk results for dask.
-            n = self._numel(method, axes=axis)
-
-            if len(axis) == self.ndim:
-                data   = active[extent]
-                t = self._post_process_data(data) * n
-
-                partial = {
-                    'n': n,
-                    'total': t
-                }
-
-        if not partial:
-            # Experimental Recursive requesting to get each 1D column along the axes being requested.
-            # - May be very bad performance due to many requests for (1,1,X) shapes
-            range_recursives = []
-            for dim in range(self.ndim):
-                if dim not in axis:
-                    range_recursives.append(range(extent[dim].start, extent[dim].stop))
-                else:
-                    range_recursives.append(extent[dim])
-            results = np.array(self._get_elements(active, range_recursives, hyperslab=[]))
-
-            t = self._post_process_data(results) * n
-            partial = {
-                'n': n,
-                'total': t
-            }
+        # Fetch extent for this chunk instance.
+        extent = tuple(self.get_extent())
 
-        if method == 'mean':
-            return partial
+        if len(axis) == self.ndim:
+            return self._active_request(Active, method, extent, skipna=skipna)
+
+        # Partial reduction - batched requests for the kept axes.
+        return self._get_hyperslabs(Active, method, extent, axis, skipna=skipna)
+
+    def _active_request(self, Active, method, extent, axis=None, skipna=None):
+        """
+        Reduce the ``extent`` with a single Active request. Active excludes missing values
+        from each reduction, so the reduction is requested as components to give the
+        number of valid values. Packed values are unpacked from the result, not before
+        the reduction. Missing values are treated as NaN, so give a NaN result unless 
+        ``skipna`` is set. Active does not skip NaN values, so if any are found and
+        ``skipna`` is set, the reduction is repeated using the raw data. The count is
+        the number of valid values given with a sum, where the sum is only used to
+        find any NaN values.
+
+        :returns:       The same result as ``active_method``.
+        """
+        if axis is None:
+            axis = tuple(range(self.ndim))
+            request_axis = None
         else:
-            return partial['total']/partial['n']
+            request_axis = axis
+
+        newshape = [1 if dim in axis else size for dim, size in enumerate(self.shape)]
+        packed   = 'sum' if method == 'count' else self._packed_method(method)
+
+        with active_client(
+                Active, self.filename, self.address, packed, axis=request_axis,
+                components=True) as active:
+            data = send_request(active, extent)
+
+        n     = np.ma.filled(data['n'], 0).astype('i8', copy=False).reshape(newshape)
+        if method == 'count':
+            if _has_nan(data['sum']):
+                record_fallback('nan_reread')
+                return reduce_data(self._get_data(Active), method, axis)
+            return n
+
+        value = data['sum' if method == 'mean' else packed]
+        if method in ('mean', 'sum'):
+            # Integer totals are widened before unpacking, so the scale factor and offset
+            # are never applied in the data type of the packed values.
+            value = np.ma.filled(value.astype(accumulator_dtype(value.dtype)), 0)
+        else:
+            # Values with no valid elements are masked.
+            value = mask_missing(value)
+        value = self._unpack_result(method, value.reshape(newshape), n)
+
+        if not skipna:
+            size  = int(np.prod([self.shape[i] for i in axis]))
+            value = np.where(n < size, np.nan, value)
+            n     = self._numel(method, axes=axis)
+
+        data = ActivePartial(n, value) if method == 'mean' else value
 
-    def _get_elements(self, active, recursives, hyperslab=[]):
+        if skipna and _has_nan(data):
+            record_fallback('nan_reread')
+            data = reduce_data(self._get_data(Active), method, axis, skipna=skipna)
+        return data
+
+    def _raw_method(self, method, axis, skipna=None):
         """
-        Recursive function to fetch and arrange the appropriate column slices
-        from Active.
+        Reductions not provided by Active are computed from the raw data of this
+        chunk, so only the partial result is passed on to be combined.
+
+        :returns:       For ``var``, a dict with the count ``n``, ``mean`` and sum
+                        of squared differences ``M2`` for combining with the Welford/Chan
+                        parallel formulas. For ``argmax`` and ``argmin``, a record array
+                        of the extreme values ``vals`` and their position ``arg`` within
+                        this chunk, flattened over the reduced axes.
         """
-        dimarray = []
-        if not len(recursives) > 0:
+        Active = None
+        if not self._reduce_memmap():
+            Active = self._get_active_class()
+            if Active is None:
+                print("ActiveWarning: Unable to import active module - defaulting to standard method.")
+                record_fallback('no_active')
+
+        # Missing values are treated as NaN.
+        data  = self._get_data(Active)
+        data  = data.astype(np.result_type(data.dtype, 'f8'), copy=False)
+        valid = ~np.isnan(data)
+
+        if method in ('argmax', 'argmin'):
+            # Value and position (flattened over the reduced axes) of each extreme.
+            values, position = arg_select(data, axis, method, skipna=skipna)
+            newshape = [1 if dim in axis else size for dim, size in enumerate(data.shape)]
+
+            result = np.empty(newshape, dtype=[('vals', data.dtype), ('arg', 'i8')])
+            result['vals'] = values.reshape(newshape)
+            result['arg']  = position.reshape(newshape)
+            return result
+
+        if skipna:
+            n = np.sum(valid, axis=axis, keepdims=True, dtype='i8')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.nansum(data, axis=axis, keepdims=True) / n
+            M2 = np.nansum((data - mean)**2, axis=axis, keepdims=True)
+        else:
+            n    = self._numel(method, axes=axis)
+            mean = np.mean(data, axis=axis, keepdims=True)
+            M2   = np.sum((data - mean)**2, axis=axis, keepdims=True)
 
-            # Perform active slicing and meaning here.
-            return active[tuple(hyperslab)].flatten()[0]
-        
-        current = recursives[0]
+        return {
+            'n': n,
+            'mean': mean,
+            'M2': M2
+        }
 
-        if type(current) == slice:
-            newslab = hyperslab + [current]
-            dimarray.append(self._get_elements(active, recursives[1:], hyperslab=newslab))
+    def _indexed_method(self, method, skipna=None):
+        """
+        Perform a reduction over all axes using the chunk index, if one is available.
+        Chunks in storage which are only partly covered by this chunk are reduced
+        with ``active_method`` as normal.
 
+        :returns:       The same result as ``active_method``, or None if the chunk index
+                        does not cover any whole chunks in storage.
+        """
+        if method not in ('mean', 'sum', 'max', 'min', 'count'):
+            return None
+
+        index = get_chunk_index(
+            self.filename, self.address, self.active_options.get('chunk_index'))
+        if index is None:
+            return None
+
+        extent  = self.get_extent()
+        covered = index.covered_extent(extent)
+        if covered is None:
+            return None
+
+        stats  = index.summarise(covered)
+        axis   = tuple(range(self.ndim))
+        kshape = (1,) * self.ndim
+
+        # Missing and NaN values are not counted, and give a NaN result unless skipped.
+        size = int(np.prod([c.stop - c.start for c in covered]))
+
+        if method == 'count':
+            value = stats['count']
+        elif stats['count'] < size and not skipna:
+            value = np.nan
         else:
-            for i in current:
-                newslab = hyperslab + [slice(i, i+1)]
-                dimarray.append(self._get_elements(active, recursives[1:], hyperslab=newslab))
+            value = {
+                'mean': stats['sum'],
+                'sum' : stats['sum'],
+                'max' : stats['max'],
+                'min' : stats['min']
+            }[self._packed_method(method)]
+            value = self._unpack_result(method, value, stats['count'])
+
+        n = stats['count'] if skipna else size
+        record(indexed=1)
+
+        parts = [ActivePartial(np.broadcast_to(np.int64(n), kshape), np.full(kshape, value))]
+
+        # Remaining partly-covered regions are fetched from storage.
+        def fetch_region(region):
+            local = [slice(r.start - e.start, r.stop - e.start) for r, e in zip(region, extent)]
+            result = self.copy(extent=local).active_method(method, axis=axis, skipna=skipna)
+            if method != 'mean':
+                result = {'n': None, 'total': result}
+            return result
+
+        parts += self._map_requests(fetch_region, _edge_regions(extent, covered))
+
+        if method == 'mean':
+            return ActivePartial(
+                sum(p['n'] for p in parts),
+                sum(p['total'] for p in parts)
+            )
+
+        combine = {
+            'sum': np.add,
+            'count': np.add,
+            'max': np.fmax if skipna else np.maximum,
+            'min': np.fmin if skipna else np.minimum,
+        }[method]
+        result = parts[0]['total']
+        for p in parts[1:]:
+            result = combine(result, p['total'])
+        return result
+
+    def _get_hyperslabs(self, Active, method, extent, axis, skipna=None):
+        """
+        Fetch the reduction of this chunk along a subset of the axes. If the Active
+        backend supports reductions along specific axes, a single vectorised request
+        is made. Otherwise the raw data is fetched in slabs of at most ``slab_bytes``,
+        aligned with the chunks in storage, and reduced here, so the number of requests
+        depends on the size of the chunk and not on the number of columns. If
+        ``column_requests`` is set in the active options, each column along the
+        reduced axes is instead reduced by Active with its own request.
+
+        :returns:       The same result as ``active_method``, where each reduced axis 
+                        has length 1.
+        """
+        if _supports_axis(Active):
+            return self._active_request(Active, method, extent, axis=axis, skipna=skipna)
+
+        record_fallback('no_axis_support')
+        if not self.active_options.get('column_requests'):
+            return self._standard_reduce(method, axis, skipna=skipna, Active=Active)
+
+        newshape = [1 if dim in axis else size for dim, size in enumerate(self.shape)]
+
+        columns = list(product(*[
+            [slice(0, size)] if dim in axis else [slice(i, i+1) for i in range(size)]
+            for dim, size in enumerate(self.shape)
+        ]))
+
+        def reduce_column(column):
+            chunk = self.copy(extent=list(column))
+            return chunk._active_request(
+                Active, method, tuple(chunk.get_extent()), skipna=skipna)
+
+        def assemble(parts):
+            result = np.empty(newshape, dtype=np.result_type(*parts))
+            for column, data in zip(columns, parts):
+                position = tuple(
+                    slice(0, 1) if dim in axis else c for dim, c in enumerate(column))
+                result[position] = data
+            return result
+
+        parts = self._map_requests(reduce_column, columns)
+        if method == 'mean':
+            return ActivePartial(
+                assemble([p.n for p in parts]),
+                assemble([p.total for p in parts])
+            )
+        return assemble(parts)
+
+    def _map_requests(self, func, requests):
+        """
+        Apply ``func`` to each of the storage requests made by this chunk. Requests
+        are sent concurrently by a pool of threads if ``max_requests`` is set in the
+        active options, results are always returned in the order of ``requests``.
+        """
+        requests = list(requests)
+        max_requests = self.active_options.get('max_requests') or 1
+
+        if max_requests < 2 or len(requests) < 2:
+            return [func(r) for r in requests]
+
+        workers = min(max_requests, len(requests))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(context_map(executor, func, requests))
+
+def plan_slabs(shape, itemsize, slab_bytes, storage_chunks=None):
+    """
+    Split an array into slabs of at most ``slab_bytes``, where possible. The array is
+    split along the first dimension for which a single row of the trailing dimensions
+    fits within the limit, taking one element at a time along any earlier dimensions.
+    Slabs are aligned with the chunks in storage along the split dimension, if known.
 
-        return dimarray
+    :param shape:           (tuple) The shape of the array.
+
+    :param itemsize:        (int) The number of bytes for each element.
+
+    :param slab_bytes:      (int | str) The maximum size of each slab.
+
+    :param storage_chunks:  (tuple) The shape of the chunks in storage, if known.
+
+    :returns:       A list of tuples of slices, each selecting a slab of the array.
+    """
+    slab_bytes = parse_bytes(slab_bytes)
+
+    row = itemsize
+    for size in shape:
+        row *= size
+    if row <= slab_bytes:
+        return [tuple(slice(0, size) for size in shape)]
+
+    # Find the split dimension, where ``row`` is the size of one element along it.
+    split = 0
+    row   = row // max(shape[0], 1)
+    while row > slab_bytes and split < len(shape) - 1:
+        split += 1
+        row    = row // max(shape[split], 1)
+
+    step = max(slab_bytes // max(row, 1), 1)
+    if storage_chunks and step >= storage_chunks[split]:
+        step -= step % storage_chunks[split]
+
+    ranges = [[slice(i, i+1) for i in range(size)] for size in shape[:split]]
+    ranges.append([
+        slice(i, min(i + step, shape[split])) for i in range(0, shape[split], step)])
+    ranges += [[slice(0, size)] for size in shape[split+1:]]
+
+    return list(product(*ranges))
+
+def arg_select(values, axis, method, skipna=None):
+    """
+    Find the first position of the maximum or minimum of ``values`` over the
+    reduced ``axis``, as a flat index over those axes in C order. With ``skipna``
+    NaN values are ignored, unless all values are NaN.
+
+    :returns:       The selected values and their positions, each with the shape of
+                    the kept axes.
+    """
+    axis = sorted(axis)
+    kept = [dim for dim in range(values.ndim) if dim not in axis]
+    flat = np.transpose(values, kept + axis).reshape(
+        [values.shape[dim] for dim in kept] + [-1])
+
+    choose = flat
+    if skipna and flat.dtype.kind in 'cf':
+        fill   = -np.inf if method == 'argmax' else np.inf
+        choose = np.where(np.isnan(flat), fill, flat)
+
+    position = getattr(np, method)(choose, axis=-1)
+    selected = np.take_along_axis(flat, position[..., None], axis=-1)[..., 0]
+    return selected, position
+
+def _edge_regions(extent, covered):
+    """
+    Split the parts of ``extent`` outside the ``covered`` region into a set of
+    non-overlapping regions.
+    """
+    regions = []
+    remaining = list(extent)
+    for dim, (ext, cov) in enumerate(zip(extent, covered)):
+        if ext.start < cov.start:
+            regions.append(remaining[:dim] + [slice(ext.start, cov.start)] + remaining[dim+1:])
+        if cov.stop < ext.stop:
+            regions.append(remaining[:dim] + [slice(cov.stop, ext.stop)] + remaining[dim+1:])
+        remaining[dim] = cov
+    return regions
+
+_axis_support = {}
+
+def _supports_axis(Active):
+    """
+    Determine if the Active class or backend accepts an ``axis`` parameter, enabling
+    reductions along specific axes in a single request.
+    """
+    if Active not in _axis_support:
+        import inspect
+        try:
+            _axis_support[Active] = 'axis' in inspect.signature(Active).parameters
+        except (TypeError, ValueError):
+            _axis_support[Active] = False
+    return _axis_support[Active]
+
+def _has_nan(data):
+    if isinstance(data, ActivePartial):
+        data = data.total
+    return np.asarray(data).dtype.kind == 'f' and bool(np.isnan(data).any())
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .instrumentation import record
+
+_NOT_IMPORTED = object()
+_active_class = _NOT_IMPORTED
+
+# Backend used in place of the Active class for all requests, if set.
+_active_backend = None
+
+def set_active_backend(backend=None):
+    """
+    Set the backend used for all Active requests in this process, for example a
+    ``LocalActiveServer``. The backend is called with the same arguments as the Active
+    class and must return a client with the same interface.
+
+    :param backend:     (callable) The backend to use, or None to use the Active class
+                        from the PyActiveStorage package.
+    """
+    global _active_backend
+    _active_backend = backend
+    active_pool.clear()
+
+def get_active_backend():
+    """
+    The backend set by ``set_active_backend`` for this process, or None.
+    """
+    return _active_backend
+
+def get_active_class():
+    """
+    Import the Active class from the PyActiveStorage package once per process.
+
+    :returns:       The backend set by ``set_active_backend`` if any, otherwise the
+                    ``activestorage.active.Active`` class, or None if the package
+                    cannot be imported.
+    """
+    global _active_class
+    if _active_backend is not None:
+        return _active_backend
+    if _active_class is _NOT_IMPORTED:
+        try:
+            from activestorage.active import Active
+        except ImportError:
+            Active = None
+        _active_class = Active
+    return _active_class
+
+class ActiveClientPool:
+    """
+    Process-local pool of Active clients, so the file metadata and chunk index parsed
+    by each client can be reused by all the partitions of a reduction. Clients are
+    checked out for the duration of a request, so a single client is never used by
+    two threads at once. Idle clients are evicted in least-recently-used order once
+    the pool exceeds ``maxsize``.
+    """
+
+    description = "Process-local pool of Active clients."
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._reset()
+
+    def _reset(self):
+        """
+        Discard all idle clients, used on creation and after a fork since clients
+        may hold open file handles or sessions from the parent process.
+        """
+        self._pid   = os.getpid()
+        self._lock  = threading.Lock()
+        self._idle  = OrderedDict()
+        self._count = 0
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+    def acquire(self, key, factory):
+        """
+        Check out an idle client for this key, or create a new one.
+
+        :param key:         (tuple) The (backend, filename, address, method, axis) identifier
+                            for the client.
+
+        :param factory:     (callable) Creates a new client if none are idle.
+        """
+        self._check_pid()
+        with self._lock:
+            clients = self._idle.get(key)
+            if clients:
+                self._count -= 1
+                client = clients.pop()
+                if not clients:
+                    del self._idle[key]
+                return client
+        return factory()
+
+    def release(self, key, client):
+        """
+        Return a client to the pool, evicting the least recently used idle clients
+        if the pool is full.
+        """
+        self._check_pid()
+        with self._lock:
+            self._idle.setdefault(key, []).append(client)
+            self._idle.move_to_end(key)
+            self._count += 1
+
+            while self._count > self.maxsize:
+                oldest = next(iter(self._idle))
+                self._idle[oldest].pop(0)
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+                self._count -= 1
+
+    def clear(self):
+        """
+        Discard all idle clients.
+        """
+        with self._lock:
+            self._idle.clear()
+            self._count = 0
+
+    def __len__(self):
+        return self._count
+
+active_pool = ActiveClientPool()
+
+@contextmanager
+def active_client(Active, filename, address, method=None, axis=None, components=False):
+    """
+    Context manager providing an Active client from the process-local pool. The
+    method and components flag are set on the client before use, as Active may
+    reset the method after each request.
+
+    :param Active:      (class) The Active class or backend from which to create new clients.
+
+    :param filename:    (str) The path to the source file.
+
+    :param address:     (str) The variable name within the source file.
+
+    :param method:      (str) The active method to apply, or None for raw data.
+
+    :param axis:        (tuple) The axes of reduction, if supported by ``Active``.
+
+    :param components:  (bool) Return the reduction as a dict of the processed value
+                        and the number of valid values, for methods other than None.
+    """
+    key = (Active, filename, address, method, axis)
+
+    def factory():
+        start = time.perf_counter()
+        if axis is None:
+            client = Active(filename, address)
+        else:
+            client = Active(filename, address, axis=axis)
+        record(clients=1, client_time=time.perf_counter() - start)
+        return client
+
+    client = active_pool.acquire(key, factory)
+    client.method = method
+    client.components = components
+
+    # Clients are only returned to the pool if the request succeeded.
+    yield client
+    active_pool.release(key, client)
@@ -1,10 +1,23 @@
 import dask.array as da
-from dask.array.reductions import mean_agg, mean_combine, nanmax, nanmin
+from dask.array.reductions import mean_agg, mean_combine, nanmax, nanmin, _tree_reduce
 from dask.utils import deepmap
 from dask.array.core import _concatenate2
+from dask.base import tokenize
+from dask.highlevelgraph import HighLevelGraph
 import numpy as np
 
-from .active_chunk import ActiveChunk
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from itertools import accumulate, product
+import operator
+import os
+
+from .active_chunk import ActiveChunk, accumulator_dtype, arg_select
+from .instrumentation import partition_scope, record_fallback
+
+# Number of partitions reduced at once by streaming reductions, where not set by the
+# ``max_requests`` option. Bounded as for the default pool of a ThreadPoolExecutor.
+STREAM_REQUESTS = min(32, (os.cpu_count() or 1) + 4)
 
 ## Partition Methods are the first step in the Dask Reductions.
 
@@ -19,13 +32,67 @@ def partition_min(arr, *args, **kwargs):
     
 def partition_sum(arr, *args, **kwargs):
     return partition_method(arr, 'sum', *args, **kwargs)
+
+def partition_var(arr, *args, **kwargs):
+    return partition_method(arr, 'var', *args, **kwargs)
+
+def partition_count(arr, *args, **kwargs):
+    return partition_method(arr, 'count', *args, **kwargs)
+
+def partition_arg(arr, axis, offset, shape, method=None, skipna=None):
+    """
+    Arg reduction of a single partition, where the position of each extreme is
+    converted to a flat index over the reduced axes of the whole array using the
+    ``offset`` of this partition.
+    """
+    result = partition_method(arr, method, axis=axis, skipna=skipna)
+
+    local = np.unravel_index(result['arg'], [arr.shape[i] for i in axis])
+    result['arg'] = np.ravel_multi_index(
+        tuple(pos + offset[i] for pos, i in zip(local, axis)),
+        [shape[i] for i in axis])
+    return result
     
+def partition_weighted(arr, weights, axis=None, keepdims=True, partial_axis=None):
+    """
+    Weighted partials of a single partition. The partition is reduced by one active mean
+    request over the ``partial_axis`` the weights do not depend on, then the ``weights``
+    of this partition are applied to the valid totals and counts and summed over the
+    remaining reduced axes.
+
+    :returns:       A record array of the weighted ``total``, the sum of the weights of
+                    the valid values ``weights`` and the number of valid values ``n``.
+    """
+    # All valid values are reduced, the total is only set to NaN on aggregation.
+    result = partition_method(arr, 'mean', axis=partial_axis, skipna=True, keepdims=True)
+    if result is None:
+        return None
+
+    n     = np.asarray(result['n'], dtype='i8')
+    total = np.asarray(result['total'], dtype='f8')
+
+    # Weights are constant along the partial axes.
+    weights = weights[tuple(
+        slice(0, 1) if i in partial_axis else slice(None) for i in range(arr.ndim))]
+    weighted_axis = tuple(i for i in axis if i not in partial_axis)
+
+    partial = np.empty(
+        [1 if i in axis else s for i, s in enumerate(arr.shape)],
+        dtype=[('total', 'f8'), ('weights', 'f8'), ('n', 'i8')])
+    partial['total']   = np.sum(total * weights, axis=weighted_axis, keepdims=True)
+    partial['weights'] = np.sum(n * weights, axis=weighted_axis, keepdims=True)
+    partial['n']       = np.sum(n, axis=weighted_axis, keepdims=True)
+    return partial
+
 def partition_method(arr, method, *args, **kwargs):
     if hasattr(arr,'active_method'):
         # Active method for each array partition
-        return arr.active_method(method,*args, **kwargs)
+        with partition_scope(method, arr):
+            return arr.active_method(method,*args, **kwargs)
     elif arr.size != 0:
         print('ActiveWarning: Using standard mean given non-active array partition')
+        record_fallback('non_active_partition')
+        kwargs.pop('skipna', None)
         return arr.mean(*args, **kwargs)
     else:
         # Computing meta - dask operation not fully utilised.
@@ -40,14 +107,247 @@ def general_combine(pairs, axis=None):
         pairs = [pairs]
     return _concatenate2(pairs, axes=axis)
 
-def max_agg(pairs, axis=None, **kwargs):
-    return general_combine(pairs, axis=axis).max(axis=axis, **kwargs)
+def max_agg(pairs, axis=None, skipna=None, **kwargs):
+    # Partials with no valid values are NaN, so are ignored if skipna is set.
+    reduction = np.fmax if skipna else np.maximum
+    return reduction.reduce(general_combine(pairs, axis=axis), axis=tuple(axis), **kwargs)
+
+def min_agg(pairs, axis=None, skipna=None, **kwargs):
+    reduction = np.fmin if skipna else np.minimum
+    return reduction.reduce(general_combine(pairs, axis=axis), axis=tuple(axis), **kwargs)
+
+def sum_agg(pairs, axis=None, dtype=None, **kwargs):
+    # Partial sums are accumulated as float64, cast back only for the final result.
+    total = general_combine(pairs, axis=axis).sum(axis=axis, **kwargs)
+    if dtype is not None:
+        total = total.astype(dtype, copy=False)
+    return total
+
+def count_agg(pairs, axis=None, **kwargs):
+    return general_combine(pairs, axis=axis).sum(axis=axis, dtype='i8', **kwargs)
+
+## Combining weighted partials
+# - Each partial holds the weighted total, sum of weights and count of the valid
+#   values, which are all summed.
+
+def weighted_combine(data, axis=None, keepdims=True, **kwargs):
+    result = np.empty(
+        [1 if i in axis else s for i, s in enumerate(data.shape)], dtype=data.dtype)
+    for field in data.dtype.names:
+        result[field] = data[field].sum(axis=axis, keepdims=True)
+
+    if not keepdims:
+        result = np.squeeze(result, axis=axis)
+    return result
+
+def weighted_agg(data, axis=None, keepdims=False, method=None, size=None, skipna=None, 
+                 dtype=None, **kwargs):
+    combined = weighted_combine(data, axis=axis, keepdims=keepdims)
+    weights  = np.where(combined['weights'] != 0, combined['weights'], np.nan)
+
+    if method == 'sum_of_weights':
+        result = weights
+    else:
+        total = combined['total']
+        if not skipna:
+            # Any missing or NaN values along the reduced axes give a NaN result.
+            total = np.where(combined['n'] < size, np.nan, total)
+        result = total / weights if method == 'mean' else total
+
+    if dtype is not None:
+        result = result.astype(dtype, copy=False)
+    return result
 
-def min_agg(pairs, axis=None, **kwargs):
-    return general_combine(pairs, axis=axis).min(axis=axis, **kwargs)
+## Combining variance partials
+# - Each partial holds the count, mean and sum of squared differences (M2), merged
+#   with the parallel form of Welford's algorithm (Chan et al.).
 
-def sum_agg(pairs, axis=None, **kwargs):
-    return general_combine(pairs, axis=axis).sum(axis=axis, **kwargs)
+def welford_combine(pairs, axis=None, keepdims=True, **kwargs):
+    if not isinstance(pairs, list):
+        pairs = [pairs]
+
+    n, mean, M2 = [
+        _concatenate2(deepmap(lambda pair: pair[field], pairs), axes=axis)
+        for field in ('n', 'mean', 'M2')
+    ]
+
+    total_n = n.sum(axis=axis, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Empty partials have an undefined mean, and do not contribute.
+        mean  = np.where(n > 0, mean, 0)
+        total_mean = (n * mean).sum(axis=axis, keepdims=True) / total_n
+        delta = np.where(n > 0, mean - total_mean, 0)
+
+    total_M2 = (M2 + n * delta**2).sum(axis=axis, keepdims=True)
+
+    if not keepdims:
+        total_n, total_mean, total_M2 = [
+            np.squeeze(x, axis=axis) for x in (total_n, total_mean, total_M2)]
+
+    return {
+        'n': total_n,
+        'mean': total_mean,
+        'M2': total_M2
+    }
+
+def var_agg(pairs, axis=None, keepdims=False, ddof=0, dtype=None, **kwargs):
+    combined = welford_combine(pairs, axis=axis, keepdims=keepdims)
+    dof = combined['n'] - ddof
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = np.where(dof > 0, combined['M2'] / dof, np.nan)
+    if dtype is not None:
+        var = var.astype(dtype, copy=False)
+    return var
+
+def std_agg(pairs, axis=None, keepdims=False, ddof=0, dtype=None, **kwargs):
+    return np.sqrt(var_agg(pairs, axis=axis, keepdims=keepdims, ddof=ddof, dtype=dtype))
+
+## Combining arg reduction partials
+# - Each partial is a record of the extreme value and its flat index over the
+#   reduced axes, so only two values per output element are combined.
+
+def arg_combine(data, axis=None, method=None, skipna=None, keepdims=True, **kwargs):
+    values, position = arg_select(data['vals'], axis, method, skipna=skipna)
+    args = np.take_along_axis(
+        _flatten_axes(data['arg'], axis), position[..., None], axis=-1)[..., 0]
+
+    newshape = [1 if dim in axis else size for dim, size in enumerate(data.shape)]
+    result = np.empty(newshape, dtype=data.dtype)
+    result['vals'] = values.reshape(newshape)
+    result['arg']  = args.reshape(newshape)
+
+    if not keepdims:
+        result = np.squeeze(result, axis=axis)
+    return result
+
+def arg_agg(data, axis=None, method=None, skipna=None, keepdims=False, missing=None, **kwargs):
+    result = arg_combine(data, axis=axis, method=method, skipna=skipna, keepdims=keepdims)
+    args = result['arg']
+    if missing is not None:
+        # All values along the reduced axes are NaN.
+        args = np.where(np.isnan(result['vals']), missing, args)
+    return args
+
+def _flatten_axes(values, axis):
+    axis = sorted(axis)
+    kept = [dim for dim in range(values.ndim) if dim not in axis]
+    return np.transpose(values, kept + axis).reshape(
+        [values.shape[dim] for dim in kept] + [-1])
+
+## Streaming reductions
+# - Each partial is folded into a running accumulator of the output size as soon as
+#   it is available, in place of the tree of combine steps.
+
+def stream_reduce(partitions, chunks, method, axis, skipna=None, max_requests=None, dtype=None):
+    """
+    Reduce all partitions of an array, folding each partial into an accumulator as it
+    completes. Memory use scales with the size of the output, not the number of
+    partitions.
+
+    :param partitions:      (list) Nested list of the partitions for each dask block.
+
+    :param chunks:          (tuple) The dask chunks of the array being reduced.
+
+    :param method:          (str) The reduction to apply, one of mean/max/min/sum.
+
+    :param axis:            (tuple) The axes over which to perform the reduction.
+
+    :param skipna:          (bool) Skip NaN values when calculating the reduction.
+
+    :param max_requests:    (int) Number of partitions reduced at once, defaults to the
+                            ``max_requests`` option of the partitions or ``STREAM_REQUESTS``.
+                            Set to 1 to reduce the partitions in turn.
+
+    :param dtype:           (str) Data type of the result, totals are accumulated as
+                            float64 for floating point data.
+
+    :returns:       A numpy array with the reduced axes removed.
+    """
+    ndim    = len(chunks)
+    kshape  = tuple(1 if i in axis else sum(c) for i, c in enumerate(chunks))
+    offsets = [np.cumsum((0,) + c) for c in chunks]
+
+    blocks = {}
+    for position in np.ndindex(*[len(c) for c in chunks]):
+        block = partitions
+        for p in position:
+            block = block[p]
+        blocks[position] = block
+
+    if max_requests is None:
+        options = getattr(next(iter(blocks.values())), 'active_options', None) or {}
+        max_requests = options.get('max_requests') or STREAM_REQUESTS
+    max_requests = min(max_requests, len(blocks))
+
+    # Accumulators, only the output-sized arrays are kept between partitions.
+    total  = None
+    count  = np.zeros(kshape, dtype='i8')
+    filled = np.zeros(kshape, dtype=bool)
+
+    combine = {
+        'max': np.fmax if skipna else np.maximum,
+        'min': np.fmin if skipna else np.minimum,
+    }
+
+    def fold(position, partial):
+        nonlocal total
+        region = tuple(
+            slice(0, 1) if i in axis else slice(offsets[i][p], offsets[i][p+1])
+            for i, p in enumerate(position))
+
+        if method == 'mean':
+            count[region] += partial['n']
+            partial = partial['total']
+
+        partial = np.asanyarray(partial)
+        if total is None:
+            total = np.zeros(kshape, dtype=accumulator_dtype(partial.dtype)
+                             if method in ('mean', 'sum') else partial.dtype)
+        elif not np.can_cast(partial.dtype, total.dtype):
+            # Integer partials become floating point if any values are missing.
+            total = total.astype(np.result_type(total.dtype, partial.dtype))
+
+        if method in ('mean', 'sum'):
+            total[region] += partial
+        else:
+            total[region] = np.where(
+                filled[region], combine[method](total[region], partial), partial)
+            filled[region] = True
+
+    def reduce_block(block):
+        return partition_method(
+            block, method, axis=axis, skipna=skipna, keepdims=True)
+
+    if max_requests > 1:
+        queue   = iter(blocks.items())
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_requests) as pool:
+
+            def submit():
+                for position, block in queue:
+                    pending[pool.submit(reduce_block, block)] = position
+                    return
+
+            for _ in range(max_requests):
+                submit()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fold(pending.pop(future), future.result())
+                    submit()
+    else:
+        for position, block in blocks.items():
+            fold(position, reduce_block(block))
+
+    if method == 'mean':
+        total = total / count
+
+    if dtype is not None:
+        total = total.astype(dtype, copy=False)
+
+    shape = tuple(s for i, s in enumerate(kshape) if i not in axis)
+    return total.reshape(shape)
 
 class DaskActiveArray(da.Array):
 
@@ -64,6 +364,15 @@ class DaskActiveArray(da.Array):
         """
         copy_arr = DaskActiveArray(self.dask, self.name, self.chunks, meta=self)
         return copy_arr
+
+    def _get_skipna(self, skipna):
+        """
+        Missing values are read as NaN, so by default NaN values are skipped for any
+        data type, as for xarray with masked data.
+        """
+        if skipna is None:
+            return True
+        return skipna
     
     def __getitem__(self, index):
         """
@@ -75,7 +384,7 @@ class DaskActiveArray(da.Array):
         arr = super().__getitem__(index)
         return DaskActiveArray(arr.dask, arr.name, arr.chunks, meta=arr)
 
-    def active_mean(self, axis=None, skipna=None):
+    def active_mean(self, axis=None, skipna=None, streaming=False):
         """
         Perform ``dask delayed`` active mean for each ``dask block`` which corresponds to a single ``chunk``.
         Combines the results of the dask delayed ``active_mean`` operations on each block into a single dask Array,
@@ -85,12 +394,19 @@ class DaskActiveArray(da.Array):
 
         :param skipna:      (bool) Skip NaN values when calculating the mean.
 
+        :param streaming:   (bool) Fold each partial into a running result as it completes,
+                            rather than combining partials in a reduction tree.
+
         :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes using
                         the concatenations of active_means from each chunk.
         """
+        skipna = self._get_skipna(skipna)
+        if streaming:
+            return self.active_stream('mean', axis=axis, skipna=skipna)
+
         newarr = da.reduction(
             self,
-            partition_mean,
+            partial(partition_mean, skipna=skipna),
             mean_agg,
             combine=mean_combine,
             axis=axis,
@@ -99,7 +415,7 @@ class DaskActiveArray(da.Array):
 
         return newarr
 
-    def active_max(self, axis=None, skipna=None):
+    def active_max(self, axis=None, skipna=None, streaming=False):
         """
         Perform ``dask delayed`` active mean for each ``dask block`` which corresponds to a single ``chunk``.
         Combines the results of the dask delayed ``active_max`` operations on each block into a single dask Array,
@@ -109,22 +425,29 @@ class DaskActiveArray(da.Array):
 
         :param skipna:      (bool) Skip NaN values when calculating the max.
 
+        :param streaming:   (bool) Fold each partial into a running result as it completes,
+                            rather than combining partials in a reduction tree.
+
         :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes using
                         the concatenations of active_means from each chunk.
         """
 
+        skipna = self._get_skipna(skipna)
+        if streaming:
+            return self.active_stream('max', axis=axis, skipna=skipna)
+
         newarr = da.reduction(
             self,
-            partition_max,
-            max_agg,
-            combine=max_agg,
+            partial(partition_max, skipna=skipna),
+            partial(max_agg, skipna=skipna),
+            combine=partial(max_agg, skipna=skipna),
             axis=axis,
             dtype=self.dtype,
         )
 
         return newarr
     
-    def active_min(self, axis=None, skipna=None):
+    def active_min(self, axis=None, skipna=None, streaming=False):
         """
         Perform ``dask delayed`` active mean for each ``dask block`` which corresponds to a single ``chunk``.
         Combines the results of the dask delayed ``active_min`` operations on each block into a single dask Array,
@@ -134,22 +457,29 @@ class DaskActiveArray(da.Array):
 
         :param skipna:      (bool) Skip NaN values when calculating the min.
 
+        :param streaming:   (bool) Fold each partial into a running result as it completes,
+                            rather than combining partials in a reduction tree.
+
         :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes using
                         the concatenations of active_means from each chunk.
         """
 
+        skipna = self._get_skipna(skipna)
+        if streaming:
+            return self.active_stream('min', axis=axis, skipna=skipna)
+
         newarr = da.reduction(
             self,
-            partition_min,
-            min_agg,
-            combine=min_agg,
+            partial(partition_min, skipna=skipna),
+            partial(min_agg, skipna=skipna),
+            combine=partial(min_agg, skipna=skipna),
             axis=axis,
             dtype=self.dtype,
         )
 
         return newarr
     
-    def active_sum(self, axis=None, skipna=None):
+    def active_sum(self, axis=None, skipna=None, streaming=False):
         """
         Perform ``dask delayed`` active mean for each ``dask block`` which corresponds to a single ``chunk``.
         Combines the results of the dask delayed ``active_sum`` operations on each block into a single dask Array,
@@ -159,13 +489,20 @@ class DaskActiveArray(da.Array):
 
         :param skipna:      (bool) Skip NaN values when calculating the sum.
 
+        :param streaming:   (bool) Fold each partial into a running result as it completes,
+                            rather than combining partials in a reduction tree.
+
         :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes using
                         the concatenations of active_means from each chunk.
         """
 
+        skipna = self._get_skipna(skipna)
+        if streaming:
+            return self.active_stream('sum', axis=axis, skipna=skipna)
+
         newarr = da.reduction(
             self,
-            partition_sum,
+            partial(partition_sum, skipna=skipna),
             sum_agg,
             combine=sum_agg,
             axis=axis,
@@ -174,6 +511,228 @@ class DaskActiveArray(da.Array):
 
         return newarr
     
+    def active_var(self, axis=None, skipna=None, ddof=0):
+        """
+        Perform ``dask delayed`` active variance for each ``dask block`` which corresponds to a single ``chunk``.
+        Each block gives the count, mean and sum of squared differences, which are combined in a single pass
+        using the parallel Welford formulas.
+
+        :param axis:        (int) The index of the axis on which to perform the active variance.
+
+        :param skipna:      (bool) Skip NaN values when calculating the variance.
+
+        :param ddof:        (int) Delta degrees of freedom, the divisor used is ``N - ddof``.
+
+        :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes.
+        """
+        return self._active_moment(var_agg, axis=axis, skipna=skipna, ddof=ddof)
+
+    def active_std(self, axis=None, skipna=None, ddof=0):
+        """
+        Perform ``dask delayed`` active standard deviation, from the same partials as ``active_var``.
+
+        :param axis:        (int) The index of the axis on which to perform the active std.
+
+        :param skipna:      (bool) Skip NaN values when calculating the std.
+
+        :param ddof:        (int) Delta degrees of freedom, the divisor used is ``N - ddof``.
+
+        :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes.
+        """
+        return self._active_moment(std_agg, axis=axis, skipna=skipna, ddof=ddof)
+
+    def active_count(self, axis=None, skipna=None):
+        """
+        Perform ``dask delayed`` active count of the non-NaN values for each ``dask block``.
+
+        :param axis:        (int) The index of the axis on which to perform the active count.
+
+        :returns:       A new ``DaskActiveArray`` object which has been reduced along the specified axes.
+        """
+        newarr = da.reduction(
+            self,
+            partition_count,
+            count_agg,
+            combine=count_agg,
+            axis=axis,
+            dtype='i8',
+        )
+
+        return newarr
+
+    def active_weighted(self, method, weights, axis=None, skipna=None):
+        """
+        Weighted reduction, where each ``dask block`` is reduced by a single active request
+        over the axes the weights do not depend on. The weights for the block are then applied
+        to its partial totals and counts, so only those are combined.
+
+        :param method:      (str) One of ``mean``, ``sum`` or ``sum_of_weights``.
+
+        :param weights:     (np.ndarray) The weights, with the same number of dimensions as this
+                            array and length 1 along each dimension they do not depend on.
+
+        :param axis:        (int | tuple) The axes over which to perform the reduction.
+
+        :param skipna:      (bool) Skip NaN values when calculating the reduction.
+
+        :returns:       A new dask array which has been reduced along the specified axes.
+        """
+        if axis is None:
+            axis = tuple(range(self.ndim))
+        elif isinstance(axis, int):
+            axis = (axis,)
+        axis = tuple(sorted(a % self.ndim for a in axis))
+
+        skipna  = self._get_skipna(skipna)
+        weights = np.asarray(weights)
+        dtype   = np.result_type(self.dtype, weights.dtype, 'f4')
+        size    = int(np.prod([self.shape[i] for i in axis]))
+
+        newarr = da.reduction(
+            self,
+            partial(partition_weighted, partial_axis=tuple(i for i in axis if weights.shape[i] == 1)),
+            partial(weighted_agg, method=method, size=size, skipna=skipna, dtype=dtype),
+            combine=weighted_combine,
+            axis=axis,
+            dtype=dtype,
+            concatenate=True,
+            weights=weights,
+            meta=np.empty((0,)*(self.ndim - len(axis)), dtype=dtype),
+        )
+
+        return newarr
+
+    def _active_moment(self, aggregate, axis=None, skipna=None, ddof=0):
+        """
+        Dask reduction for the variance and standard deviation, combining the Welford
+        partials from each ``dask block``.
+        """
+        dtype  = self.dtype if self.dtype.kind == 'f' else np.dtype('f8')
+        skipna = self._get_skipna(skipna)
+
+        newarr = da.reduction(
+            self,
+            partial(partition_var, skipna=skipna),
+            partial(aggregate, ddof=ddof),
+            combine=welford_combine,
+            axis=axis,
+            dtype=dtype,
+        )
+
+        return newarr
+
+    def active_argmax(self, axis=None, skipna=None, missing=None):
+        """
+        Perform ``dask delayed`` active argmax, where each ``dask block`` gives only the maximum values
+        and their positions along the reduced axes.
+
+        :param axis:        (int | tuple) The axes over which to find the maximum.
+
+        :param skipna:      (bool) Skip NaN values when finding the maximum.
+
+        :param missing:     (int) Index given where all values are NaN, defaults to the first position.
+
+        :returns:       A new dask array of the flat index of the maximum over the reduced axes.
+        """
+        return self.active_arg('argmax', axis=axis, skipna=skipna, missing=missing)
+
+    def active_argmin(self, axis=None, skipna=None, missing=None):
+        """
+        Perform ``dask delayed`` active argmin, where each ``dask block`` gives only the minimum values
+        and their positions along the reduced axes.
+
+        :param axis:        (int | tuple) The axes over which to find the minimum.
+
+        :param skipna:      (bool) Skip NaN values when finding the minimum.
+
+        :param missing:     (int) Index given where all values are NaN, defaults to the first position.
+
+        :returns:       A new dask array of the flat index of the minimum over the reduced axes.
+        """
+        return self.active_arg('argmin', axis=axis, skipna=skipna, missing=missing)
+
+    def active_arg(self, method, axis=None, skipna=None, missing=None):
+        """
+        Arg reduction over one or more axes. The index of each ``dask block`` within the array
+        is used to give the position of the extreme values relative to the whole array, so the
+        partials can be combined in any order.
+        """
+        if axis is None:
+            axis = tuple(range(self.ndim))
+        elif isinstance(axis, int):
+            axis = (axis,)
+        axis = tuple(sorted(a % self.ndim for a in axis))
+
+        name    = f'active-{method}-' + tokenize(self, method, axis, skipna)
+        keys    = list(product(*map(range, self.numblocks)))
+        offsets = list(product(*(accumulate(bd[:-1], operator.add, initial=0) for bd in self.chunks)))
+
+        dsk = {
+            (name,) + key: (partition_arg, (self.name,) + key, axis, offset, self.shape, method, skipna)
+            for key, offset in zip(keys, offsets)
+        }
+        chunks = tuple((1,)*len(c) if i in axis else c for i, c in enumerate(self.chunks))
+
+        graph = HighLevelGraph.from_collections(name, dsk, dependencies=[self])
+        partials = da.Array(graph, name, chunks, dtype='i8')
+
+        return _tree_reduce(
+            partials,
+            partial(arg_agg, method=method, skipna=skipna, missing=missing),
+            axis,
+            False,
+            np.dtype('i8'),
+            combine=partial(arg_combine, method=method, skipna=skipna),
+        )
+
+    def active_stream(self, method, axis=None, skipna=None, max_requests=None):
+        """
+        Perform a streaming active reduction, as a single dask task which reduces each
+        ``dask block`` and folds the result into an accumulator of the output size. Blocks
+        are reduced concurrently by a pool of threads within the task, so up to
+        ``max_requests`` blocks are reduced at once.
+
+        :param method:          (str) The reduction to apply, one of mean/max/min/sum.
+
+        :param axis:            (int | tuple) The axes over which to perform the reduction.
+
+        :param skipna:          (bool) Skip NaN values when calculating the reduction.
+
+        :param max_requests:    (int) Number of blocks reduced at once, defaults to the
+                                ``max_requests`` active option or ``STREAM_REQUESTS``
+                                (the number of CPUs plus 4, up to 32).
+
+        :returns:       A new ``DaskActiveArray`` object with a single chunk, which has been
+                        reduced along the specified axes.
+        """
+        if axis is None:
+            axis = tuple(range(self.ndim))
+        elif isinstance(axis, int):
+            axis = (axis,)
+        axis = tuple(sorted(a % self.ndim for a in axis))
+
+        shape = tuple(s for i, s in enumerate(self.shape) if i not in axis)
+        name  = f'active-stream-{method}-' + tokenize(self, method, axis, skipna, max_requests)
+
+        dsk = {
+            (name,) + (0,)*len(shape): (
+                stream_reduce,
+                self.__dask_keys__(),
+                self.chunks,
+                method,
+                axis,
+                skipna,
+                max_requests,
+                self.dtype
+            )
+        }
+        graph = HighLevelGraph.from_collections(name, dsk, dependencies=[self])
+        return DaskActiveArray(
+            graph,
+            name,
+            tuple((s,) for s in shape),
+            meta=np.empty((0,)*len(shape), dtype=self.dtype))
+
     def active_method(self, method, axis=None, skipna=None, **kwargs):
         """
         Pointer to the active methods of the DaskActiveArray, for use
@@ -183,6 +742,9 @@ class DaskActiveArray(da.Array):
             'mean':self.active_mean,
             'max':self.active_max,
             'min':self.active_min,
-            'sum':self.active_sum
+            'sum':self.active_sum,
+            'var':self.active_var,
+            'std':self.active_std,
+            'count':self.active_count
         }
         return methods[method](axis=axis, skipna=skipna)
\ No newline at end of file
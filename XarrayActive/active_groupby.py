@@ -0,0 +1,136 @@
+import dask.array as da
+import numpy as np
+
+from xarray.core import duck_array_ops
+from xarray.core.groupby import DataArrayGroupBy, _maybe_squeeze_indices
+from xarray.core.resample import DataArrayResample
+from xarray.core.variable import Variable
+
+from .active_dask import DaskActiveArray
+
+# Standard reductions applied by xarray GroupBy objects, and the equivalent active methods.
+ACTIVE_REDUCTIONS = {
+    duck_array_ops.mean: 'mean',
+    duck_array_ops.max: 'max',
+    duck_array_ops.min: 'min',
+    duck_array_ops.sum: 'sum',
+    duck_array_ops.var: 'var',
+    duck_array_ops.std: 'std',
+    duck_array_ops.count: 'count',
+}
+
+def get_index_runs(indices):
+    """
+    Split the indices of a group into runs of consecutive positions.
+
+    :returns:       A list of slices, one for each run.
+    """
+    if isinstance(indices, slice):
+        return [indices]
+
+    indices = np.asarray(indices).ravel()
+    if not indices.size:
+        return []
+
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    return [slice(int(run[0]), int(run[-1]) + 1) for run in np.split(indices, breaks)]
+
+def get_group_data(array, axis, indices):
+    """
+    Select the members of a group from a DaskActiveArray. Each run of consecutive
+    indices is a single slice, so the selected partitions keep their extents in
+    the source file and remain active.
+    """
+    parts = [
+        array[(slice(None),)*axis + (run,)] for run in get_index_runs(indices)
+    ]
+    if len(parts) == 1:
+        return parts[0]
+
+    group = da.concatenate(parts, axis=axis)
+    return DaskActiveArray(group.dask, group.name, group.chunks, meta=group)
+
+class ActiveGroupByMixin:
+    """
+    Applies active reductions to each group of an ActiveDataArray, rather than the
+    standard reductions which require the data of each group to be loaded.
+    """
+
+    description = "Active reductions for each group of an ActiveDataArray."
+
+    def _active_data(self):
+        data = self._obj.variable.data
+        if isinstance(data, DaskActiveArray):
+            return data
+        return None
+
+    def _iter_grouped_shortcut(self, warn_squeeze=True):
+        """
+        Iterate over the variable of each group, where the data for each group is a
+        DaskActiveArray built from the runs of consecutive indices in the group.
+        """
+        data = self._active_data()
+        if data is None:
+            yield from super()._iter_grouped_shortcut(warn_squeeze=warn_squeeze)
+            return
+
+        var  = self._obj.variable
+        axis = var.get_axis_num(self._group_dim)
+        (grouper,) = self.groupers
+
+        for idx, indices in enumerate(self._group_indices):
+            indices = _maybe_squeeze_indices(
+                indices, self._squeeze, grouper, warn=warn_squeeze and idx == 0)
+            if isinstance(indices, (int, np.integer)):
+                yield var[{self._group_dim: indices}]
+                continue
+
+            yield Variable(
+                var.dims,
+                get_group_data(data, axis, indices),
+                attrs=var.attrs,
+                encoding=var.encoding,
+                fastpath=True)
+
+    def reduce(self, func, dim=None, **kwargs):
+        """
+        Reduce the items in this group, using the active methods for the standard
+        reductions where possible.
+        """
+        func, kwargs = self._get_active_reduction(func, kwargs)
+        return super().reduce(func, dim=dim, **kwargs)
+
+    def _reduce_without_squeeze_warn(self, func, dim=None, **kwargs):
+        func, kwargs = self._get_active_reduction(func, kwargs)
+        return super()._reduce_without_squeeze_warn(func, dim=dim, **kwargs)
+
+    def _get_active_reduction(self, func, kwargs):
+        """
+        Find the active equivalent of a standard reduction, if the reduction can be
+        applied actively to the data of this object.
+
+        :returns:       The reduction function and keyword arguments to apply.
+        """
+        method = ACTIVE_REDUCTIONS.get(func)
+        if kwargs.get('min_count', 0) is None:
+            kwargs = {k: v for k, v in kwargs.items() if k != 'min_count'}
+
+        if (method is None or kwargs.get('keepdims') or kwargs.get('axis') is not None
+                or not kwargs.get('shortcut', True) or 'min_count' in kwargs
+                or self._active_data() is None):
+            return func, kwargs
+
+        from .active_xarray import dataarray_active_method
+
+        def active_func(array, axis=None, skipna=None, **kwargs):
+            return dataarray_active_method(array, method, axis=axis, skipna=skipna, **kwargs)
+
+        return active_func, kwargs
+
+class ActiveDataArrayGroupBy(ActiveGroupByMixin, DataArrayGroupBy):
+
+    description = "GroupBy object for an ActiveDataArray."
+
+class ActiveDataArrayResample(ActiveGroupByMixin, DataArrayResample):
+
+    description = "Resample object for an ActiveDataArray."
@@ -0,0 +1,72 @@
+from xarray.core.weighted import DataArrayWeighted
+
+from .active_dask import DaskActiveArray
+
+class ActiveDataArrayWeighted(DataArrayWeighted):
+    """
+    Weighted reductions of an ActiveDataArray. Each partition is reduced actively
+    over the dimensions the weights do not depend on, and the weights are applied to
+    the partial totals and counts of the partition along the remaining dimensions.
+    Weights which depend on a single dimension, such as cos(latitude), therefore
+    require the same requests as an unweighted active reduction.
+    """
+
+    description = "Weighted active reductions for an ActiveDataArray."
+
+    def _active_reduce(self, da, method, dim=None, skipna=None):
+        """
+        Weighted active reduction of ``da``. Missing and NaN values are never included
+        in the sum of weights, as for the ``da.notnull()`` mask applied to the weights
+        by xarray.
+
+        :param method:  (str) One of ``mean``, ``sum`` or ``sum_of_weights``.
+
+        :returns:       The reduced DataArray, or None if the active methods cannot be
+                        used.
+        """
+        if not isinstance(da.variable.data, DaskActiveArray):
+            return None
+
+        weights = self.weights
+        if not set(weights.dims) <= set(da.dims):
+            return None
+        if any(weights.sizes[d] != da.sizes[d] for d in weights.dims):
+            return None
+
+        if dim is None or dim is ...:
+            dims = list(da.dims)
+        elif isinstance(dim, str):
+            dims = [dim]
+        else:
+            dims = list(dim)
+
+        if all(d in weights.dims for d in dims):
+            # Every reduced dimension is weighted, no reduction can happen first.
+            return None
+
+        # Weights with the dimensions of the data, of length 1 where not weighted.
+        values = weights.transpose(*[d for d in da.dims if d in weights.dims]).to_numpy()
+        values = values.reshape([da.sizes[d] if d in weights.dims else 1 for d in da.dims])
+
+        def active_weighted(array, axis=None, **kwargs):
+            return array.active_weighted(method, values, axis=axis, skipna=skipna)
+
+        return da.reduce(active_weighted, dim=dims)
+
+    def _sum_of_weights(self, da, dim=None):
+        result = self._active_reduce(da, 'sum_of_weights', dim=dim)
+        if result is None:
+            return super()._sum_of_weights(da, dim=dim)
+        return result
+
+    def _weighted_sum(self, da, dim=None, skipna=None):
+        result = self._active_reduce(da, 'sum', dim=dim, skipna=skipna)
+        if result is None:
+            return super()._weighted_sum(da, dim=dim, skipna=skipna)
+        return result
+
+    def _weighted_mean(self, da, dim=None, skipna=None):
+        result = self._active_reduce(da, 'mean', dim=dim, skipna=skipna)
+        if result is None:
+            return super()._weighted_mean(da, dim=dim, skipna=skipna)
+        return result
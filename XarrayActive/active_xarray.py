@@ -3,17 +3,30 @@ __contact__   = "daniel.westwood@stfc.ac.uk"
 __copyright__ = "Copyright 2023 United Kingdom Research and Innovation"
 
 import numpy as np
+import dask.array as da
 
 from xarray.core.dataset import Dataset
 from xarray.core.dataarray import DataArray
+from xarray.core import dtypes
 
 from .active_dask import DaskActiveArray
+from .active_async import ActiveAsyncMethods
+from .active_groupby import ActiveDataArrayGroupBy, ActiveDataArrayResample
+from .active_weighted import ActiveDataArrayWeighted
 from xarray.core import duck_array_ops
 
 class ActiveDataArray(DataArray):
     # No additional properties
     __slots__ = ()
 
+    @property
+    def active(self):
+        """
+        Awaitable active reductions for this DataArray, for use within an event loop.
+        For example: ``await da.active.amean(dim='time')``
+        """
+        return ActiveAsyncMethods(self)
+
     # Override Xarray DataArray standard functions in favour of Active enabled ones.
     def mean(self, *args,**kwargs):
         return self._active_op(dataarray_active_mean, *args, **kwargs)
@@ -26,6 +39,148 @@ class ActiveDataArray(DataArray):
     
     def sum(self, *args,**kwargs):
         return self._active_op(dataarray_active_sum, *args, **kwargs)
+
+    def var(self, *args,**kwargs):
+        return self._active_op(dataarray_active_var, *args, **kwargs)
+
+    def std(self, *args,**kwargs):
+        return self._active_op(dataarray_active_std, *args, **kwargs)
+
+    def count(self, *args,**kwargs):
+        return self._active_op(dataarray_active_count, *args, **kwargs)
+
+    def argmax(self, dim=None, axis=None, keep_attrs=None, skipna=None):
+        return self._active_arg('argmax', dim=dim, axis=axis, keep_attrs=keep_attrs, skipna=skipna)
+
+    def argmin(self, dim=None, axis=None, keep_attrs=None, skipna=None):
+        return self._active_arg('argmin', dim=dim, axis=axis, keep_attrs=keep_attrs, skipna=skipna)
+
+    def idxmax(self, dim=None, *, skipna=None, fill_value=dtypes.NA, keep_attrs=None):
+        return self._active_idx('argmax', dim=dim, skipna=skipna, fill_value=fill_value, keep_attrs=keep_attrs)
+
+    def idxmin(self, dim=None, *, skipna=None, fill_value=dtypes.NA, keep_attrs=None):
+        return self._active_idx('argmin', dim=dim, skipna=skipna, fill_value=fill_value, keep_attrs=keep_attrs)
+
+    def weighted(self, weights):
+        """
+        Weighted operations on this DataArray, where the weighted mean and sum use the
+        active methods. See ``DataArray.weighted``.
+        """
+        return ActiveDataArrayWeighted(self, weights)
+
+    def groupby(self, group, squeeze=None, restore_coord_dims=False):
+        """
+        Group this DataArray by unique values of ``group``, where reductions of each group
+        use the active methods. See ``DataArray.groupby``.
+        """
+        from xarray.core.groupby import (
+            ResolvedGrouper,
+            UniqueGrouper,
+            _validate_groupby_squeeze,
+        )
+
+        _validate_groupby_squeeze(squeeze)
+        rgrouper = ResolvedGrouper(UniqueGrouper(), group, self)
+        return ActiveDataArrayGroupBy(
+            self,
+            (rgrouper,),
+            squeeze=squeeze,
+            restore_coord_dims=restore_coord_dims,
+        )
+
+    def resample(
+        self,
+        indexer=None,
+        skipna=None,
+        closed=None,
+        label=None,
+        base=None,
+        offset=None,
+        origin='start_day',
+        loffset=None,
+        restore_coord_dims=None,
+        **indexer_kwargs,
+    ):
+        """
+        Resample this DataArray along a time dimension, where reductions of each period
+        use the active methods. See ``DataArray.resample``.
+        """
+        return self._resample(
+            resample_cls=ActiveDataArrayResample,
+            indexer=indexer,
+            skipna=skipna,
+            closed=closed,
+            label=label,
+            base=base,
+            offset=offset,
+            origin=origin,
+            loffset=loffset,
+            restore_coord_dims=restore_coord_dims,
+            **indexer_kwargs,
+        )
+
+    def _active_arg(self, method, dim=None, axis=None, keep_attrs=None, skipna=None, missing=None):
+        """
+        Index of the maximum or minimum along some dimension(s), where each chunk gives only
+        the extreme values and their positions. Follows the behaviour of ``DataArray.argmax``,
+        giving a dict of indices for each dimension if ``dim`` is a sequence or ``...``.
+        """
+        if not isinstance(self.variable.data, DaskActiveArray):
+            return getattr(super(), method)(dim=dim, axis=axis, keep_attrs=keep_attrs, skipna=skipna)
+
+        if skipna is None:
+            skipna = self.dtype.kind in 'cfO'
+
+        def active_arg(array, axis=None, **kwargs):
+            return array.active_arg(method, axis=axis, skipna=skipna, missing=missing)
+
+        if dim is ...:
+            dim = self.dims
+        if dim is None or axis is not None or isinstance(dim, str) or not np.iterable(dim):
+            return self.reduce(active_arg, dim=dim, axis=axis, keep_attrs=keep_attrs)
+
+        # Flat indices over the reduced dimensions, in the order of this array.
+        dims = [d for d in self.dims if d in dim]
+        flat = self.reduce(active_arg, dim=dims, keep_attrs=keep_attrs)
+        indices = da.unravel_index(flat.data, [self.sizes[d] for d in dims])
+
+        result = {d: flat.copy(data=i) for d, i in zip(dims, indices)}
+        return {d: result[d] for d in dim}
+
+    def _active_idx(self, method, dim=None, skipna=None, fill_value=dtypes.NA, keep_attrs=None):
+        """
+        Coordinate label of the maximum or minimum along a dimension, using the active arg
+        reduction. Follows the behaviour of ``DataArray.idxmax``.
+        """
+        if not isinstance(self.variable.data, DaskActiveArray):
+            return getattr(super(), method.replace('arg', 'idx'))(
+                dim=dim, skipna=skipna, fill_value=fill_value, keep_attrs=keep_attrs)
+
+        if dim is None:
+            if self.ndim != 1:
+                raise ValueError("Must supply 'dim' argument for multidimensional arrays")
+            dim = self.dims[0]
+        if dim not in self.dims:
+            raise KeyError(f"Dimension {dim!r} not found in array dimensions {self.dims!r}")
+        if dim not in self.coords:
+            raise KeyError(f"Dimension {dim!r} is not one of the coordinates {tuple(self.coords.keys())}")
+
+        if skipna is None:
+            skipna = self.dtype.kind in 'cfO'
+
+        # Positions where all values are NaN are given as -1.
+        indx = self._active_arg(
+            method, dim=dim, keep_attrs=keep_attrs, skipna=skipna, missing=-1 if skipna else None)
+
+        coord = da.from_array(self[dim].data, chunks=-1)
+        res = indx.copy(data=coord[indx.data.ravel()].reshape(indx.shape))
+        res.name = dim
+
+        if skipna:
+            res = res.where(indx >= 0, fill_value)
+
+        res.attrs = indx.attrs
+        return res
     
     def _active_op(
         self,
@@ -87,16 +242,19 @@ class ActiveDataset(Dataset):
         # Convert variable to DaskActiveArray if not already defined as that type.
         # CFAPyX - FragmentArrayWrapper returns a DaskActiveArray upon indexing.
         variable = darr.variable
-        # If the active parts have been lost at this point.
-        if not isinstance(variable.data, DaskActiveArray) and is_active_variable:
-            variable.data = DaskActiveArray(
-                variable.data.dask, 
-                variable.data.name,
-                variable.data.chunks,
-                meta=variable.data
-            )
-
-        coords   = {k: v for k, v in zip(darr.coords.keys(), darr.coords.values())}
+        # If the active parts have been lost at this point. Lazily indexed variables are
+        # left as they are, so the ActiveArrayWrapper receives the whole selection.
+        if not isinstance(variable._data, DaskActiveArray) and is_active_variable:
+            if isinstance(variable._data, da.Array):
+                variable.data = DaskActiveArray(
+                    variable.data.dask, 
+                    variable.data.name,
+                    variable.data.chunks,
+                    meta=variable.data
+                )
+
+        # The fastpath requires coordinates as Variables rather than DataArrays.
+        coords   = {k: v.variable for k, v in darr.coords.items()}
         name     = darr.name
 
         # Not ideal to break into the DataArray class but seems to be unavoidable (for now)
@@ -123,6 +281,15 @@ def dataarray_active_min(array, *args, **kwargs):
 def dataarray_active_sum(array, *args, **kwargs):
     return dataarray_active_method(array, 'sum', *args, **kwargs)
 
+def dataarray_active_var(array, *args, **kwargs):
+    return dataarray_active_method(array, 'var', *args, **kwargs)
+
+def dataarray_active_std(array, *args, **kwargs):
+    return dataarray_active_method(array, 'std', *args, **kwargs)
+
+def dataarray_active_count(array, *args, **kwargs):
+    return dataarray_active_method(array, 'count', *args, **kwargs)
+
 def dataarray_active_method(array: DaskActiveArray, method: str, axis=None, skipna=None, **kwargs):
     """
     Function provided to dask reduction, activates the ``active`` methods of the ``DaskActiveArray``.
@@ -138,10 +305,13 @@ def dataarray_active_method(array: DaskActiveArray, method: str, axis=None, skip
     """
     from xarray.core import duck_array_ops
     arr_methods = {
-        'mean': array.active_mean,
-        'max': array.active_max,
-        'min': array.active_min,
-        'sum': array.active_sum
+        'mean': 'active_mean',
+        'max': 'active_max',
+        'min': 'active_min',
+        'sum': 'active_sum',
+        'var': 'active_var',
+        'std': 'active_std',
+        'count': 'active_count'
     }
 
     # On failure of the Active method, can use Duck methods instead - normal behaviour.
@@ -149,13 +319,17 @@ def dataarray_active_method(array: DaskActiveArray, method: str, axis=None, skip
         'mean': duck_array_ops.mean,
         'max': duck_array_ops.max,
         'min': duck_array_ops.min,
-        'sum': duck_array_ops.sum
+        'sum': duck_array_ops.sum,
+        'var': duck_array_ops.var,
+        'std': duck_array_ops.std,
+        'count': lambda array, axis=None, skipna=None, **kwargs: duck_array_ops.count(array, axis=axis)
     }
 
     from xarray.core import duck_array_ops
     try:
-        return arr_methods[method](axis, skipna=skipna, **kwargs)
+        active_method = getattr(array, arr_methods[method])
     except AttributeError:
         print("ActiveWarning: Unable to compute active mean - array has already been loaded.")
         print("NetCDF file size may prohibit lazy loading and thus Active methods.")
         return duck_methods[method](array, axis=axis, skipna=skipna, **kwargs)
+    return active_method(axis, skipna=skipna, **kwargs)
@@ -2,13 +2,24 @@ from xarray.backends import StoreBackendEntrypoint, BackendEntrypoint
 from xarray.backends.common import AbstractDataStore
 from xarray.core.dataset import Dataset
 from xarray import conventions
+from xarray.coding.variables import pop_to
 
 from xarray.backends import ( 
     NetCDF4DataStore
 )
 
 from .active_xarray import ActiveDataset
+from .chunk_index import _source_identity
 from .datastore import ActiveDataStore
+from .metadata_cache import (
+    get_metadata_cache,
+    get_store_metadata,
+    load_metadata_variables,
+)
+from .wrappers import ActiveArrayWrapper
+
+import numpy as np
+import os
 
 def open_active_dataset(
         filename_or_obj,
@@ -21,6 +32,7 @@ def open_active_dataset(
         decode_timedelta=None,
         active_options={},
         group=None,
+        metadata_cache=None,
         ):
     """
     Top-level function which opens a NetCDF dataset using XarrayActive classes, overriding
@@ -28,14 +40,39 @@ def open_active_dataset(
     from the ``filename_or_obj`` provided, then passes this to a StoreBackendEntrypoint
     to create an Xarray Dataset. 
 
+    :param metadata_cache:  (bool | str | MetadataCache) Cache the metadata of the file on
+                            disk, so later opens of the same file skip reading its header.
+                            Either True for the default cache directory, the path to a cache
+                            directory or a ``MetadataCache`` instance.
+
     :returns:       An ActiveDataset object composed of ActiveDataArray objects representing the different
                     NetCDF variables and dimensions. Non-active 
     """
 
+    # Only the metadata of actively opened local files is cached, as all other variables
+    # are read when opened.
+    cache  = get_metadata_cache(metadata_cache)
+    chunks = active_options.get('chunks', {})
+    cached = chunks == {} or bool(chunks)
+    if cache is not None and cached and isinstance(filename_or_obj, (str, os.PathLike)):
+        return open_cached_dataset(
+            cache,
+            os.fspath(filename_or_obj),
+            drop_variables=drop_variables,
+            mask_and_scale=mask_and_scale,
+            decode_times=decode_times,
+            concat_characters=concat_characters,
+            decode_coords=decode_coords,
+            use_cftime=use_cftime,
+            decode_timedelta=decode_timedelta,
+            active_options=active_options,
+            group=group)
+
     # Load the normal datastore from the provided file (object not supported).
     store = ActiveDataStore.open(filename_or_obj, group=group)
 
     store.active_options = active_options
+    store.drop_variables = drop_variables or ()
 
     # Xarray makes use of StoreBackendEntrypoints to provide the Dataset 'ds'
     store_entrypoint = ActiveStoreBackendEntrypoint()
@@ -52,6 +89,80 @@ def open_active_dataset(
 
     return ds
 
+def open_cached_dataset(
+        cache,
+        filename,
+        drop_variables=None,
+        active_options={},
+        group=None,
+        **decode_kwargs,
+        ):
+    """
+    Open a dataset from the metadata cache, where the file is only opened to read its
+    metadata if there is no valid entry in the cache. No file handles are held by the
+    dataset, as each partition opens the file when read.
+
+    :param cache:       (MetadataCache) The cache of dataset metadata.
+
+    :returns:       An ActiveDataset object.
+    """
+    entry = cache.get(filename, group=group)
+    if entry is None:
+        identity = _source_identity(filename)
+
+        store = ActiveDataStore.open(filename, group=group)
+        store.active_options = active_options
+        try:
+            entry = get_store_metadata(store)
+        finally:
+            store.close()
+
+        cache.put(filename, entry, identity, group=group)
+
+    vars, attrs = load_metadata_variables(
+        entry, filename, active_options=active_options, drop_variables=drop_variables)
+
+    ds = decode_active_dataset(vars, attrs, drop_variables=drop_variables, **decode_kwargs)
+    ds.encoding = dict(entry['encoding'])
+    return ds
+
+def push_down_decoding(variables):
+    """
+    Mask and unpack the values of each active variable within its partitions, in place
+    of the CF decoding applied by xarray to the whole variable. Active reductions are
+    applied to the packed values, so the scale factor and offset are only applied to 
+    the partial results and no data needs to be decoded before a reduction.
+    """
+    for var in variables.values():
+        # The wrapper is held within the lazy indexing adapters applied by xarray.
+        wrapper = var._data
+        while not isinstance(wrapper, ActiveArrayWrapper) and hasattr(wrapper, 'array'):
+            wrapper = wrapper.array
+
+        if not isinstance(wrapper, ActiveArrayWrapper):
+            continue
+
+        scale_factor = pop_to(var.attrs, var.encoding, 'scale_factor')
+        add_offset   = pop_to(var.attrs, var.encoding, 'add_offset')
+
+        if wrapper.missing is None and scale_factor is None and add_offset is None:
+            continue
+
+        wrapper.masked = True
+        if wrapper.dtype.kind in 'iu':
+            # Missing values are NaN, as for the CF decoding of integer data.
+            wrapper.dtype = np.result_type(wrapper.dtype, np.float32)
+
+        if scale_factor is not None or add_offset is not None:
+            scale_factor = 1 if scale_factor is None else scale_factor
+            add_offset   = 0 if add_offset is None else add_offset
+            wrapper.scale = (scale_factor, add_offset)
+            wrapper.dtype = np.result_type(
+                wrapper.dtype, np.asarray(scale_factor).dtype, np.asarray(add_offset).dtype)
+
+        for attr in ('_FillValue', 'missing_value'):
+            pop_to(var.attrs, var.encoding, attr)
+
 class ActiveBackendEntrypoint(BackendEntrypoint):
 
     description = "Open NetCDF4 files with Active storage in mind - engine entrypoint"
@@ -70,6 +181,7 @@ class ActiveBackendEntrypoint(BackendEntrypoint):
             decode_timedelta=None,
             active_options={},
             group=None,
+            metadata_cache=None,
             # backend specific keyword arguments
             # do not use 'chunks' or 'cache' here
         ):
@@ -88,7 +200,8 @@ class ActiveBackendEntrypoint(BackendEntrypoint):
             use_cftime=use_cftime,
             decode_timedelta=decode_timedelta,
             active_options=active_options,
-            group=group)
+            group=group,
+            metadata_cache=metadata_cache)
 
 class ActiveStoreBackendEntrypoint(StoreBackendEntrypoint):
 
@@ -118,8 +231,7 @@ class ActiveStoreBackendEntrypoint(StoreBackendEntrypoint):
         vars, attrs = store.load()
         encoding    = store.get_encoding()
 
-        # Ensures variables/attributes comply with CF conventions.
-        vars, attrs, coord_names = conventions.decode_cf_variables(
+        ds = decode_active_dataset(
             vars,
             attrs,
             mask_and_scale=mask_and_scale,
@@ -130,10 +242,43 @@ class ActiveStoreBackendEntrypoint(StoreBackendEntrypoint):
             use_cftime=use_cftime,
             decode_timedelta=decode_timedelta,
         )
-
-        ds = ActiveDataset(vars, attrs=attrs)
-        ds = ds.set_coords(coord_names.intersection(vars))
         ds.set_close(store.close)
         ds.encoding = encoding
 
-        return ds
\ No newline at end of file
+        return ds
+
+def decode_active_dataset(
+        vars,
+        attrs,
+        mask_and_scale=None,
+        decode_times=None,
+        concat_characters=None,
+        decode_coords=None,
+        drop_variables=None,
+        use_cftime=None,
+        decode_timedelta=None,
+    ):
+    """
+    Apply the CF decoding to the variables loaded from an active store, with masking
+    and unpacking applied by the partitions of each active variable.
+
+    :returns:       An ActiveDataset of the decoded variables.
+    """
+    if mask_and_scale:
+        push_down_decoding(vars)
+
+    # Ensures variables/attributes comply with CF conventions.
+    vars, attrs, coord_names = conventions.decode_cf_variables(
+        vars,
+        attrs,
+        mask_and_scale=mask_and_scale,
+        decode_times=decode_times,
+        concat_characters=concat_characters,
+        decode_coords=decode_coords,
+        drop_variables=drop_variables,
+        use_cftime=use_cftime,
+        decode_timedelta=decode_timedelta,
+    )
+
+    ds = ActiveDataset(vars, attrs=attrs)
+    return ds.set_coords(coord_names.intersection(vars))
\ No newline at end of file
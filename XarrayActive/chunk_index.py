@@ -0,0 +1,207 @@
+import os
+import threading
+
+import numpy as np
+
+from itertools import product
+
+# Statistics stored for each chunk in storage.
+INDEX_FIELDS = ('count', 'sum', 'min', 'max', 'nan_count')
+
+def get_index_path(filename):
+    """
+    Default location of the chunk index sidecar file for a source file.
+    """
+    return f'{filename}.index.nc'
+
+def _source_identity(filename):
+    """
+    Size and modification time of the source file, used to detect a stale index.
+    """
+    stat = os.stat(filename)
+    return int(stat.st_size), int(stat.st_mtime_ns)
+
+def _group_name(address):
+    return address.strip('/').replace('/', '.')
+
+def build_chunk_index(filename, variables=None, index_path=None):
+    """
+    Offline pass over a source file to build the chunk index sidecar file, holding the
+    count, sum, min, max and nan_count for each chunk in storage of each variable.
+    Each chunk is read exactly once. Statistics of packed variables are of the packed
+    values, the scale factor and offset are applied when the index is used.
+
+    :param filename:    (str) The path to the source netCDF4/HDF5 file.
+
+    :param variables:   (list) The names of the variables to index, defaults to all
+                        variables which are chunked in storage.
+
+    :param index_path:  (str) The path to the index file, defaults to the source
+                        filename with the ``.index.nc`` suffix.
+
+    :returns:       The path to the index file.
+    """
+    import netCDF4
+
+    index_path = index_path or get_index_path(filename)
+
+    with netCDF4.Dataset(filename) as src, netCDF4.Dataset(index_path, mode='w') as dst:
+
+        size, mtime = _source_identity(filename)
+        dst.source_size  = size
+        dst.source_mtime = mtime
+
+        for name in variables or src.variables.keys():
+            var = src.variables[name]
+            var.set_auto_scale(False)
+            chunking = var.chunking()
+            if chunking == 'contiguous' or var.dtype.kind not in 'iuf':
+                continue
+
+            chunk_shape = tuple(chunking)
+            chunk_space = tuple(
+                -(-s // c) for s, c in zip(var.shape, chunk_shape))
+
+            fields = {
+                'count':     np.zeros(chunk_space, dtype='i8'),
+                'sum':       np.zeros(chunk_space, dtype='f8'),
+                'min':       np.full(chunk_space, np.nan),
+                'max':       np.full(chunk_space, np.nan),
+                'nan_count': np.zeros(chunk_space, dtype='i8'),
+            }
+
+            for position in product(*[range(s) for s in chunk_space]):
+                selection = tuple(
+                    slice(p*c, min((p+1)*c, s)) for p, c, s in zip(position, chunk_shape, var.shape))
+                data = var[selection]
+
+                missing = np.ma.getmaskarray(data)
+                nans    = np.isnan(np.ma.getdata(data)) & ~missing
+                valid   = np.ma.masked_array(np.ma.getdata(data), mask=missing | nans)
+
+                fields['count'][position]     = valid.count()
+                fields['nan_count'][position] = nans.sum()
+                if valid.count():
+                    fields['sum'][position] = valid.sum(dtype='f8')
+                    fields['min'][position] = valid.min()
+                    fields['max'][position] = valid.max()
+
+            group = dst.createGroup(_group_name(name))
+            group.shape       = list(var.shape)
+            group.chunk_shape = list(chunk_shape)
+
+            dims = []
+            for dim, space in zip(var.dimensions, chunk_space):
+                group.createDimension(f'chunk_{dim}', space)
+                dims.append(f'chunk_{dim}')
+
+            for field, values in fields.items():
+                group.createVariable(field, values.dtype, dims)[:] = values
+
+    return index_path
+
+class ChunkIndex:
+    """
+    Statistics for each chunk in storage of a single variable, loaded from the chunk
+    index sidecar file.
+    """
+
+    description = "Per-chunk statistics for a single variable."
+
+    def __init__(self, shape, chunk_shape, fields):
+        self.shape       = tuple(shape)
+        self.chunk_shape = tuple(chunk_shape)
+        self.fields      = fields
+
+    def covered_extent(self, extent):
+        """
+        Find the region of the ``extent`` made only from whole chunks in storage.
+
+        :returns:       A list of slices in ``array space``, or None if no whole chunks
+                        are covered by the extent.
+        """
+        covered = []
+        for ext, size, chunk in zip(extent, self.shape, self.chunk_shape):
+            if (ext.step or 1) != 1:
+                return None
+
+            start = -(-ext.start // chunk) * chunk
+            stop  = ext.stop if ext.stop == size else (ext.stop // chunk) * chunk
+            if start >= stop:
+                return None
+            covered.append(slice(start, stop))
+        return covered
+
+    def summarise(self, covered):
+        """
+        Combine the statistics of all chunks within the ``covered`` region.
+        """
+        selection = tuple(
+            slice(c.start // chunk, -(-c.stop // chunk))
+            for c, chunk in zip(covered, self.chunk_shape))
+
+        fields = {k: v[selection] for k, v in self.fields.items()}
+        count  = int(fields['count'].sum())
+        return {
+            'count':     count,
+            'sum':       float(fields['sum'].sum()),
+            'min':       float(np.nanmin(fields['min'])) if count else np.nan,
+            'max':       float(np.nanmax(fields['max'])) if count else np.nan,
+            'nan_count': int(fields['nan_count'].sum()),
+        }
+
+_index_cache = {}
+_index_lock  = threading.Lock()
+
+def get_chunk_index(filename, address, index_path=True):
+    """
+    Load the chunk index for a variable, cached once loaded. Indexes which do not
+    match the current size and modification time of the source file are ignored.
+
+    :param filename:    (str) The path to the source file.
+
+    :param address:     (str) The variable name within the source file.
+
+    :param index_path:  (str | bool) The path to the index file, or True to use
+                        the default sidecar location.
+
+    :returns:       A ``ChunkIndex`` instance, or None if no valid index is present
+                    for this variable.
+    """
+    if not index_path or not isinstance(filename, str):
+        return None
+    if index_path is True:
+        index_path = get_index_path(filename)
+
+    try:
+        identity = _source_identity(filename)
+    except OSError:
+        return None
+
+    key = (index_path, address, identity)
+    with _index_lock:
+        if key not in _index_cache:
+            _index_cache[key] = _load_chunk_index(index_path, address, identity)
+        return _index_cache[key]
+
+def _load_chunk_index(index_path, address, identity):
+    import netCDF4
+
+    if not os.path.isfile(index_path):
+        return None
+
+    with netCDF4.Dataset(index_path) as ds:
+        if (ds.source_size, ds.source_mtime) != identity:
+            print(f"ActiveWarning: Chunk index '{index_path}' is out of date - ignoring.")
+            return None
+
+        group = ds.groups.get(_group_name(address))
+        if group is None:
+            return None
+
+        fields = {k: np.array(group.variables[k][:]) for k in INDEX_FIELDS}
+        return ChunkIndex(
+            np.atleast_1d(group.shape),
+            np.atleast_1d(group.chunk_shape),
+            fields
+        )
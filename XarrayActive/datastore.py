@@ -11,27 +11,38 @@ import numpy as np
 
 from .active_chunk import (
     ActiveOptionsContainer,
+    get_missing_values,
 )
 
 from .wrappers import ActiveArrayWrapper
 
 class ActiveDataStore(NetCDF4DataStore, ActiveOptionsContainer):
 
+    # Variables which are not opened at all.
+    drop_variables = ()
+
     def get_variables(self):
         """
-        Override normal store behaviour to allow opening some variables 'actively'
+        Override normal store behaviour to allow opening some variables 'actively'.
+        Dropped variables are skipped before any of their metadata is read.
         """
+        drop_variables = self.drop_variables
+        if isinstance(drop_variables, str):
+            drop_variables = [drop_variables]
+
         return FrozenDict(
             (k, self.open_variable(k, v)) for k, v in self.ds.variables.items()
+            if k not in drop_variables
         )
     
     def open_variable(self, name: str, var):
         """
         Allow opening some variables 'actively', if they are not a dimension (where
         you'll want the whole array anyway) and where the active chunks are specified
-        - required by XarrayActive.
+        - required by XarrayActive. Scalar and empty variables (e.g. record variables
+        with no records yet) are always opened normally.
         """
-        if name in self.ds.dimensions or not self._active_chunks:
+        if name in self.ds.dimensions or not self._active_chunks or 0 in (var.ndim, var.size):
             return self.open_store_variable(name, var)
         else:
             return self.open_active_variable(name, var)
@@ -50,6 +61,15 @@ class ActiveDataStore(NetCDF4DataStore, ActiveOptionsContainer):
             units = getattr(var, 'units')
 
         attributes = {k: var.getncattr(k) for k in var.ncattrs()}
+        filters    = var.filters()
+        chunking   = var.chunking()
+
+        # Uncompressed contiguous variables are read through a numpy memmap, where
+        # the location of the data is only found once the variable is used.
+        memmap = None
+        if chunking == 'contiguous' and not any((filters or {}).values()):
+            memmap = 'auto'
+
         data       = indexing.LazilyIndexedArray(
             ActiveArrayWrapper(
                 self._filename,
@@ -58,7 +78,11 @@ class ActiveDataStore(NetCDF4DataStore, ActiveOptionsContainer):
                 units,
                 var.dtype,
                 named_dims=dimensions,
-                active_options=self.active_options
+                active_options=self.active_options,
+                missing=get_missing_values(attributes),
+                memmap=memmap,
+                storage_chunks=None if chunking == 'contiguous' else tuple(chunking),
+                group=var.group().path
             )
         )
         
@@ -80,10 +104,8 @@ class ActiveDataStore(NetCDF4DataStore, ActiveOptionsContainer):
             attributes["_FillValue"] = np.bytes_(attributes["_FillValue"])
 
         # netCDF4 specific encoding; save _FillValue for later
-        filters = var.filters()
         if filters is not None:
             encoding.update(filters)
-        chunking = var.chunking()
         if chunking is not None:
             if chunking == "contiguous":
                 encoding["contiguous"] = True
@@ -0,0 +1,220 @@
+import contextvars
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+
+# Counters recorded for every partition, and in total for each ActiveStats.
+COUNTERS = (
+    'requests',         # Requests sent to the Active backend.
+    'bytes_reduced',    # Bytes read from storage by the Active backend.
+    'bytes_returned',   # Bytes returned by the Active backend.
+    'local_reads',      # Reads made without Active.
+    'bytes_local',      # Bytes read without Active.
+    'clients',          # Active clients created.
+    'indexed',          # Reductions answered by the chunk index.
+    'cached',           # Reductions answered by the result cache.
+    'raw_reductions',   # Reductions of raw data, for methods not provided by Active.
+    'request_time',     # Seconds spent waiting for requests to Active.
+    'client_time',      # Seconds spent creating Active clients.
+)
+
+# All ActiveStats currently recording, in any thread.
+_recorders = []
+_lock      = threading.Lock()
+
+# Record of the partition being reduced by the current thread or task.
+_partition = contextvars.ContextVar('active_partition', default=None)
+
+class ActiveStats:
+    """
+    Records the storage requests, bytes moved, fallbacks and timings of all active
+    reductions computed within the context, by any thread of this process. Totals are
+    given by ``totals`` and each partition reduced is recorded in ``partitions``.
+    Reductions computed in other processes (e.g. by dask distributed workers) are not
+    recorded.
+
+    Example:
+        with ActiveStats() as stats:
+            ds['p'].mean().compute()
+        print(stats.totals())
+    """
+
+    description = "Records the requests, bytes moved, fallbacks and timings of active reductions."
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._start = None
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all counters and remove the partition records.
+        """
+        with self._lock:
+            self.counts     = dict.fromkeys(COUNTERS, 0)
+            self.fallbacks  = Counter()
+            self.partitions = []
+            self.wall_time  = 0.0
+
+    def __enter__(self):
+        with _lock:
+            _recorders.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.wall_time += time.perf_counter() - self._start
+        with _lock:
+            _recorders.remove(self)
+
+    def __getattr__(self, name):
+        if name in COUNTERS:
+            return self.counts[name]
+        raise AttributeError(name)
+
+    def _add(self, counts, fallback=None):
+        with self._lock:
+            for key, value in counts.items():
+                self.counts[key] += value
+            if fallback is not None:
+                self.fallbacks[fallback] += 1
+
+    def _add_partition(self, record):
+        with self._lock:
+            self.partitions.append(record)
+
+    def totals(self):
+        """
+        Totals of all counters, with the number of partitions reduced, the time spent
+        reducing partitions, the number of fallbacks and the wall time of the context.
+
+        :returns:       A dict of the totals.
+        """
+        with self._lock:
+            totals = dict(self.counts)
+            totals['partitions']     = len(self.partitions)
+            totals['partition_time'] = sum(p['time'] for p in self.partitions)
+            totals['fallbacks']      = sum(self.fallbacks.values())
+            totals['wall_time']      = self.wall_time
+        return totals
+
+    def __repr__(self):
+        totals = self.totals()
+        fallbacks = ', '.join(f'{k}={v}' for k, v in sorted(self.fallbacks.items()))
+        return (
+            f"<ActiveStats: partitions={totals['partitions']}, requests={totals['requests']}, "
+            f"bytes_reduced={totals['bytes_reduced']}, bytes_returned={totals['bytes_returned']}, "
+            f"bytes_local={totals['bytes_local']}, fallbacks={totals['fallbacks']}"
+            f"{' (' + fallbacks + ')' if fallbacks else ''}, "
+            f"wall_time={totals['wall_time']:.3f}s>"
+        )
+
+def is_recording():
+    """
+    Determine if any ActiveStats are recording, so no records are kept otherwise.
+    """
+    return bool(_recorders)
+
+def _get_recorders():
+    with _lock:
+        return list(_recorders)
+
+def record(fallback=None, **counts):
+    """
+    Add to the counters of the current partition and all recording ActiveStats.
+
+    :param fallback:    (str) Reason for a fallback to a less efficient method, if any.
+    """
+    if not _recorders:
+        return
+
+    partition = _partition.get()
+    if partition is not None:
+        with _lock:
+            for key, value in counts.items():
+                partition[key] += value
+            if fallback is not None:
+                partition['fallbacks'].append(fallback)
+
+    for stats in _get_recorders():
+        stats._add(counts, fallback=fallback)
+
+def record_fallback(reason):
+    """
+    Record a fallback to a less efficient method, such as reading the raw data
+    where Active is unavailable.
+    """
+    record(fallback=reason)
+
+@contextmanager
+def partition_scope(method, partition):
+    """
+    Record the requests and time taken to reduce a single partition. Counters
+    recorded within the context are added to the record of this partition.
+
+    :param method:      (str) The reduction applied to the partition.
+
+    :param partition:   (obj) The partition being reduced.
+    """
+    if not _recorders:
+        yield None
+        return
+
+    extent = None
+    if hasattr(partition, 'get_extent'):
+        extent = tuple(partition.get_extent())
+
+    partition_record = dict.fromkeys(COUNTERS, 0)
+    partition_record.update({
+        'method': method,
+        'address': getattr(partition, 'address', None),
+        'extent': extent,
+        'fallbacks': [],
+        'time': 0.0,
+    })
+
+    token = _partition.set(partition_record)
+    start = time.perf_counter()
+    try:
+        yield partition_record
+    finally:
+        partition_record['time'] = time.perf_counter() - start
+        _partition.reset(token)
+        for stats in _get_recorders():
+            stats._add_partition(partition_record)
+
+def send_request(active, index):
+    """
+    Send a request to an Active client, recording the bytes read from storage by
+    Active and the size of the response.
+    """
+    if not _recorders:
+        return active[index]
+
+    before = getattr(active, 'data_read', 0) or 0
+    start  = time.perf_counter()
+    result = active[index]
+    elapsed = time.perf_counter() - start
+
+    if isinstance(result, dict):
+        returned = sum(np.asarray(v).nbytes for v in result.values())
+    else:
+        returned = np.asarray(result).nbytes
+
+    record(
+        requests=1,
+        bytes_reduced=(getattr(active, 'data_read', 0) or 0) - before,
+        bytes_returned=returned,
+        request_time=elapsed)
+    return result
+
+def context_map(executor, func, requests):
+    """
+    Map ``func`` over the ``requests`` with a pool of threads, where each call is made
+    within a copy of the current context so records are added to the current partition.
+    """
+    contexts = [contextvars.copy_context() for _ in requests]
+    return executor.map(lambda ctx, r: ctx.run(func, r), contexts, requests)
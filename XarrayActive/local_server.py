@@ -0,0 +1,159 @@
+import threading
+import time
+
+import numpy as np
+
+from .active_chunk import get_missing_values
+
+class LocalActiveServer:
+    """
+    Local stand-in for an active storage server, which reduces the chunks of netCDF4/HDF5
+    files on local disk. Clients follow the request protocol of ``activestorage.active.Active``,
+    so the server can be given as the ``backend`` active option or to ``set_active_backend``.
+    A fixed ``latency`` is added to every request, and the response is delayed according to
+    the ``bandwidth``, so active features can be tested and benchmarked with no network.
+
+    Example:
+        server = LocalActiveServer(latency=0.02, bandwidth=50e6)
+        ds = xr.open_dataset('file.nc', engine='Active', active_options={'backend': server})
+    """
+
+    description = "Local stand-in for an active storage server."
+
+    def __init__(self, latency=0.0, bandwidth=None):
+        """
+        :param latency:     (float) Seconds added to every request.
+
+        :param bandwidth:   (float) Bytes per second sent in response to each request, or
+                            None for no limit.
+        """
+        self.latency   = latency
+        self.bandwidth = bandwidth
+        self._setup()
+
+    def _setup(self):
+        self._lock      = threading.Lock()
+        self._files     = {}
+        self.requests   = 0
+        self.bytes_read = 0
+        self.bytes_sent = 0
+
+    def __getstate__(self):
+        return {'latency': self.latency, 'bandwidth': self.bandwidth}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup()
+
+    def __dask_tokenize__(self):
+        return (type(self).__name__, id(self))
+
+    def __call__(self, filename, address, axis=None):
+        """
+        Create a client for a variable, with the same arguments as ``Active``.
+        """
+        return LocalActive(self, filename, address, axis=axis)
+
+    def reset(self):
+        """
+        Reset the request counters and close all open files.
+        """
+        with self._lock:
+            for ds in self._files.values():
+                ds.close()
+            self._setup()
+
+    def _get_variable(self, filename, address):
+        import netCDF4
+
+        if filename not in self._files:
+            self._files[filename] = netCDF4.Dataset(filename)
+        var = self._files[filename][address]
+        var.set_auto_maskandscale(False)
+        return var
+
+    def read(self, filename, address, index):
+        """
+        Read the raw values of a selection from disk, masking missing values in the same
+        way as ``Active``.
+
+        :returns:       A masked array of the selection.
+        """
+        # netCDF4 is not thread safe, so reads from disk are made one at a time.
+        with self._lock:
+            var  = self._get_variable(filename, address)
+            data = var[index]
+            missing = get_missing_values(
+                {k: var.getncattr(k) for k in var.ncattrs()}) or (None,)*4
+            self.requests   += 1
+            self.bytes_read += data.nbytes
+
+        _FillValue, missing_value, valid_min, valid_max = missing
+
+        data = np.ma.masked_array(data)
+        if _FillValue is not None:
+            data = np.ma.masked_equal(data, _FillValue)
+        if missing_value is not None:
+            data = np.ma.masked_equal(data, missing_value)
+        if valid_max is not None:
+            data = np.ma.masked_greater(data, valid_max)
+        if valid_min is not None:
+            data = np.ma.masked_less(data, valid_min)
+        return data
+
+    def respond(self, result):
+        """
+        Apply the latency and bandwidth of the server to a response.
+        """
+        if isinstance(result, dict):
+            nbytes = sum(np.asarray(v).nbytes for v in result.values())
+        else:
+            nbytes = np.asarray(result).nbytes
+
+        with self._lock:
+            self.bytes_sent += nbytes
+
+        delay = self.latency
+        if self.bandwidth:
+            delay += nbytes / self.bandwidth
+        if delay:
+            time.sleep(delay)
+        return result
+
+class LocalActive:
+    """
+    Client for a ``LocalActiveServer`` request, following the interface of ``Active``.
+    """
+
+    description = "Client for a LocalActiveServer."
+
+    def __init__(self, server, filename, address, axis=None):
+        self.server     = server
+        self.filename   = filename
+        self.address    = address
+        self.method     = None
+        self.components = False
+        self.data_read  = 0
+
+        self._axis = axis
+
+    def __getitem__(self, index):
+        data = self.server.read(self.filename, self.address, index)
+        self.data_read += data.nbytes
+
+        if self.method is None:
+            return self.server.respond(data)
+
+        axis = self._axis
+        if axis is None:
+            axis = tuple(range(data.ndim))
+
+        n = np.ma.count(data, axis=axis, keepdims=True)
+        if self.method == 'mean':
+            total = np.ma.sum(data, axis=axis, keepdims=True)
+            result = {'sum': total, 'n': n} if self.components else total / n
+        else:
+            value  = getattr(np.ma, self.method)(data, axis=axis, keepdims=True)
+            result = {self.method: value, 'n': n} if self.components else value
+
+        return self.server.respond(result)
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import numpy as np
+
+from collections import OrderedDict
+
+def get_memmap_layout(filename, address):
+    """
+    Find the location of a variable stored as a single uncompressed block in a local
+    netCDF4/HDF5 file, so it may be read through a numpy memmap.
+
+    :param filename:    (str) The path to the source file.
+
+    :param address:     (str) The variable name within the source file.
+
+    :returns:       A tuple of the byte ``offset`` of the data within the file, the
+                    ``dtype`` string (with byte order) and the ``shape`` of the variable,
+                    or None if the variable cannot be memory-mapped.
+    """
+    if not os.path.isfile(filename):
+        return None
+
+    try:
+        import h5py
+    except ImportError:
+        return None
+
+    try:
+        with h5py.File(filename, 'r') as ds:
+            dset = ds[address]
+            if dset.chunks is not None or dset.external or dset.dtype.kind not in 'iuf':
+                return None
+            if dset.compression or dset.shuffle or dset.fletcher32 or dset.scaleoffset:
+                return None
+            offset = dset.id.get_offset()
+            if offset is None:
+                # Storage is not allocated where no data has been written.
+                return None
+            return int(offset), dset.dtype.str, tuple(dset.shape)
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+class MemmapCache:
+    """
+    Process-local cache of read-only memory maps of contiguous variables, so
+    repeated reads of the same variable share a single mapping. Mappings are
+    replaced if the source file is modified.
+    """
+
+    description = "Process-local cache of memory-mapped contiguous variables."
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._lock   = threading.Lock()
+        self._maps   = OrderedDict()
+
+    def get(self, filename, offset, dtype, shape):
+        """
+        Get the memory map of a contiguous variable.
+
+        :returns:       A read-only ``numpy.memmap`` of the whole variable.
+        """
+        stat = os.stat(filename)
+        key  = (filename, offset, dtype, shape, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            if key in self._maps:
+                self._maps.move_to_end(key)
+                return self._maps[key]
+
+        array = np.memmap(filename, dtype=np.dtype(dtype), mode='r', offset=offset, shape=shape)
+
+        with self._lock:
+            self._maps[key] = array
+            while len(self._maps) > self.maxsize:
+                self._maps.popitem(last=False)
+        return array
+
+    def clear(self):
+        with self._lock:
+            self._maps.clear()
+
+memmap_cache = MemmapCache()
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from xarray.core import indexing
+from xarray.core.variable import Variable
+
+from .chunk_index import _source_identity
+from .wrappers import ActiveArrayWrapper
+
+# Version of the format of cached metadata, entries of any other version are ignored.
+CACHE_VERSION = 2
+
+def get_default_cache_dir():
+    """
+    Default location of the metadata cache, within the user cache directory.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'XarrayActive', 'metadata')
+
+class MetadataCache:
+    """
+    Persistent on-disk cache of the metadata of opened active datasets, so datasets
+    which are opened repeatedly are built without reading the file header. Entries are
+    keyed by the path and group of the file, and ignored if the size or modification
+    time of the file has changed.
+
+    Example:
+        cache = MetadataCache('/tmp/active_cache')
+        ds = xr.open_dataset('file.nc', engine='Active', metadata_cache=cache)
+    """
+
+    description = "Persistent on-disk cache of the metadata of opened datasets."
+
+    def __init__(self, directory=None):
+        """
+        :param directory:   (str) Directory holding the cached metadata, defaults to
+                            ``XarrayActive/metadata`` in the user cache directory.
+        """
+        self.directory = os.fspath(directory or get_default_cache_dir())
+        self.hits      = 0
+        self.misses    = 0
+
+    def _get_path(self, filename, group=None):
+        key = repr((os.path.abspath(filename), group))
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.pkl')
+
+    def get(self, filename, group=None):
+        """
+        Get the cached metadata of a file.
+
+        :returns:       A dict of the metadata, or None if there is no valid entry for
+                        the current version of the file.
+        """
+        try:
+            identity = _source_identity(filename)
+            with open(self._get_path(filename, group), 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            entry = None
+
+        if (not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION or
+                entry.get('identity') != identity):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, filename, entry, identity, group=None):
+        """
+        Store the metadata of a file, replacing any previous entry. The entry is written
+        to a temporary file first, so concurrent readers never see a partial entry.
+
+        :param identity:    (tuple) The size and modification time of the file when the
+                            metadata was read.
+        """
+        entry = dict(entry, version=CACHE_VERSION, identity=identity)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._get_path(filename, group))
+        except OSError as err:
+            print(f"ActiveWarning: Unable to write metadata cache - {err}")
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.directory, name))
+
+def get_metadata_cache(metadata_cache):
+    """
+    Normalise the ``metadata_cache`` parameter of the backend.
+
+    :param metadata_cache:  (bool | str | MetadataCache) True to use the default cache
+                            directory, the path to a cache directory or a cache instance.
+
+    :returns:       A ``MetadataCache`` instance, or None if caching is disabled.
+    """
+    if not metadata_cache:
+        return None
+    if isinstance(metadata_cache, MetadataCache):
+        return metadata_cache
+    if metadata_cache is True:
+        return MetadataCache()
+    return MetadataCache(metadata_cache)
+
+def get_store_metadata(store):
+    """
+    Read the metadata of all variables from an ActiveDataStore, in a form which can be
+    cached. The values of variables which are not opened actively (the dimensions) are
+    read, along with the storage chunks and memmap location of each active variable.
+
+    :returns:       A dict of the ``variables``, ``attrs`` and ``encoding`` of the store.
+    """
+    variables = {}
+    for name, var in store.get_variables().items():
+        # The wrapper is held within the lazy indexing adapters applied by the store.
+        wrapper = var._data
+        while not isinstance(wrapper, ActiveArrayWrapper) and hasattr(wrapper, 'array'):
+            wrapper = wrapper.array
+
+        meta = {
+            'dims': var.dims,
+            'attrs': dict(var.attrs),
+            'encoding': dict(var.encoding),
+        }
+        if isinstance(wrapper, ActiveArrayWrapper):
+            meta['wrapper'] = {
+                'shape': wrapper.shape,
+                'units': wrapper.units,
+                'dtype': wrapper.dtype,
+                'named_dims': wrapper.named_dims,
+                'missing': wrapper.missing,
+                'storage_chunks': wrapper.storage_chunks,
+                'group': wrapper.group,
+                'memmap': wrapper.memmap,
+            }
+        else:
+            meta['data'] = var.values
+        variables[name] = meta
+
+    return {
+        'variables': variables,
+        'attrs': dict(store.get_attrs()),
+        'encoding': store.get_encoding(),
+    }
+
+def load_metadata_variables(entry, filename, active_options={}, drop_variables=None):
+    """
+    Build the variables of a dataset from cached metadata, with no reads from the file.
+
+    :returns:       A dict of the variables and a dict of the global attributes.
+    """
+    drop_variables = drop_variables or ()
+    if isinstance(drop_variables, str):
+        drop_variables = [drop_variables]
+
+    variables = {}
+    for name, meta in entry['variables'].items():
+        if name in drop_variables:
+            continue
+
+        if 'wrapper' in meta:
+            w = meta['wrapper']
+            data = indexing.LazilyIndexedArray(
+                ActiveArrayWrapper(
+                    filename,
+                    None,
+                    w['shape'],
+                    w['units'],
+                    w['dtype'],
+                    named_dims=w['named_dims'],
+                    active_options=active_options,
+                    missing=w['missing'],
+                    memmap=w['memmap'],
+                    storage_chunks=w['storage_chunks'],
+                    name=name,
+                    group=w['group']
+                )
+            )
+        else:
+            data = meta['data'].copy()
+
+        variables[name] = Variable(
+            meta['dims'], data, dict(meta['attrs']), dict(meta['encoding']))
+
+    return variables, dict(entry['attrs'])
@@ -0,0 +1,301 @@
+import glob
+import multiprocessing
+import os
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from xarray.core import indexing
+from xarray.core.variable import Variable
+
+from .active_chunk import get_missing_values
+from .backend import decode_active_dataset
+from .datastore import ActiveDataStore
+from .memmap import get_memmap_layout
+from .wrappers import MultiFileArrayWrapper
+
+# Attributes used to mask and unpack the values of a variable, which must be the same in
+# every file as the values are decoded with the attributes of the first file.
+DECODING_ATTRS = (
+    '_FillValue', 'missing_value', 'valid_min', 'valid_max', 'valid_range',
+    'scale_factor', 'add_offset')
+
+def _decoding_attrs(var):
+    return {k: var.getncattr(k) for k in var.ncattrs() if k in DECODING_ATTRS}
+
+def _attrs_match(attrs, other):
+    """
+    Determine if two dicts of attributes are equal, where the values may be arrays.
+    """
+    if attrs.keys() != other.keys():
+        return False
+    for key, value in attrs.items():
+        value, other_value = np.asarray(value), np.asarray(other[key])
+        equal_nan = value.dtype.kind == 'f' and other_value.dtype.kind == 'f'
+        if not np.array_equal(value, other_value, equal_nan=equal_nan):
+            return False
+    return True
+
+def read_file_metadata(filename, concat_dim, drop_variables=()):
+    """
+    Read the metadata required to concatenate a file with the others in a multi-file
+    dataset, for all variables along ``concat_dim``. Only the values of the coordinate
+    variable for ``concat_dim`` are read.
+
+    :param filename:    (str) The path to the source file.
+
+    :param concat_dim:  (str) The dimension along which the files are concatenated.
+
+    :param drop_variables:  (list) Variables which are skipped.
+
+    :returns:       A dict of the ``size`` of the file along ``concat_dim``, the raw
+                    ``coordinate`` values with their ``coordinate_attrs`` and the
+                    ``variables`` along ``concat_dim``, with the dimensions, shape, dtype,
+                    decoding attributes, storage chunks and memmap location of each.
+    """
+    import netCDF4
+
+    variables  = {}
+    coordinate = None
+    coordinate_attrs = {}
+    contiguous = []
+
+    with netCDF4.Dataset(filename) as ds:
+        if concat_dim not in ds.dimensions:
+            raise ValueError(
+                f"Dimension '{concat_dim}' is not present in '{filename}'"
+            )
+        size = ds.dimensions[concat_dim].size
+
+        for name, var in ds.variables.items():
+            if concat_dim not in var.dimensions or name in drop_variables:
+                continue
+
+            if name == concat_dim:
+                var.set_auto_maskandscale(False)
+                coordinate = np.asarray(var[:])
+                coordinate_attrs = {k: var.getncattr(k) for k in var.ncattrs()}
+                continue
+
+            chunking = var.chunking()
+            if chunking == 'contiguous' and not any((var.filters() or {}).values()):
+                contiguous.append(name)
+
+            variables[name] = {
+                'dimensions': var.dimensions,
+                'shape': var.shape,
+                'dtype': var.dtype,
+                'decoding': _decoding_attrs(var),
+                'storage_chunks': None if chunking == 'contiguous' else tuple(chunking),
+                'memmap': None,
+            }
+
+    for name in contiguous:
+        variables[name]['memmap'] = get_memmap_layout(filename, name)
+
+    return {
+        'size': size,
+        'coordinate': coordinate,
+        'coordinate_attrs': coordinate_attrs,
+        'variables': variables,
+    }
+
+def read_metadata(paths, concat_dim, drop_variables=(), parallel=True, max_workers=None):
+    """
+    Read the metadata of all files, in parallel using a pool of processes if
+    ``parallel`` is set. The netCDF4 library is not thread-safe, so files are not
+    read by threads. Processes are spawned rather than forked, as forking while any
+    HDF5 file is open in this process is unsafe.
+
+    :returns:       A list of the metadata for each file, in the order of ``paths``.
+    """
+    func = partial(read_file_metadata, concat_dim=concat_dim, drop_variables=drop_variables)
+    if not parallel or len(paths) < 2:
+        return [func(path) for path in paths]
+
+    workers   = min(max_workers or os.cpu_count() or 1, len(paths))
+    chunksize = max(1, len(paths) // (4 * workers))
+    context   = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(func, paths, chunksize=chunksize))
+
+def concat_coordinate(paths, metadata, concat_dim):
+    """
+    Concatenate the raw values of the coordinate variable of all files, converted to
+    the units of the first file. Times in files with different reference dates (e.g.
+    ``days since`` the start of each file) are converted with cftime.
+
+    :returns:       The array of the coordinate values for all files.
+    """
+    first  = metadata[0]['coordinate_attrs']
+    values = []
+    for path, meta in zip(paths, metadata):
+        attrs = meta['coordinate_attrs']
+        value = meta['coordinate']
+
+        decoding = {k: v for k, v in attrs.items() if k in DECODING_ATTRS}
+        if not _attrs_match(decoding, {k: v for k, v in first.items() if k in DECODING_ATTRS}):
+            raise ValueError(
+                f"Coordinate '{concat_dim}' in '{path}' is packed or masked differently "
+                "to the first file"
+            )
+
+        units, first_units = attrs.get('units'), first.get('units')
+        calendar = attrs.get('calendar', 'standard')
+        if units != first_units or calendar != first.get('calendar', 'standard'):
+            if (calendar != first.get('calendar', 'standard') or 
+                    ' since ' not in str(units) or ' since ' not in str(first_units)):
+                raise ValueError(
+                    f"Coordinate '{concat_dim}' in '{path}' has units '{units}' and calendar "
+                    f"'{calendar}' which cannot be converted to those of the first file"
+                )
+            import cftime
+            dates = cftime.num2date(value, units, calendar=calendar)
+            value = np.asarray(cftime.date2num(dates, first_units, calendar=calendar))
+        values.append(value)
+
+    return np.concatenate(values)
+
+def _expand_paths(paths):
+    if isinstance(paths, (str, os.PathLike)):
+        paths = sorted(glob.glob(os.fspath(paths))) or [os.fspath(paths)]
+    paths = [os.fspath(p) for p in paths]
+    if not paths:
+        raise OSError('No files given to open')
+    return paths
+
+def open_active_mfdataset(
+        paths,
+        concat_dim=None,
+        active_options={},
+        parallel=True,
+        max_workers=None,
+        drop_variables=None,
+        mask_and_scale=None,
+        decode_times=None,
+        concat_characters=None,
+        decode_coords=None,
+        use_cftime=None,
+        decode_timedelta=None,
+    ):
+    """
+    Open many netCDF4/HDF5 files as a single active dataset, concatenated along
+    ``concat_dim``. Only the metadata of each file is read, and a single array is
+    built for each variable along ``concat_dim`` with partitions from all files. All
+    other variables and the attributes are taken from the first file.
+
+    :param paths:           (str | list) A glob string or list of paths, in the order
+                            of concatenation. Glob matches are sorted.
+
+    :param concat_dim:      (str) The dimension along which the files are concatenated,
+                            defaults to the unlimited dimension of the first file.
+
+    :param active_options:  (dict) The active options applied to every variable.
+
+    :param parallel:        (bool) Read the metadata of the files in parallel.
+
+    :param max_workers:     (int) Number of processes reading metadata in parallel.
+
+    :returns:       An ActiveDataset object for all files.
+    """
+    paths = _expand_paths(paths)
+
+    drop_variables = drop_variables or []
+    if isinstance(drop_variables, str):
+        drop_variables = [drop_variables]
+
+    store = ActiveDataStore.open(paths[0])
+    store.active_options = active_options
+    store.drop_variables = drop_variables
+
+    if not store._active_chunks:
+        raise ValueError(
+            'Multi-file datasets require active chunks'
+        )
+
+    if concat_dim is None:
+        unlimited = [d for d, dim in store.ds.dimensions.items() if dim.isunlimited()]
+        if not unlimited:
+            raise ValueError(
+                'No unlimited dimension in the first file, concat_dim must be given'
+            )
+        concat_dim = unlimited[0]
+
+    metadata = read_metadata(
+        paths, concat_dim, drop_variables=drop_variables, parallel=parallel, max_workers=max_workers)
+
+    offsets = np.cumsum([0] + [m['size'] for m in metadata])
+
+    vars, attrs = store.load()
+    vars, attrs = dict(vars), dict(attrs)
+    encoding    = store.get_encoding()
+
+    for name, var in list(vars.items()):
+        if concat_dim not in var.dims or name in drop_variables:
+            continue
+
+        axis = var.dims.index(concat_dim)
+
+        if name == concat_dim:
+            values = concat_coordinate(paths, metadata, concat_dim)
+            vars[name] = Variable(var.dims, values, var.attrs, var.encoding)
+            continue
+
+        first     = metadata[0]['variables'][name]
+        fragments = []
+        for path, meta, start, stop in zip(paths, metadata, offsets[:-1], offsets[1:]):
+            file_var = meta['variables'].get(name)
+            if file_var is None:
+                raise ValueError(
+                    f"Variable '{name}' is not present in '{path}'"
+                )
+            if (file_var['dimensions'] != first['dimensions'] or
+                    file_var['dtype'] != first['dtype'] or
+                    any(s != f for i, (s, f) in enumerate(zip(file_var['shape'], first['shape']))
+                        if i != axis)):
+                raise ValueError(
+                    f"Variable '{name}' in '{path}' does not match the first file"
+                )
+            if not _attrs_match(file_var['decoding'], first['decoding']):
+                raise ValueError(
+                    f"Variable '{name}' in '{path}' is packed or masked differently "
+                    "to the first file"
+                )
+            fragments.append(
+                (path, int(start), int(stop), file_var['storage_chunks'], file_var['memmap']))
+
+        shape = tuple(int(offsets[-1]) if i == axis else s for i, s in enumerate(var.shape))
+
+        wrapper = MultiFileArrayWrapper(
+            fragments,
+            name,
+            shape,
+            axis,
+            units=var.attrs.get('units', ''),
+            dtype=first['dtype'],
+            named_dims=var.dims,
+            active_options=store.active_options,
+            missing=get_missing_values(var.attrs)
+        )
+        var_encoding = dict(var.encoding)
+        var_encoding['original_shape'] = shape
+        vars[name] = Variable(
+            var.dims, indexing.LazilyIndexedArray(wrapper), var.attrs, var_encoding)
+
+    ds = decode_active_dataset(
+        vars,
+        attrs,
+        mask_and_scale=mask_and_scale,
+        decode_times=decode_times,
+        concat_characters=concat_characters,
+        decode_coords=decode_coords,
+        drop_variables=drop_variables,
+        use_cftime=use_cftime,
+        decode_timedelta=decode_timedelta,
+    )
+    ds.set_close(store.close)
+    ds.encoding = encoding
+
+    return ds
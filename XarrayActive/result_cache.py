@@ -0,0 +1,250 @@
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+
+from collections import OrderedDict
+from dask.utils import parse_bytes
+
+from .chunk_index import _source_identity
+
+# Version of the format of cached results, included in every key.
+CACHE_VERSION = 1
+
+def get_result_key(filename, address, extent, method, axis, skipna=None, decoding=None, **kwargs):
+    """
+    Content-addressed key for the result of a reduction of a single partition. The key
+    includes the size and modification time of the source file, so results are never
+    reused once the file changes.
+
+    :param extent:      (list) The slices of the partition in the source variable.
+
+    :param decoding:    (tuple) Any masking and unpacking applied to the partition.
+
+    :returns:       A hex digest string, or None if the source is not a local file.
+    """
+    if not isinstance(filename, str):
+        return None
+    try:
+        identity = _source_identity(filename)
+    except OSError:
+        return None
+
+    key = (
+        CACHE_VERSION,
+        os.path.abspath(filename),
+        identity,
+        address,
+        tuple((s.start, s.stop, s.step) for s in extent),
+        method,
+        tuple(axis),
+        skipna,
+        decoding,
+        sorted(kwargs.items()),
+    )
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+def _result_nbytes(result):
+    if isinstance(result, dict):
+        return sum(np.asarray(v).nbytes for v in result.values())
+    return np.asarray(result).nbytes
+
+class ResultCache:
+    """
+    Cache of the partial results of active reductions for each partition, so repeated
+    and overlapping queries only reduce the partitions not seen before. Results are
+    held in memory with least-recently-used eviction, and optionally in a ``directory``
+    on disk shared between processes, where the oldest results are removed once the
+    total size exceeds ``disk_bytes``.
+
+    Example:
+        cache = ResultCache(max_bytes='128MiB', directory='/tmp/active_results')
+        ds = xr.open_dataset('file.nc', engine='Active', active_options={'result_cache': cache})
+    """
+
+    description = "Cache of the partial results of active reductions for each partition."
+
+    def __init__(self, max_bytes='256MiB', directory=None, disk_bytes='1GiB'):
+        """
+        :param max_bytes:   (int | str) Maximum size of the results held in memory.
+
+        :param directory:   (str) Directory for results on disk, or None to keep results
+                            in memory only.
+
+        :param disk_bytes:  (int | str) Maximum size of the results held on disk.
+        """
+        self.max_bytes  = parse_bytes(max_bytes)
+        self.directory  = os.fspath(directory) if directory else None
+        self.disk_bytes = parse_bytes(disk_bytes)
+        self._setup()
+
+    def _setup(self):
+        self._lock    = threading.Lock()
+        self._results = OrderedDict()
+        self.nbytes   = 0
+        self.hits     = 0
+        self.misses   = 0
+
+        # Bytes written to disk since the size of the directory was last checked.
+        self._written = 0
+
+    def __getstate__(self):
+        return {
+            'max_bytes': self.max_bytes,
+            'directory': self.directory,
+            'disk_bytes': self.disk_bytes
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup()
+
+    def __dask_tokenize__(self):
+        return (type(self).__name__, id(self))
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def get(self, key):
+        """
+        Get a cached result, from memory if present, otherwise from disk.
+
+        :returns:       A copy of the result, or None if the result is not cached.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._results[key][0])
+
+        result = None
+        if self.directory is not None:
+            path = self._get_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                # The modification time orders the results on disk by last use.
+                os.utime(path)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                result = None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        self._store(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+        """
+        Cache the result of a reduction, in memory and on disk if a directory is set.
+        """
+        result = copy.deepcopy(result)
+        self._store(key, result)
+
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._get_path(key))
+        except OSError as err:
+            print(f"ActiveWarning: Unable to write result cache - {err}")
+            return
+
+        with self._lock:
+            self._written += _result_nbytes(result)
+            trim = self._written > self.disk_bytes // 10
+            if trim:
+                self._written = 0
+        if trim:
+            self._trim_disk()
+
+    def _store(self, key, result):
+        nbytes = _result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._results:
+                self.nbytes -= self._results.pop(key)[1]
+            self._results[key] = (result, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, size) = self._results.popitem(last=False)
+                self.nbytes -= size
+
+    def _trim_disk(self):
+        """
+        Remove the least recently used results on disk until the total size is within
+        ``disk_bytes``.
+        """
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.pkl'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Remove all results from memory and disk.
+        """
+        with self._lock:
+            self._results.clear()
+            self.nbytes = 0
+
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.directory, name))
+
+# Process-wide cache used where the ``result_cache`` option is True.
+result_cache = ResultCache()
+
+_directory_caches = {}
+_caches_lock      = threading.Lock()
+
+def get_result_cache(option):
+    """
+    Normalise the ``result_cache`` active option.
+
+    :param option:  (bool | str | ResultCache) True for the process-wide cache in memory,
+                    the path to a directory for results on disk or a cache instance.
+
+    :returns:       A ``ResultCache`` instance, or None if results are not cached.
+    """
+    if not option:
+        return None
+    if isinstance(option, ResultCache):
+        return option
+    if option is True:
+        return result_cache
+
+    directory = os.fspath(option)
+    with _caches_lock:
+        if directory not in _directory_caches:
+            _directory_caches[directory] = ResultCache(directory=directory)
+        return _directory_caches[directory]
@@ -3,9 +3,7 @@ from arraypartition import (
     ArrayLike,
     get_chunk_space,
     get_chunk_shape,
-    get_chunk_positions,
     get_chunk_extent,
-    get_dask_chunks,
     combine_slices
 )
 from .active_chunk import (
@@ -13,10 +11,17 @@ from .active_chunk import (
 )
 
 from .active_dask import DaskActiveArray
+from .memmap import get_memmap_layout, memmap_cache
 
+import dask
 from dask.array.core import getter
 from dask.base import tokenize
+from dask.utils import parse_bytes
 
+import numpy as np
+
+from bisect import bisect_right
+from functools import cached_property
 from itertools import product
 
 class ActivePartition(ArrayPartition):
@@ -24,6 +29,92 @@ class ActivePartition(ArrayPartition):
     Container for future ActivePartition behaviour, may not be required unless
     additional behaviour is required.
     """
+    def __init__(
+            self, 
+            filename, 
+            address, 
+            storage_chunks=None, 
+            active_options=None, 
+            missing=None, 
+            masked=False, 
+            scale=None,
+            memmap=None,
+            **kwargs):
+        """
+        Adds the ``storage_chunks`` shape of the source variable, used to align
+        Active requests with the chunks in storage, the ``active_options``
+        applied by the active methods for this partition and the ``missing``
+        data attributes of the source variable. If ``masked`` is set, missing
+        values are replaced with NaN whenever data is read, and packed data is
+        unpacked with the (scale_factor, add_offset) given by ``scale``. Data is
+        read through a numpy memmap if the ``memmap`` location (offset, dtype, shape)
+        of an uncompressed contiguous source variable is given.
+        """
+        self.storage_chunks = storage_chunks
+        self.active_options = active_options or {}
+        self.missing        = missing
+        self.masked         = masked
+        self.scale          = scale
+        self.memmap         = memmap
+
+        super().__init__(filename, address, **kwargs)
+
+    def get_kwargs(self):
+        return {
+            'storage_chunks': self.storage_chunks,
+            'active_options': self.active_options,
+            'missing': self.missing,
+            'masked': self.masked,
+            'scale': self.scale,
+            'memmap': self.memmap
+        } | super().get_kwargs()
+
+    def _open_netcdf(self, filename):
+        ds = super()._open_netcdf(filename)
+        # Packed values are read as stored, and only unpacked by the partition.
+        ds.set_auto_scale(False)
+        return ds
+
+    def _get_memmap_view(self):
+        """
+        View of the memory-mapped source variable for the extent of this partition,
+        or None if the variable cannot be memory-mapped.
+        """
+        if self.memmap is None:
+            return None
+        offset, dtype, shape = self.memmap
+        extent = tuple(self.get_extent())
+        if len(extent) != len(shape):
+            return None
+        return memmap_cache.get(self.filename, offset, dtype, shape)[extent]
+
+    def _read_data(self):
+        """
+        Reductions use a view of the memory-mapped data where possible, so no copy
+        is made unless the data is decoded.
+        """
+        view = self._get_memmap_view()
+        if view is None:
+            return super()._read_data()
+        return self._post_process_data(view)
+
+    def __array__(self, *args, **kwargs):
+        view = self._get_memmap_view()
+        if view is None:
+            return super().__array__(*args, **kwargs)
+
+        dtype = args[0] if args else None
+        if dtype and dtype != self.dtype:
+            raise ValueError(
+                'Requested datatype does not match this chunk'
+            )
+        return self._post_process_data(np.array(view, dtype=self.dtype))
+
+    def _post_process_data(self, data):
+        if self.masked:
+            data = self._decode_data(data)
+        return data
+
     def copy(self, extent=None):
 
         kwargs = self.get_kwargs()
@@ -51,18 +142,89 @@ class ActiveArrayWrapper(ArrayLike, ActiveOptionsContainer):
             dtype=None,
             named_dims=None,
             active_options={},
+            missing=None,
+            memmap=None,
+            storage_chunks='auto',
+            name=None,
+            group=None,
         ):
+        """
+        :param var:             (obj) The netCDF4 variable, or None where the metadata of
+                                the variable is given, e.g. from the metadata cache.
+
+        :param storage_chunks:  (tuple) The shape of the chunks in storage, None for
+                                contiguous storage or 'auto' to read from ``var``.
+
+        :param name:            (str) The name of the variable, defaults to that of ``var``.
+
+        :param group:           (str) The path of the group holding the variable, defaults
+                                to the group of ``var`` or the root group.
+        """
 
         self._variable   = var
 
+        # Missing values are always excluded from reductions, and replaced with NaN
+        # when data is read if the variable is masked. Packed variables are unpacked
+        # with the (scale_factor, add_offset) in ``scale`` if the variable is masked.
+        self.missing     = missing
+        self.masked      = False
+        self.scale       = None
+
+        # Location of the data if the variable is uncompressed and contiguous in storage,
+        # or 'auto' to find the location on first use.
+        self._memmap     = memmap
+
         self.filename    = filename
-        self.name        = var.name
-        self.active_options = active_options
+        self.name        = name or var.name
+
+        # The netCDF4 variable is closed with the dataset, so any metadata needed to
+        # read the variable later is taken from it now.
+        if group is None:
+            group = var.group().path if var is not None else ''
+        self.group       = group.rstrip('/')
 
         self.named_dims = named_dims
 
+        if storage_chunks == 'auto':
+            chunking = var.chunking()
+            storage_chunks = None if chunking == 'contiguous' else tuple(chunking)
+        self.storage_chunks = storage_chunks
+
         super().__init__(shape, units=units, dtype=dtype)
 
+        # Chunk layout depends on the shape, so is set after ArrayLike init.
+        self.active_options = active_options
+
+        self.__array_function__ = self.__array__
+
+    @cached_property
+    def memmap(self):
+        """
+        Location of the data if the variable is uncompressed and contiguous in storage,
+        found on first use where the variable was opened with ``memmap='auto'``.
+        """
+        if self._memmap != 'auto':
+            return self._memmap
+        return get_memmap_layout(self.filename, self.group + '/' + self.name)
+
+    def _set_active_options(self, **kwargs):
+        """
+        Set the active options for this variable. The chunk layout is determined on
+        first use, and any dask array built with the previous options is discarded.
+        """
+        super()._set_active_options(**kwargs)
+
+        for attr in ('chunk_shape', 'chunk_space'):
+            self.__dict__.pop(attr, None)
+
+        self._dask_array = None
+
+    @cached_property
+    def chunk_shape(self):
+        """
+        Shape of each chunk of the dask array, determined from the active options.
+        """
+
         # Further work required to get this to work - 23/08/24
 
         #self._active_chunks = normalize_partition_chunks(
@@ -71,81 +233,412 @@ class ActiveArrayWrapper(ArrayLike, ActiveOptionsContainer):
         #    self.dtype,
         #    self.named_dims)
 
-        self.chunk_shape = get_chunk_shape(
+        if self._auto_chunks:
+            return get_storage_aligned_shape(
+                self._active_chunks,
+                self.shape,
+                self.named_dims,
+                self.dtype,
+                storage_chunks=self.storage_chunks,
+                chunk_bytes=self._chunk_bytes
+            )
+        return get_chunk_shape(
             self._active_chunks,
             self.shape,
             self.named_dims,
             chunk_limits=self._chunk_limits
         )
 
-        self.chunk_space = get_chunk_space(
+    @cached_property
+    def chunk_space(self):
+        """
+        Number of chunks of the dask array in each dimension.
+        """
+        return get_chunk_space(
             self.chunk_shape,
             self.shape
         )
-
-        self.__array_function__ = self.__array__
                 
     def __getitem__(self, selection):
         """
-        Non-lazy retrieval of the dask array when this object is indexed.
+        Non-lazy retrieval of the dask array when this object is indexed. Only the
+        chunks which intersect the selection are added to the dask graph, unless
+        the whole array is selected, in which case the dask array is built once and
+        cached.
+        """
+        if not self._active_chunks:
+            return self._variable[selection]
+
+        normalised = self._normalise_selection(selection)
+        if normalised is None:
+            arr = self.__array__()
+            return arr[selection]
+        
+        bounds, residual = normalised
+        if bounds == [slice(0, size, 1) for size in self.shape]:
+            arr = self.__array__()
+        else:
+            arr = self._build_dask_array(bounds=bounds)
+        return arr[residual]
+
+    def _normalise_selection(self, selection):
         """
-        arr = self.__array__()
-        return arr[selection]
+        Split a selection into the region of the array it covers, and the residual
+        selection to apply to that region.
+
+        :returns:       A list of slices with positive steps in ``array space`` bounding the 
+                        selected region and the tuple of the residual selection, or None
+                        if the selection is not supported.
+        """
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+
+        ellipses = [i for i, sel in enumerate(selection) if sel is Ellipsis]
+        if len(ellipses) > 1:
+            return None
+        if ellipses:
+            index = ellipses[0]
+            fill  = (slice(None),) * (self.ndim - len(selection) + 1)
+            selection = selection[:index] + fill + selection[index+1:]
+
+        if len(selection) > self.ndim:
+            return None
+        selection = selection + (slice(None),) * (self.ndim - len(selection))
+
+        bounds, residual = [], []
+        for sel, size in zip(selection, self.shape):
+            if isinstance(sel, (int, np.integer)):
+                sel = int(sel) + size if sel < 0 else int(sel)
+                if not 0 <= sel < size:
+                    return None
+                bounds.append(slice(sel, sel+1, 1))
+                residual.append(0)
+
+            elif isinstance(sel, slice):
+                positions = range(*sel.indices(size))
+                if len(positions) == 0 or positions.step < 0:
+                    return None
+                bounds.append(slice(positions.start, positions[-1] + 1, positions.step))
+                residual.append(slice(None))
+
+            else:
+                sel = np.asarray(sel)
+                if sel.ndim != 1 or sel.size == 0 or sel.dtype.kind not in 'iu':
+                    return None
+                sel = np.where(sel < 0, sel + size, sel)
+                if sel.min() < 0 or sel.max() >= size:
+                    return None
+                bounds.append(slice(int(sel.min()), int(sel.max()) + 1, 1))
+                residual.append(sel - sel.min())
+
+        return bounds, tuple(residual)
 
     def __array__(self, *args, **kwargs):
 
         if not self._active_chunks:
             # get_array should just get the whole array if that's what we're trying to do.
-            # indexing should just be added to the instance of this class, and then the
-            # built-in mean from _ActiveFragment should take care of things.
+            # indexing should just be added to the instance of this class, and then the
+            # built-in mean from _ActiveFragment should take care of things.
             return self._variable
-        else:
 
-            # For every dask chunk return a smaller object with the right extent.
-            # Create a chunk_shape tuple from chunks and _variable (figure out which chunk and which axis, divide etc.)
-            # Define a subarray for each chunk, with appropriate index.
+        if self._dask_array is None:
+            self._dask_array = self._build_dask_array()
+        return self._dask_array
 
-            array_name = (f"{self.__class__.__name__}-{tokenize(self)}",)
-            dsk = {}
-            positions = get_chunk_positions(self.chunk_space)
-            request   = get_chunk_extent(positions[0], self.shape, self.chunk_space)
+    def _build_dask_array(self, bounds=None):
+        """
+        Construct the DaskActiveArray from an ActivePartition for each dask chunk.
 
-            global_extent = {}
+        :param bounds:      (list) Slices in ``array space`` giving the selected region, only
+                            chunks which intersect this region are included and the extent
+                            of each chunk is narrowed to the region.
+        """
+        # For every dask chunk return a smaller object with the right extent.
+        # Create a chunk_shape tuple from chunks and _variable (figure out which chunk and which axis, divide etc.)
+        # Define a subarray for each chunk, with appropriate index.
 
-            for position in positions:
-                position = tuple(position)
-            
-                extent   = get_chunk_extent(position, self.shape, self.chunk_space)
-                cformat  = None
-                global_extent[position] = extent
-                
-                chunk = ActivePartition(
-                    self.filename,
-                    self.name,
-                    dtype=self.dtype,
-                    units=self.units,
-                    shape=self.chunk_shape,
-                    position=position,
-                    extent=extent,
-                    format=cformat
-                )
+        if bounds is None:
+            bounds = [slice(0, size, 1) for size in self.shape]
 
-                c_identifier = f"{chunk.__class__.__name__}-{tokenize(chunk)}"
-                dsk[c_identifier] = chunk
-                dsk[array_name + position] = (
-                    getter, # Dask default should be enough with the new indexing routine.
-                    c_identifier,
-                    request,
-                    False,
-                    getattr(chunk,"_lock",False)
-                )
+        array_name = (f"{self.__class__.__name__}-{tokenize(self, bounds)}",)
+        dsk = {}
 
-            dask_chunks = get_dask_chunks(
-                self.shape,
-                self.chunk_space,
-                extent=global_extent,
-                dtype=self.dtype,
-                explicit_shapes=None
+        selected_extents = self._get_selected_extents(bounds)
+
+        for selected in product(*[enumerate(dim) for dim in selected_extents]):
+            position        = tuple(s[0] for s in selected)
+            source_position = tuple(s[1][0] for s in selected)
+
+            extent   = [s[1][1] for s in selected]
+            request  = tuple(slice(0, len(range(e.start, e.stop, e.step))) for e in extent)
+
+            chunk = self._get_partition(source_position, extent)
+
+            c_identifier = f"{chunk.__class__.__name__}-{tokenize(chunk)}"
+            dsk[c_identifier] = chunk
+            dsk[array_name + position] = (
+                getter, # Dask default should be enough with the new indexing routine.
+                c_identifier,
+                request,
+                False,
+                getattr(chunk,"_lock",False)
             )
 
-            return DaskActiveArray(dsk, array_name[0], chunks=dask_chunks, dtype=self.dtype)
+        # Strided extents are not supported by get_dask_chunks, so sizes are found here.
+        dask_chunks = tuple(
+            tuple(len(range(e.start, e.stop, e.step)) for p, e in dim)
+            for dim in selected_extents
+        )
+
+        return DaskActiveArray(dsk, array_name[0], chunks=dask_chunks, dtype=self.dtype)
+
+    def _get_partition(self, position, extent):
+        """
+        Create the ActivePartition for the chunk at ``position``, with the ``extent``
+        of the source variable it covers.
+        """
+        return ActivePartition(
+            self.filename,
+            self.name,
+            dtype=self.dtype,
+            units=self.units,
+            shape=self.chunk_shape,
+            position=position,
+            extent=extent,
+            format=None,
+            storage_chunks=self.storage_chunks,
+            active_options=self.partition_options,
+            missing=self.missing,
+            masked=self.masked,
+            scale=self.scale,
+            memmap=self.memmap
+        )
+
+    def _get_selected_extents(self, bounds):
+        """
+        Find the chunks in each dimension which contain part of the region given by
+        ``bounds``, and narrow the extent of each chunk to that region.
+
+        :returns:       A list for each dimension of (position, extent) pairs.
+        """
+        selected_extents = []
+        for dim, bound in enumerate(bounds):
+            position = [0] * self.ndim
+            dim_extents = []
+            for p in range(self.chunk_space[dim]):
+                position[dim] = p
+                ext = self._get_chunk_extent(position)[dim]
+
+                # First and last selected indices within this chunk.
+                first = max(bound.start, ext.start)
+                first = bound.start - (bound.start - first) // bound.step * bound.step
+                last  = min(bound.stop, ext.stop) - 1
+                if first > last:
+                    continue
+                last  = first + (last - first) // bound.step * bound.step
+
+                dim_extents.append((p, slice(first, last + bound.step, bound.step)))
+            selected_extents.append(dim_extents)
+        return selected_extents
+
+    def _get_chunk_extent(self, position):
+        """
+        Get the extent of the chunk at this position. Automatic chunks have edges on
+        multiples of the chunk shape, so they never split a chunk in storage.
+        """
+        if self._auto_chunks:
+            return get_aligned_extent(position, self.shape, self.chunk_shape)
+        return get_chunk_extent(position, self.shape, self.chunk_space)
+
+class MultiFileArrayWrapper(ActiveArrayWrapper):
+    """
+    ActiveArrayWrapper for a variable split across many files along a single
+    ``concat_axis``. A single Dask-like array is built with partitions from all
+    files, where each partition reads from a single file. Chunks along the
+    concatenated axis are aligned with the start of each file, so requests for
+    each file are batched into as few partitions as the chunk size allows.
+    """
+
+    description = "ActiveArrayWrapper for a variable split across many files."
+
+    def __init__(
+            self,
+            fragments,
+            name,
+            shape,
+            concat_axis,
+            units=None,
+            dtype=None,
+            named_dims=None,
+            active_options={},
+            missing=None,
+        ):
+        """
+        :param fragments:   (list) A tuple for each file of the ``filename``, the ``start``
+                            and ``stop`` of the file along the concatenated axis, the
+                            ``storage_chunks`` of the variable in the file and the ``memmap``
+                            location if the variable is uncompressed and contiguous.
+
+        :param concat_axis: (int) The axis along which the files are concatenated.
+        """
+        self._variable   = None
+        self.fragments   = fragments
+        self.concat_axis = concat_axis
+        self._starts     = [f[1] for f in fragments]
+
+        self.missing     = missing
+        self.masked      = False
+        self.scale       = None
+        self.memmap      = None
+
+        self.filename    = fragments[0][0]
+        self.name        = name
+        self.group       = ''
+        self.named_dims  = named_dims
+
+        self.storage_chunks = fragments[0][3]
+
+        ArrayLike.__init__(self, shape, units=units, dtype=dtype)
+
+        self.active_options = active_options
+
+        self.__array_function__ = self.__array__
+
+    def _set_active_options(self, **kwargs):
+        super()._set_active_options(**kwargs)
+        self.__dict__.pop('_concat_extents', None)
+
+    @cached_property
+    def _concat_extents(self):
+        """
+        Extent of each chunk along the concatenated axis, where chunks are split at
+        the boundaries of each file.
+        """
+        size = self.chunk_shape[self.concat_axis]
+        return [
+            slice(i, min(i + size, stop))
+            for _, start, stop, _, _ in self.fragments
+            for i in range(start, stop, size)
+        ]
+
+    @cached_property
+    def chunk_space(self):
+        axis = self.concat_axis
+        return tuple(
+            len(self._concat_extents) if dim == axis else space
+            for dim, space in enumerate(get_chunk_space(self.chunk_shape, self.shape)))
+
+    def _get_chunk_extent(self, position):
+        axis = self.concat_axis
+
+        first = list(position)
+        first[axis] = 0
+        extent = super()._get_chunk_extent(first)
+        extent[axis] = self._concat_extents[position[axis]]
+        return extent
+
+    def _get_partition(self, position, extent):
+        """
+        Create the ActivePartition for the file containing this chunk, with the
+        extent converted to the indices of that file.
+        """
+        axis  = self.concat_axis
+        index = bisect_right(self._starts, extent[axis].start) - 1
+        filename, start, _, storage_chunks, memmap = self.fragments[index]
+
+        local = list(extent)
+        local[axis] = slice(
+            extent[axis].start - start, extent[axis].stop - start, extent[axis].step)
+
+        return ActivePartition(
+            filename,
+            self.name,
+            dtype=self.dtype,
+            units=self.units,
+            shape=self.chunk_shape,
+            position=position,
+            extent=local,
+            format=None,
+            storage_chunks=storage_chunks,
+            active_options=self.partition_options,
+            missing=self.missing,
+            masked=self.masked,
+            scale=self.scale,
+            memmap=memmap
+        )
+
+def get_aligned_extent(position, shape, chunk_shape):
+    """
+    Get the extent of a chunk within the array given its position, where every chunk
+    except the last in each dimension has exactly the size given by ``chunk_shape``.
+    """
+    return [
+        slice(p*c, min((p+1)*c, s)) for p, c, s in zip(position, chunk_shape, shape)
+    ]
+
+def get_storage_aligned_shape(
+        chunks,
+        shape,
+        dims,
+        dtype,
+        storage_chunks=None,
+        chunk_bytes=None):
+    """
+    Calculate the chunk shape for automatic chunking, where each chunk is made from a
+    whole number of chunks in storage. Dimensions are grown from the last to the first,
+    until each chunk reaches the target size in bytes.
+
+    :param chunks:          (dict) The user specified chunks, or 'auto'. Dimensions
+        given an integer size in ``chunks`` are not changed.
+
+    :param shape:           (tuple) The array shape of the data array to be chunked.
+
+    :param dims:            (tuple) The names of each dimension to match to the ``chunks``
+        provided.
+
+    :param dtype:           (obj) The datatype for this variable.
+
+    :param storage_chunks:  (tuple) The shape of the chunks in storage, or None for 
+        contiguous variables, which are then chunked along the slowest-varying dimensions.
+
+    :param chunk_bytes:     (int | str) The target size of each chunk in bytes, defaults
+        to the dask ``array.chunk-size`` configuration option.
+
+    :returns:   A tuple of the shape of each chunk in ``array space`` for each dimension.
+    """
+    if chunk_bytes is None:
+        chunk_bytes = dask.config.get('array.chunk-size')
+    chunk_bytes = parse_bytes(chunk_bytes)
+
+    if not storage_chunks:
+        storage_chunks = [1 for i in shape]
+
+    chunk_shape = [min(c, s) for c, s in zip(storage_chunks, shape)]
+
+    fixed = []
+    if chunks != 'auto':
+        for dim, size in chunks.items():
+            if size == 'auto':
+                continue
+            if dim not in dims:
+                raise ValueError(
+                    f"Requested chunking across dimension '{dim}'"
+                    f"but only '{dims}' present in the dataset"
+                )
+            idim = list(dims).index(dim)
+            chunk_shape[idim] = min(size, shape[idim])
+            fixed.append(idim)
+
+    itemsize = max(np.dtype(dtype).itemsize, 1)
+    for idim in reversed(range(len(shape))):
+        if idim in fixed:
+            continue
+
+        nbytes   = itemsize * int(np.prod(chunk_shape))
+        if nbytes == 0:
+            # Arrays with an empty dimension are a single empty chunk.
+            break
+        multiple = max(1, int(chunk_bytes // nbytes))
+        chunk_shape[idim] = min(chunk_shape[idim] * multiple, shape[idim])
+
+    return tuple(chunk_shape)
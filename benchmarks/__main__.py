@@ -0,0 +1,78 @@
+"""
+Run the benchmarks without asv, printing the best time or tracked value for each set of
+parameters. For example:
+
+    python -m benchmarks --scheme tiled --repeat 5
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import itertools
+import os
+import time
+
+from . import benchmarks
+
+def get_benchmark_classes():
+    return [
+        obj for _, obj in inspect.getmembers(benchmarks, inspect.isclass)
+        if obj.__module__ == benchmarks.__name__ and hasattr(obj, 'params')
+    ]
+
+def run_benchmark(instance, name, args, repeat=3):
+    """
+    Run a single benchmark method, giving the best of ``repeat`` timings for ``time_``
+    methods or the value returned by ``track_`` methods.
+    """
+    method = getattr(instance, name)
+    if name.startswith('track_'):
+        return method(*args), getattr(method, 'unit', '')
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, 's'
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the XarrayActive benchmarks.')
+    parser.add_argument('--scheme', action='append', help='Only run these chunk schemes.')
+    parser.add_argument('--shape', help="Shape of the synthetic variable, as 'time,lat,lon'.")
+    parser.add_argument('--filter', default='', help='Only run benchmarks containing this text.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timings for each benchmark.')
+    options = parser.parse_args()
+
+    if options.shape:
+        os.environ['XARRAYACTIVE_BENCH_SHAPE'] = options.shape
+
+    for cls in get_benchmark_classes():
+        for args in itertools.product(*cls.params):
+            if options.scheme and args[0] not in options.scheme:
+                continue
+
+            names = [
+                n for n in dir(cls)
+                if n.startswith(('time_', 'track_')) and options.filter in f'{cls.__name__}.{n}'
+            ]
+            if not names:
+                continue
+
+            instance = cls()
+            # The warnings printed by the active methods are not part of the results.
+            with contextlib.redirect_stdout(io.StringIO()):
+                instance.setup(*args)
+            try:
+                for name in names:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        value, unit = run_benchmark(instance, name, args, repeat=options.repeat)
+                    label = f"{cls.__name__}.{name}({', '.join(map(str, args))})"
+                    print(f'{label:<70} {value:>14.6g} {unit}')
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(*args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmarks of active reductions against the standard xarray and dask reductions, for the
+synthetic files of each chunk scheme in ``synthetic.SCHEMES``. The classes follow the asv
+conventions, and may also be run with ``python -m benchmarks``.
+"""
+import xarray as xr
+
+from XarrayActive import LocalActiveServer
+from XarrayActive.wrappers import ActiveArrayWrapper
+
+from .counters import RequestCounter
+from .synthetic import SCHEMES, make_scheme
+
+METHODS = ['mean', 'max', 'min', 'sum']
+
+# Reduced dimension, where 'all' reduces over every dimension.
+DIMS = ['all', 'time', 'latitude']
+
+# Active options for each scheme. Partitions are aligned with the chunks in storage, or
+# split along time for the contiguous scheme, so the number of partitions, and of the
+# requests made for each reduced dimension, depends on the scheme.
+ACTIVE_OPTIONS = {
+    'contiguous':   {'chunks': {'time': 4}, 'chunk_limits': False},
+    'time-chunked': {'chunks': 'auto', 'chunk_bytes': '256KiB'},
+    'tiled':        {'chunks': 'auto', 'chunk_bytes': '256KiB'},
+    'tiled-zlib':   {'chunks': 'auto', 'chunk_bytes': '256KiB'},
+}
+
+def open_active(path, scheme):
+    return xr.open_dataset(path, engine='Active', active_options=ACTIVE_OPTIONS[scheme])
+
+def open_standard(path):
+    return xr.open_dataset(path, chunks={})
+
+def get_wrapper(dataarray):
+    """
+    Find the ActiveArrayWrapper held within the lazy indexing adapters of a variable.
+    """
+    wrapper = dataarray.variable._data
+    while not isinstance(wrapper, ActiveArrayWrapper) and hasattr(wrapper, 'array'):
+        wrapper = wrapper.array
+    return wrapper
+
+def reduce(dataarray, method, dim):
+    dim = None if dim == 'all' else dim
+    return getattr(dataarray, method)(dim=dim).compute()
+
+class OpenDataset:
+
+    description = "Time to open each synthetic file."
+
+    params = [list(SCHEMES)]
+    param_names = ['scheme']
+
+    def setup(self, scheme):
+        self.path = make_scheme(scheme)
+
+    def time_open_active(self, scheme):
+        open_active(self.path, scheme).close()
+
+    def time_open_standard(self, scheme):
+        open_standard(self.path).close()
+
+class GraphBuild:
+
+    description = "Time to build the dask graph of the active partitions."
+
+    params = [list(SCHEMES)]
+    param_names = ['scheme']
+
+    def setup(self, scheme):
+        self.ds      = open_active(make_scheme(scheme), scheme)
+        self.wrapper = get_wrapper(self.ds['p'])
+
+    def teardown(self, scheme):
+        self.ds.close()
+
+    def time_build_graph(self, scheme):
+        # The graph is cached by the wrapper once built.
+        self.wrapper._dask_array = None
+        self.wrapper.__array__()
+
+class Reductions:
+
+    description = "Full and partial-axis reductions, active and standard."
+
+    params = [list(SCHEMES), METHODS, DIMS]
+    param_names = ['scheme', 'method', 'dim']
+
+    def setup(self, scheme, method, dim):
+        path = make_scheme(scheme)
+        self.active   = open_active(path, scheme)
+        self.standard = open_standard(path)
+
+    def teardown(self, scheme, method, dim):
+        self.active.close()
+        self.standard.close()
+
+    def time_active(self, scheme, method, dim):
+        reduce(self.active['p'], method, dim)
+
+    def time_standard(self, scheme, method, dim):
+        reduce(self.standard['p'], method, dim)
+
+    def track_requests(self, scheme, method, dim):
+        with RequestCounter() as counter:
+            reduce(self.active['p'], method, dim)
+        return counter.requests
+    track_requests.unit = 'requests'
+
+    def track_bytes_read(self, scheme, method, dim):
+        with RequestCounter() as counter:
+            reduce(self.active['p'], method, dim)
+        return counter.bytes_read
+    track_bytes_read.unit = 'bytes'
+
+class LocalServerReductions:
+
+    description = "Active reductions served by a local server with injected latency."
+
+    params = [['tiled'], [0.0, 0.01], [1, 8]]
+    param_names = ['scheme', 'latency', 'max_requests']
+
+    def setup(self, scheme, latency, max_requests):
+        self.server = LocalActiveServer(latency=latency, bandwidth=100e6)
+        self.ds = xr.open_dataset(
+            make_scheme(scheme),
+            engine='Active',
+            active_options={
+                'chunks': {'time': 4},
+                'chunk_limits': False,
+                'max_requests': max_requests,
+                'backend': self.server
+            })
+
+    def teardown(self, scheme, latency, max_requests):
+        self.ds.close()
+        self.server.reset()
+
+    def time_mean(self, scheme, latency, max_requests):
+        self.ds['p'].mean().compute()
+
+    def time_mean_latitude(self, scheme, latency, max_requests):
+        self.ds['p'].mean(dim='latitude').compute()
+
+    def track_bytes_sent(self, scheme, latency, max_requests):
+        self.server.reset()
+        self.ds['p'].mean(dim='latitude').compute()
+        return self.server.bytes_sent
+    track_bytes_sent.unit = 'bytes'
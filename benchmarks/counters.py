@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+
+from XarrayActive.active_client import get_active_class, active_pool
+from XarrayActive.wrappers import ActivePartition
+
+class RequestCounter:
+    """
+    Counts the storage requests made while active, and the bytes read by those
+    requests. Each ``Active`` request is counted along with the bytes of the chunks
+    in storage it read. Without the Active package each read of a partition, including
+    reads through a memmap, is counted along with the size of the data returned. Idle
+    Active clients are discarded on entry, so chunks cached by a client during earlier
+    requests are read and counted again.
+
+    Example:
+        with RequestCounter() as counter:
+            ds['p'].mean().compute()
+        print(counter.requests, counter.bytes_read)
+    """
+
+    description = "Counts storage requests and bytes read during active reductions."
+
+    def __init__(self):
+        self.requests   = 0
+        self.bytes_read = 0
+        self._lock      = threading.Lock()
+        self._patches   = []
+
+    def _add(self, nbytes):
+        with self._lock:
+            self.requests   += 1
+            self.bytes_read += int(nbytes)
+
+    def _patch(self, cls, name, wrapper):
+        self._patches.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, wrapper)
+
+    def __enter__(self):
+        counter = self
+
+        Active = get_active_class()
+        if Active is not None:
+            active_pool.clear()
+            getitem = Active.__getitem__
+
+            def active_getitem(active, index):
+                before = getattr(active, 'data_read', 0)
+                result = getitem(active, index)
+                counter._add(getattr(active, 'data_read', 0) - before)
+                return result
+
+            self._patch(Active, '__getitem__', active_getitem)
+
+        array = ActivePartition.__array__
+
+        def partition_array(partition, *args, **kwargs):
+            result = array(partition, *args, **kwargs)
+            counter._add(np.asarray(result).nbytes)
+            return result
+
+        self._patch(ActivePartition, '__array__', partition_array)
+
+        read_data = ActivePartition._read_data
+
+        def partition_read(partition):
+            if partition._get_memmap_view() is None:
+                # Counted when the partition is read as an array.
+                return read_data(partition)
+            result = read_data(partition)
+            counter._add(np.asarray(result).nbytes)
+            return result
+
+        self._patch(ActivePartition, '_read_data', partition_read)
+        return self
+
+    def __exit__(self, *args):
+        for cls, name, original in reversed(self._patches):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patches = []
@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import numpy as np
+
+# Chunk schemes used by the benchmarks, as the storage chunk shape of the (time, lat, lon)
+# variable and the compression applied in storage.
+SCHEMES = {
+    'contiguous':    {'chunksizes': None,         'compression': None},
+    'time-chunked':  {'chunksizes': (1, 180, 360), 'compression': None},
+    'tiled':         {'chunksizes': (4, 45, 90),   'compression': None},
+    'tiled-zlib':    {'chunksizes': (4, 45, 90),   'compression': 'zlib'},
+}
+
+# Shape of the synthetic variable, which may be set in the environment as 'time,lat,lon'.
+DEFAULT_SHAPE = (40, 180, 360)
+
+def get_shape():
+    shape = os.environ.get('XARRAYACTIVE_BENCH_SHAPE')
+    if shape:
+        return tuple(int(s) for s in shape.split(','))
+    return DEFAULT_SHAPE
+
+def get_data_dir():
+    """
+    Directory holding the synthetic files, which are reused between benchmark runs.
+    """
+    path = os.environ.get(
+        'XARRAYACTIVE_BENCH_DIR',
+        os.path.join(tempfile.gettempdir(), 'xarrayactive_benchmarks'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def make_dataset(
+        path=None,
+        shape=None,
+        chunksizes=None,
+        compression=None,
+        dtype='f4',
+        overwrite=False):
+    """
+    Generate a synthetic netCDF4 file holding a single (time, lat, lon) variable ``p``,
+    with random values and coordinate variables for each dimension.
+
+    :param path:        (str) The path of the file to create, defaults to a file in the
+                        benchmark data directory named from the other parameters.
+
+    :param shape:       (tuple) The shape of the variable, defaults to ``get_shape()``.
+
+    :param chunksizes:  (tuple) The shape of the chunks in storage, or None for a
+                        contiguous variable.
+
+    :param compression: (str) The netCDF4 compression to apply, e.g. 'zlib'.
+
+    :param dtype:       (str) The data type of the variable.
+
+    :param overwrite:   (bool) Regenerate the file if it already exists.
+
+    :returns:       The path to the file.
+    """
+    import netCDF4
+
+    shape = tuple(shape or get_shape())
+    if path is None:
+        chunk_label = 'x'.join(map(str, chunksizes)) if chunksizes else 'contiguous'
+        name = '_'.join([
+            'synthetic',
+            'x'.join(map(str, shape)),
+            chunk_label,
+            compression or 'raw',
+            dtype
+        ])
+        path = os.path.join(get_data_dir(), f'{name}.nc')
+
+    if os.path.isfile(path) and not overwrite:
+        return path
+
+    rng = np.random.default_rng(0)
+    with netCDF4.Dataset(path, mode='w') as ds:
+        for dim, size in zip(('time', 'latitude', 'longitude'), shape):
+            ds.createDimension(dim, size)
+            coord = ds.createVariable(dim, 'f8', (dim,))
+            coord[:] = np.arange(size, dtype='f8')
+
+        kwargs = {}
+        if chunksizes:
+            kwargs['chunksizes'] = tuple(min(c, s) for c, s in zip(chunksizes, shape))
+        else:
+            kwargs['contiguous'] = True
+        if compression:
+            kwargs['compression'] = compression
+
+        var = ds.createVariable('p', dtype, ('time', 'latitude', 'longitude'), **kwargs)
+
+        # Written one time step at a time to limit memory use for large files.
+        for t in range(shape[0]):
+            var[t] = rng.random(shape[1:], dtype='f8').astype(dtype)
+
+    return path
+
+def make_scheme(scheme, shape=None):
+    """
+    Generate the synthetic file for one of the named chunk ``SCHEMES``.
+    """
+    return make_dataset(shape=shape, **SCHEMES[scheme])
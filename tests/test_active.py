@@ -96,8 +96,1115 @@ def test_active_methods():
     assert p_value.shape == ()
     assert (p_value.to_numpy() - 76.7931739) < 0.01
 
+def test_active_hyperslab():
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':2}})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    p_sel = ds['p'].isel(time=slice(0,4),latitude=slice(40,100), longitude=slice(80,140))
+    r_sel = ref['p'].isel(time=slice(0,4),latitude=slice(40,100), longitude=slice(80,140))
+
+    p_mean = p_sel.mean(dim='latitude')
+
+    assert p_mean.shape == (4, 60)
+    assert np.allclose(p_mean.to_numpy(), r_sel.mean(dim='latitude').to_numpy())
+
+def test_active_hyperslab_no_axis(tmp_path):
+
+    import netCDF4
+    from XarrayActive import ActiveStats, LocalActiveServer
+    from XarrayActive.local_server import LocalActive
+
+    class NoAxisServer(LocalActiveServer):
+        # Backend without reductions along specific axes.
+        def __call__(self, filename, address):
+            return LocalActive(self, filename, address)
+
+    path_to_active = str(tmp_path / 'no_axis_test.nc')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 40)
+        nc.createDimension('y', 3)
+        nc.createDimension('x', 2)
+        var = nc.createVariable('v', 'f4', ('t','y','x'), chunksizes=(20,3,2))
+        var[:] = np.arange(240, dtype='f4').reshape(40, 3, 2)
+
+    ref = xr.open_dataset(path_to_active)['v'].mean(dim='t').to_numpy()
+
+    def reduce(**options):
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                active_options={'chunks':{'t':20}, 'backend':NoAxisServer(), **options})
+        with ActiveStats() as stats:
+            assert np.allclose(ds['v'].mean(dim='t').to_numpy(), ref)
+        return stats
+
+    # The raw data of each partition is fetched in slabs and reduced here.
+    stats = reduce()
+    assert stats.requests == 2
+    assert stats.bytes_returned == stats.bytes_reduced == 240 * 4
+
+    stats = reduce(slab_bytes=240)
+    assert stats.requests == 2 * 2
+    assert stats.bytes_returned == stats.bytes_reduced == 240 * 4
+
+    # Column requests are reduced by the server, so only the results are returned.
+    stats = reduce(column_requests=True)
+    assert stats.requests == 2 * 6
+    assert stats.bytes_reduced == 240 * 4
+    assert stats.bytes_returned < stats.bytes_reduced / 2
+
+def test_active_client_pool():
+
+    from XarrayActive.active_client import ActiveClientPool
+
+    pool = ActiveClientPool(maxsize=2)
+
+    client = pool.acquire(('a','p','mean',None), object)
+    pool.release(('a','p','mean',None), client)
+
+    assert pool.acquire(('a','p','mean',None), object) is client
+    assert len(pool) == 0
+
+    for key in ['a','b','c']:
+        pool.release((key,'p','mean',None), object())
+
+    assert len(pool) == 2
+    assert pool.acquire(('a','p','mean',None), object) is not client
+
+def test_active_auto_chunks():
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':'auto', 'chunk_bytes':'200KiB'})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    storage_chunks = ds['p'].encoding['chunksizes']
+
+    # Partition edges never split a chunk in storage.
+    for dim_chunks, size in zip(ds['p'].data.chunks, storage_chunks):
+        assert all(c % size == 0 for c in dim_chunks[:-1])
+
+    p_mean = ds['p'].mean(dim='time')
+
+    assert p_mean.shape == (180, 360)
+    assert np.allclose(p_mean.to_numpy(), ref['p'].mean(dim='time').to_numpy())
+
+def test_active_empty(tmp_path):
+
+    import netCDF4
+    from XarrayActive.wrappers import get_storage_aligned_shape
+
+    path_to_active = str(tmp_path / 'empty_test.nc')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', None)
+        nc.createDimension('x', 4)
+        nc.createVariable('t', 'f8', ('t',))
+        nc.createVariable('v', 'f4', ('t','x'))
+        nc.createVariable('s', 'f4', ())[...] = 3.5
+        nc.createVariable('w', 'f4', ('x',))[:] = np.arange(4)
+
+    # Record variables with no records and scalar variables are opened normally.
+    ds  = xr.open_dataset(path_to_active, engine='Active')
+    ref = xr.open_dataset(path_to_active)
+
+    assert ds['v'].shape == (0, 4)
+    assert ds['s'].to_numpy() == 3.5
+    assert ds['v'].sum().to_numpy() == 0
+    assert np.isnan(ds['v'].mean().to_numpy())
+    assert np.isclose(ds['w'].mean().to_numpy(), ref['w'].mean().to_numpy())
+
+    # Automatic chunks of an empty array are a single empty chunk.
+    assert get_storage_aligned_shape('auto', (0, 4), ('t','x'), 'f4', storage_chunks=(1, 4)) == (0, 4)
+    assert get_storage_aligned_shape('auto', (), (), 'f4') == ()
+
+def test_active_graph_cache():
+
+    import netCDF4
+    from XarrayActive.wrappers import ActiveArrayWrapper
+
+    path_to_active = f'tests/rain_test.nc'
+
+    var = netCDF4.Dataset(path_to_active)['p']
+    wrapper = ActiveArrayWrapper(
+        path_to_active,
+        var,
+        var.shape,
+        dtype=var.dtype,
+        named_dims=var.dimensions,
+        active_options={'chunks':{'time':4}, 'chunk_limits':False})
+
+    arr = wrapper.__array__()
+    assert wrapper.__array__() is arr
+    assert wrapper[0:2].shape == (2, 180, 360)
+    assert arr.chunks[0] == (4, 4, 4, 4, 4)
+
+    # Changing the chunk options rebuilds the graph.
+    wrapper.active_options = {'chunks':{'time':10}, 'chunk_limits':False}
+    assert wrapper.__array__() is not arr
+    assert wrapper.__array__().chunks[0] == (10, 10)
+
+def test_active_selection():
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    # Only the partitions intersecting the selection are built.
+    p_sel = ds['p'].isel(time=slice(5,7), latitude=slice(10,100,7))
+    r_sel = ref['p'].isel(time=slice(5,7), latitude=slice(10,100,7))
+
+    assert p_sel.data.numblocks == (1, 1, 1)
+    assert p_sel.shape == (2, 13, 360)
+    assert np.allclose(p_sel.mean(dim='longitude').to_numpy(), r_sel.mean(dim='longitude').to_numpy())
+
+    p_sel = ds['p'].isel(time=slice(2,19,5))
+    r_sel = ref['p'].isel(time=slice(2,19,5))
+
+    assert p_sel.data.chunks[0] == (1, 1, 1, 1)
+    assert np.allclose(p_sel.mean(dim='time').to_numpy(), r_sel.mean(dim='time').to_numpy())
+
+def test_active_chunk_index(tmp_path):
+
+    import shutil
+    from XarrayActive import build_chunk_index
+
+    path_to_active = str(tmp_path / 'rain_index_test.nc')
+    shutil.copy('tests/rain_test.nc', path_to_active)
+
+    index_path = build_chunk_index(path_to_active)
+    assert index_path == f'{path_to_active}.index.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False, 'chunk_index':True})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    # Whole and partly covered chunks in storage.
+    for sel in [{}, {'time':slice(1,19), 'latitude':slice(3,170), 'longitude':slice(50,301)}]:
+        p_sel = ds['p'].isel(**sel)
+        r_sel = ref['p'].isel(**sel)
+
+        assert np.isclose(p_sel.mean().to_numpy(), r_sel.mean().to_numpy())
+        assert np.isclose(p_sel.sum().to_numpy(), r_sel.sum().to_numpy())
+        assert np.isclose(p_sel.max().to_numpy(), r_sel.max().to_numpy())
+        assert np.isclose(p_sel.min().to_numpy(), r_sel.min().to_numpy())
+
+def test_active_concurrent_requests(tmp_path):
+
+    import threading
+    import time
+    import netCDF4
+    from XarrayActive import ActiveChunk, LocalActiveServer
+    from XarrayActive.local_server import LocalActive
+
+    chunk = ActiveChunk()
+    chunk.active_options = {'max_requests': 4}
+
+    # Results are returned in the order of the requests.
+    assert chunk._map_requests(lambda x: x*2, range(10)) == [i*2 for i in range(10)]
+
+    class NoAxisServer(LocalActiveServer):
+        # Backend without reductions along specific axes, so with column requests
+        # each column of a partition is a separate request. The most responses in progress at
+        # once are recorded.
+        def __init__(self, latency=0.0):
+            super().__init__(latency=latency)
+            self.active = 0
+            self.peak   = 0
+            self._peak_lock = threading.Lock()
+
+        def __call__(self, filename, address):
+            return LocalActive(self, filename, address)
+
+        def respond(self, result):
+            with self._peak_lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                return super().respond(result)
+            finally:
+                with self._peak_lock:
+                    self.active -= 1
+
+    path_to_active = str(tmp_path / 'concurrent_test.nc')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 10)
+        nc.createDimension('y', 4)
+        nc.createDimension('x', 2)
+        var = nc.createVariable('v', 'f4', ('t','y','x'))
+        var[:] = np.arange(80, dtype='f4').reshape(10, 4, 2)
+
+    def reduce(max_requests):
+        server = NoAxisServer(latency=0.05)
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                active_options={
+                    'chunks':{'t':10}, 'chunk_limits':False, 'column_requests':True,
+                    'backend':server, 'max_requests':max_requests})
+        start = time.perf_counter()
+        result = ds['v'].mean(dim='t').to_numpy()
+        return result, time.perf_counter() - start, server
+
+    # The 8 columns of the single partition are requested in turn, or all at once.
+    serial, serial_time, serial_server = reduce(1)
+    parallel, parallel_time, parallel_server = reduce(8)
+
+    ref = xr.open_dataset(path_to_active)['v'].mean(dim='t').to_numpy()
+    assert np.allclose(serial, ref)
+    assert np.array_equal(parallel, serial)
+
+    assert serial_server.requests == parallel_server.requests == 8
+    assert serial_server.peak == 1
+    assert parallel_server.peak > 1
+    assert parallel_time < serial_time / 2
+
+def test_active_async():
+
+    import asyncio
+    import threading
+    from dask.callbacks import Callback
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    async def reductions():
+        p = ds['p'].isel(latitude=slice(10,50))
+        return await asyncio.gather(
+            p.active.amean(dim='time'),
+            p.active.amax(dim=['latitude','longitude']),
+            p.active.asum())
+
+    p_mean, p_max, p_sum = asyncio.run(reductions())
+    r = ref['p'].isel(latitude=slice(10,50))
+
+    assert p_mean.dims == ('latitude', 'longitude')
+    assert np.allclose(p_mean.to_numpy(), r.mean(dim='time').to_numpy())
+    assert np.allclose(p_max.to_numpy(), r.max(dim=['latitude','longitude']).to_numpy())
+    assert np.isclose(p_sum.to_numpy(), r.sum().to_numpy(), rtol=1e-4)
+
+    # No dask tasks are run on the thread of the event loop.
+    threads = set()
+    with Callback(pretask=lambda key, dsk, state: threads.add(threading.get_ident())):
+        asyncio.run(reductions())
+    assert threads
+    assert threading.get_ident() not in threads
+
+def test_active_streaming():
+
+    import time
+    from XarrayActive import LocalActiveServer
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False, 'max_requests':2})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    p = ds['p'].isel(latitude=slice(10,100))
+    r = ref['p'].isel(latitude=slice(10,100))
+
+    p_mean = p.mean(dim='time', streaming=True)
+    p_max  = p.max(dim=['latitude','longitude'], streaming=True)
+
+    assert p_mean.dims == ('latitude', 'longitude')
+    assert np.allclose(p_mean.to_numpy(), r.mean(dim='time').to_numpy())
+    assert np.allclose(p_max.to_numpy(), r.max(dim=['latitude','longitude']).to_numpy())
+
+    # Partitions are reduced concurrently by default, unless max_requests is 1.
+    def stream_time(**options):
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                active_options={
+                    'chunks':{'time':4}, 'chunk_limits':False, 
+                    'backend':LocalActiveServer(latency=0.05), **options})
+        start = time.perf_counter()
+        assert np.isclose(ds['p'].mean(streaming=True).to_numpy(), ref['p'].mean().to_numpy())
+        return time.perf_counter() - start
+
+    assert stream_time() < stream_time(max_requests=1) / 2
+
+def test_active_partials():
+
+    from XarrayActive.active_chunk import ActiveChunk, ActivePartial
+
+    class Chunk(ActiveChunk):
+        shape = (2,3,4)
+        ndim  = 3
+
+    # Counts are a broadcast view of a single value.
+    n = Chunk()._numel('mean', axes=(1,))
+    assert n.shape == (2,1,4) and n.strides == (0,0,0)
+    assert (n == 3).all()
+
+    partial = ActivePartial(n, np.ones((2,1,4)))
+    assert partial.n is n and partial['total'].shape == (2,1,4)
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':2}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    # Totals accumulate as float64, the result keeps the source dtype.
+    p_sum = ds['p'].sum()
+    assert p_sum.dtype == np.float32
+    assert np.isclose(float(p_sum), ref['p'].values.astype('f8').sum(), rtol=1e-7)
+
+def test_active_moments():
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':3}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    p = ds['p'].isel(latitude=slice(10,100))
+    r = ref['p'].isel(latitude=slice(10,100))
+
+    assert np.allclose(p.var(dim='time').to_numpy(), r.var(dim='time').to_numpy(), rtol=1e-5)
+    assert np.allclose(p.std(ddof=1).to_numpy(), r.std(ddof=1).to_numpy(), rtol=1e-5)
+    assert (p.count(dim='longitude').to_numpy() == r.count(dim='longitude').to_numpy()).all()
+
+def test_active_arg_reductions():
+
+    from XarrayActive.active_chunk import arg_select
+
+    values = np.array([[1.0, np.nan, 3.0], [np.nan, np.nan, np.nan]])
+    selected, position = arg_select(values, (1,), 'argmax', skipna=True)
+    assert position.tolist() == [2, 0]
+    assert selected[0] == 3.0 and np.isnan(selected[1])
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':3, 'latitude':45}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active, decode_times=False)
+
+    p = ds['p'].isel(latitude=slice(10,100))
+    r = ref['p'].isel(latitude=slice(10,100))
+
+    assert (p.argmax(dim='time').to_numpy() == r.argmax(dim='time').to_numpy()).all()
+
+    p_args = p.argmin(dim=['latitude','longitude'])
+    r_args = r.argmin(dim=['latitude','longitude'])
+    for dim in ('latitude', 'longitude'):
+        assert (p_args[dim].to_numpy() == r_args[dim].to_numpy()).all()
+
+    assert (p.idxmax(dim='latitude').to_numpy() == r.idxmax(dim='latitude').to_numpy()).all()
+
+def test_active_groupby():
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            decode_times=True,
+            active_options={'chunks':{'time':4}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    p = ds['p'].isel(latitude=slice(10,100))
+    r = ref['p'].isel(latitude=slice(10,100))
+
+    # Groups of consecutive time steps.
+    p_mean = p.resample(time='7D').mean()
+    assert hasattr(p_mean.variable.data, 'dask')
+    assert np.allclose(p_mean.to_numpy(), r.resample(time='7D').mean().to_numpy())
+
+    # Groups of non-consecutive time steps.
+    p_max = p.groupby('time.dayofweek').max()
+    assert p_max.dims == ('dayofweek', 'latitude', 'longitude')
+    assert np.allclose(p_max.to_numpy(), r.groupby('time.dayofweek').max().to_numpy())
+
+def test_active_weighted():
+
+    from XarrayActive import ActiveStats, LocalActiveServer
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    weights = np.cos(np.deg2rad(ref['latitude']))
+
+    p_mean = ds['p'].weighted(weights).mean()
+    r_mean = ref['p'].weighted(weights).mean()
+    assert np.isclose(p_mean.to_numpy(), r_mean.to_numpy())
+
+    p_sum = ds['p'].weighted(weights).sum(dim=['latitude','longitude'])
+    r_sum = ref['p'].weighted(weights).sum(dim=['latitude','longitude'])
+    assert np.allclose(p_sum.to_numpy(), r_sum.to_numpy())
+
+    # Each partition is reduced by one request, as for the unweighted mean.
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={
+                'chunks':{'time':4}, 'chunk_limits':False, 'backend':LocalActiveServer()})
+
+    with ActiveStats() as stats:
+        assert np.isclose(ds['p'].weighted(weights).mean().to_numpy(), r_mean.to_numpy())
+    assert stats.requests == 5
+    assert stats.local_reads == 0
+    assert stats.totals()['fallbacks'] == 0
+
+def test_active_weighted_missing(tmp_path):
+
+    import netCDF4
+
+    path_to_active = str(tmp_path / 'weighted_missing_test.nc')
+
+    data = np.arange(4*6*5, dtype='f4').reshape(4, 6, 5)
+    data[0,0,:]  = -999.0
+    data[1,2,3]  = -999.0
+    data[2:4,4,1:4] = -999.0
+    data[3,1,1]  = np.nan
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 4)
+        nc.createDimension('y', 6)
+        nc.createDimension('x', 5)
+        nc.createVariable('y', 'f8', ('y',))[:] = np.linspace(-60, 60, 6)
+        var = nc.createVariable('v', 'f4', ('t','y','x'), chunksizes=(2,3,5), fill_value=-999.0)
+        var.set_auto_mask(False)
+        var[:] = data
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={'chunks':{'t':2}, 'chunk_limits':False})
+    ref = xr.open_dataset(path_to_active)
+
+    weights = np.cos(np.deg2rad(ref['y']))
+
+    # Missing values are excluded from the sum of weights, as for xarray.
+    for dim in (None, ['t', 'x'], ['t', 'y']):
+        p_weighted = ds['v'].weighted(weights)
+        r_weighted = ref['v'].weighted(weights)
+        assert np.allclose(
+            p_weighted.mean(dim=dim).to_numpy(), r_weighted.mean(dim=dim).to_numpy(), equal_nan=True)
+        assert np.allclose(
+            p_weighted.sum(dim=dim).to_numpy(), r_weighted.sum(dim=dim).to_numpy(), equal_nan=True)
+        assert np.allclose(
+            p_weighted.sum_of_weights(dim=dim).to_numpy(), 
+            r_weighted.sum_of_weights(dim=dim).to_numpy(), equal_nan=True)
+        assert np.allclose(
+            p_weighted.mean(dim=dim, skipna=False).to_numpy(), 
+            r_weighted.mean(dim=dim, skipna=False).to_numpy(), equal_nan=True)
+        assert np.allclose(
+            p_weighted.sum(dim=dim, skipna=False).to_numpy(), 
+            r_weighted.sum(dim=dim, skipna=False).to_numpy(), equal_nan=True)
+
+def test_active_missing(tmp_path):
+
+    import netCDF4
+    from XarrayActive import ActiveStats, LocalActiveServer
+
+    path_to_active = str(tmp_path / 'missing_test.nc')
+
+    data = np.arange(24, dtype='f4').reshape(4, 6)
+    data[0,0]     = -999.0
+    data[1,4]     = 500.0
+    data[2:4,0:3] = -999.0
+    data[3,3]     = np.nan
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 4)
+        nc.createDimension('x', 6)
+        var = nc.createVariable('v', 'f4', ('t','x'), chunksizes=(2,3), fill_value=-999.0)
+        var.valid_max = 100.0
+        var.set_auto_mask(False)
+        var[:] = data
+
+    # Fill values, values outside the valid range and NaN are all missing.
+    expected = data.copy()
+    expected[(data == -999.0) | (data > 100.0)] = np.nan
+
+    for mask_and_scale in [None, True]:
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                mask_and_scale=mask_and_scale,
+                active_options={'chunks':{'t':2, 'x':3}, 'chunk_limits':False})
+
+        assert np.isclose(ds['v'].mean().to_numpy(), np.nanmean(expected))
+        assert np.isclose(ds['v'].sum().to_numpy(), np.nansum(expected))
+        assert np.isclose(ds['v'].max().to_numpy(), np.nanmax(expected))
+        assert np.isclose(ds['v'].min().to_numpy(), np.nanmin(expected))
+        assert np.allclose(ds['v'].mean(dim='x').to_numpy(), np.nanmean(expected, axis=1))
+        assert np.allclose(ds['v'].max(dim='t').to_numpy(), np.nanmax(expected, axis=0))
+
+        # Without skipna any missing value gives NaN, as for decoded data.
+        assert np.allclose(
+            ds['v'].mean(dim='t', skipna=False).to_numpy(), 
+            np.mean(expected, axis=0), equal_nan=True)
+
+    # Masked data is decoded by each partition, not by xarray.
+    assert '_FillValue' in ds['v'].encoding
+    assert np.allclose(ds['v'].to_numpy(), expected, equal_nan=True)
+
+    # Missing values are not counted by the server, and NaN values are found from the sum.
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={
+                'chunks':{'t':2, 'x':3}, 'chunk_limits':False, 'backend':LocalActiveServer()})
+
+    with ActiveStats() as stats:
+        assert ds['v'].count().to_numpy() == np.sum(~np.isnan(expected))
+        assert (ds['v'].count(dim='t').to_numpy() == np.sum(~np.isnan(expected), axis=0)).all()
+    assert stats.raw_reductions == 0
+    assert stats.fallbacks['nan_reread'] == 2
+
+def test_active_packed(tmp_path):
+
+    import netCDF4
+    from XarrayActive import ActiveStats, LocalActiveServer
+
+    path_to_active = str(tmp_path / 'packed_test.nc')
+
+    packed = np.arange(-40, 80, dtype='i2').reshape(8, 15)
+    packed[0,:4] = -1
+    packed[5,7]  = -1
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 8)
+        nc.createDimension('x', 15)
+        var = nc.createVariable('v', 'i2', ('t','x'), chunksizes=(4,5), fill_value=-1)
+        var.scale_factor = np.float32(-0.5)
+        var.add_offset   = np.float32(10.0)
+        var.set_auto_maskandscale(False)
+        var[:] = packed
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={'chunks':{'t':4, 'x':5}, 'chunk_limits':False})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    # Reductions are applied to the packed values, then unpacked.
+    assert ds['v'].dtype == ref['v'].dtype
+    assert 'scale_factor' in ds['v'].encoding
+    assert np.isclose(ds['v'].mean().to_numpy(), ref['v'].mean().to_numpy())
+    assert np.isclose(ds['v'].sum().to_numpy(), ref['v'].sum().to_numpy())
+    assert np.isclose(ds['v'].max().to_numpy(), ref['v'].max().to_numpy())
+    assert np.isclose(ds['v'].min().to_numpy(), ref['v'].min().to_numpy())
+    assert np.allclose(ds['v'].mean(dim='x').to_numpy(), ref['v'].mean(dim='x').to_numpy())
+    assert np.allclose(ds['v'].min(dim='t').to_numpy(), ref['v'].min(dim='t').to_numpy())
+    assert np.allclose(ds['v'].to_numpy(), ref['v'].to_numpy(), equal_nan=True)
+
+    # Packed values are reduced by the server, with one request for each partition.
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={
+                'chunks':{'t':4, 'x':5}, 'chunk_limits':False, 'backend':LocalActiveServer()})
+
+    for method in ['mean', 'sum', 'max', 'min']:
+        with ActiveStats() as stats:
+            assert np.isclose(
+                getattr(ds['v'], method)().to_numpy(), getattr(ref['v'], method)().to_numpy())
+        assert stats.requests == 6
+        assert stats.local_reads == 0
+        assert stats.totals()['fallbacks'] == 0
+
+def test_active_local_server():
+
+    from XarrayActive import LocalActiveServer, set_active_backend
+
+    path_to_active = f'tests/rain_test.nc'
+
+    server = LocalActiveServer(latency=0.001)
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False, 'backend':server})
+    
+    ref = xr.open_dataset(path_to_active)
+
+    for method in ['mean', 'max', 'min', 'sum']:
+        assert np.isclose(
+            getattr(ds['p'], method)().to_numpy(), getattr(ref['p'], method)().to_numpy())
+        assert np.allclose(
+            getattr(ds['p'], method)(dim='time').to_numpy(), 
+            getattr(ref['p'], method)(dim='time').to_numpy())
+
+    # Only the reduced results are sent from the server.
+    assert server.requests > 0
+    assert server.bytes_sent < server.bytes_read
+
+    # The server may also be used for all requests in this process.
+    set_active_backend(server)
+    try:
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                active_options={'chunks':{'time':4}, 'chunk_limits':False})
+        requests = server.requests
+        assert np.isclose(ds['p'].var().to_numpy(), ref['p'].var().to_numpy())
+        assert server.requests > requests
+    finally:
+        set_active_backend(None)
+
+def test_active_stats():
+
+    from XarrayActive import ActiveStats, LocalActiveServer
+
+    path_to_active = f'tests/rain_test.nc'
+
+    server = LocalActiveServer()
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':4}, 'chunk_limits':False, 'backend':server})
+
+    with ActiveStats() as stats:
+        ds['p'].mean().compute()
+
+    # One request for each of the 5 partitions, with only the reduced results returned.
+    totals = stats.totals()
+    assert totals['partitions'] == 5
+    assert totals['requests'] == server.requests == 5
+    assert totals['bytes_reduced'] == server.bytes_read
+    assert totals['bytes_returned'] < totals['bytes_reduced']
+    assert totals['fallbacks'] == 0
+    assert all(p['requests'] == 1 for p in stats.partitions)
+
+    # Raw data is read for reductions not provided by Active, which is not a fallback.
+    with ActiveStats() as stats:
+        ds['p'].var().compute()
+    assert stats.raw_reductions == 5
+    assert stats.totals()['fallbacks'] == 0
+    assert stats.bytes_returned == stats.bytes_reduced
+
+    # Nothing is recorded outside the context.
+    ds['p'].mean().compute()
+    assert stats.requests == 5
+
+    # The count is the number of valid values given by Active.
+    ref = xr.open_dataset(path_to_active)
+    with ActiveStats() as stats:
+        assert ds['p'].count().to_numpy() == ref['p'].count().to_numpy()
+        assert (ds['p'].count(dim='time').to_numpy() == ref['p'].count(dim='time').to_numpy()).all()
+    assert stats.requests == 2 * 5
+    assert stats.raw_reductions == 0
+    assert stats.local_reads == 0
+    assert stats.totals()['fallbacks'] == 0
+
+def test_active_requests_no_axis():
+
+    from XarrayActive import ActiveStats, LocalActiveServer
+    from XarrayActive.local_server import LocalActive
+
+    class NoAxisServer(LocalActiveServer):
+        # Backend without reductions along specific axes.
+        def __call__(self, filename, address):
+            return LocalActive(self, filename, address)
+
+    path_to_active = f'tests/rain_test.nc'
+
+    # Chunked in storage as (4, 45, 90), so 80 chunks in total.
+    storage_chunks = 5 * 4 * 4
+
+    ref = xr.open_dataset(path_to_active)
+
+    for options in [{'chunks':{'time':4}, 'chunk_limits':False}, {'slab_bytes':'256KiB'}, {}]:
+        ds = xr.open_dataset(
+                path_to_active, 
+                engine='Active',
+                active_options={'backend':NoAxisServer(), **options})
+
+        # Requests for partial-axis reductions are bounded by the storage chunks,
+        # not the number of columns.
+        for dim in ['time', 'latitude', ['latitude', 'longitude']]:
+            with ActiveStats() as stats:
+                assert np.allclose(ds['p'].mean(dim=dim).to_numpy(), ref['p'].mean(dim=dim).to_numpy())
+            assert 0 < stats.requests <= storage_chunks
+
+def test_active_slabs():
+
+    import dask
+    from XarrayActive.active_chunk import plan_slabs
+
+    # Slabs are limited in size and aligned with the chunks in storage.
+    slabs = plan_slabs((10, 180, 360), 4, 200000, storage_chunks=(1, 90, 180))
+    assert len(slabs) == 20
+    assert slabs[1] == (slice(0, 1), slice(90, 180), slice(0, 360))
+    assert plan_slabs((10, 180, 360), 4, '64MiB') == [(slice(0, 10), slice(0, 180), slice(0, 360))]
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':10}, 'chunk_limits':False, 'slab_bytes':200000})
+    
+    ref = xr.open_dataset(path_to_active)['p'][:10].to_numpy()
+
+    # Standard reductions used without Active read the partition in slabs.
+    partition = dask.compute(ds['p'].data.to_delayed().ravel()[0], scheduler='sync')[0]
+    for method in ['mean', 'max', 'min', 'sum']:
+        for axes in [(0, 1, 2), (0,), (1,)]:
+            result = partition._standard_reduce(method, axes, skipna=True)
+            if method == 'mean':
+                result = result['total'] / result['n']
+            assert np.allclose(result, getattr(np, method)(ref, axis=axes, keepdims=True))
+
+def test_active_memmap(tmp_path):
+
+    import netCDF4
+    from XarrayActive.memmap import get_memmap_layout
+
+    path_to_active = str(tmp_path / 'contiguous_test.nc')
+
+    data = np.arange(8*6*4, dtype='i2').reshape(8, 6, 4) * 300
+    data[1,2,3] = -999
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 8)
+        nc.createDimension('y', 6)
+        nc.createDimension('x', 4)
+        var = nc.createVariable('v', 'i2', ('t','y','x'), contiguous=True, fill_value=-999)
+        var.scale_factor = 0.5
+        var.add_offset   = 10.0
+        var.set_auto_maskandscale(False)
+        var[:] = data
+
+    # Only uncompressed contiguous variables are memory-mapped.
+    assert get_memmap_layout(path_to_active, 'v')[1:] == ('<i2', (8, 6, 4))
+    assert get_memmap_layout(f'tests/rain_test.nc', 'p') is None
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={'chunks':{'t':2}, 'chunk_limits':False})
+    ref = xr.open_dataset(path_to_active)
+
+    assert np.allclose(ds['v'].to_numpy(), ref['v'].to_numpy(), equal_nan=True)
+    assert np.allclose(ds['v'][2:5, 1:3].to_numpy(), ref['v'][2:5, 1:3].to_numpy())
+    for method in ['mean', 'max', 'min', 'sum']:
+        assert np.isclose(
+            getattr(ds['v'], method)().to_numpy(), getattr(ref['v'], method)().to_numpy())
+        assert np.allclose(
+            getattr(ds['v'], method)(dim='t').to_numpy(), 
+            getattr(ref['v'], method)(dim='t').to_numpy())
+
+def test_active_lazy_open(tmp_path):
+
+    import netCDF4
+    from XarrayActive.wrappers import ActiveArrayWrapper
+
+    path_to_active = str(tmp_path / 'lazy_open_test.nc')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 6)
+        nc.createDimension('x', 4)
+        for i in range(3):
+            var = nc.createVariable(f'v{i}', 'f4', ('t','x'), contiguous=(i == 0))
+            var[:] = np.arange(24, dtype='f4').reshape(6, 4) + i
+
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            drop_variables=['v1', 'v2'],
+            active_options={'chunks':{'t':2}, 'chunk_limits':False})
+
+    assert list(ds.data_vars) == ['v0']
+
+    wrapper = ds['v0'].variable._data
+    while not isinstance(wrapper, ActiveArrayWrapper):
+        wrapper = wrapper.array
+
+    # The chunk layout and memmap location are only found once the variable is used.
+    for attr in ('chunk_shape', 'chunk_space', 'memmap'):
+        assert attr not in wrapper.__dict__
+
+    assert ds['v0'].mean().to_numpy() == 11.5
+    assert wrapper.chunk_space == (3, 1)
+    assert wrapper.memmap is not None
+
+def test_active_closed_dataset():
+
+    import gc
+
+    path_to_active = f'tests/rain_test.nc'
+
+    ref = xr.open_dataset(path_to_active)['p'].mean(dim='time').to_numpy()
+
+    # Variables are reduced after the dataset holding them is closed.
+    ds = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':2}})
+    p = ds['p']
+    ds.close()
+    assert np.allclose(p.mean(dim='time').to_numpy(), ref)
+
+    # Or after the dataset is garbage collected.
+    p = xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            active_options={'chunks':{'time':2}})['p']
+    gc.collect()
+    assert np.allclose(p.mean(dim='time').to_numpy(), ref)
+
+def test_active_metadata_cache(tmp_path):
+
+    import os
+    import netCDF4
+    from XarrayActive import MetadataCache
+
+    path_to_active = str(tmp_path / 'metadata_cache_test.nc')
+    cache_dir      = str(tmp_path / 'metadata_cache')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 6)
+        nc.createDimension('x', 4)
+        nc.createVariable('t', 'f8', ('t',))[:] = np.arange(6)
+        var = nc.createVariable('v', 'f4', ('t','x'), chunksizes=(2, 4), fill_value=-1)
+        var.units = 'K'
+        var[:] = np.arange(24, dtype='f4').reshape(6, 4)
+        var[0, 0] = -1
+
+    def open_cached():
+        return xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            metadata_cache=cache,
+            active_options={'chunks':{'t':2}, 'chunk_limits':False})
+
+    cache = MetadataCache(cache_dir)
+
+    ds = open_cached()
+    assert (cache.hits, cache.misses) == (0, 1)
+    ds = open_cached()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    ref = xr.open_dataset(path_to_active, mask_and_scale=True)
+    assert ds['v'].attrs == ref['v'].attrs
+    assert ds['v'].data.chunks == ((2, 2, 2), (4,))
+    assert np.array_equal(ds['t'].to_numpy(), ref['t'].to_numpy())
+    assert np.allclose(ds['v'].to_numpy(), ref['v'].to_numpy(), equal_nan=True)
+    assert np.isclose(ds['v'].mean().to_numpy(), ref['v'].mean().to_numpy())
+
+    # Entries are replaced when the file is modified.
+    stat = os.stat(path_to_active)
+    os.utime(path_to_active, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    ds = open_cached()
+    assert (cache.hits, cache.misses) == (1, 2)
+    ds = open_cached()
+    assert (cache.hits, cache.misses) == (2, 2)
+
+def test_active_result_cache(tmp_path):
+
+    import netCDF4
+    from XarrayActive import ActiveStats, ResultCache
+
+    path_to_active = str(tmp_path / 'result_cache_test.nc')
+    cache_dir      = str(tmp_path / 'result_cache')
+
+    with netCDF4.Dataset(path_to_active, mode='w') as nc:
+        nc.createDimension('t', 8)
+        nc.createDimension('x', 4)
+        var = nc.createVariable('v', 'f4', ('t','x'), chunksizes=(2, 4), fill_value=-1)
+        var[:] = np.arange(32, dtype='f4').reshape(8, 4)
+        var[0, 0] = -1
+
+    def open_cached(cache):
+        return xr.open_dataset(
+            path_to_active, 
+            engine='Active',
+            mask_and_scale=True,
+            active_options={'chunks':{'t':2}, 'chunk_limits':False, 'result_cache':cache})
+
+    ref = xr.open_dataset(path_to_active, mask_and_scale=True)
+    ds  = open_cached(ResultCache(directory=cache_dir))
+
+    with ActiveStats() as stats:
+        assert np.allclose(ds['v'].mean(dim='t'), ref['v'].mean(dim='t'))
+    assert stats.cached == 0
+
+    # Overlapping queries only reduce the partitions not seen before.
+    with ActiveStats() as stats:
+        assert np.allclose(ds['v'].mean(dim='t'), ref['v'].mean(dim='t'))
+        assert np.allclose(ds['v'][:6].mean(dim='t'), ref['v'][:6].mean(dim='t'))
+        assert np.isclose(ds['v'].max(), ref['v'].max())
+    assert stats.cached == 7
+
+    # Results on disk are shared with other caches using the same directory.
+    ds = open_cached(ResultCache(directory=cache_dir))
+    with ActiveStats() as stats:
+        assert np.allclose(ds['v'].mean(dim='t'), ref['v'].mean(dim='t'))
+    assert stats.cached == 4
+
+def test_active_mfdataset(tmp_path):
+
+    import netCDF4
+    from XarrayActive import open_active_mfdataset
+
+    paths = []
+    start = 0
+    for i, size in enumerate([5, 7, 3]):
+        path = str(tmp_path / f'mf_test_{i}.nc')
+        with netCDF4.Dataset(path, mode='w') as nc:
+            nc.createDimension('time', None)
+            nc.createDimension('x', 6)
+            time = nc.createVariable('time', 'f8', ('time',))
+            time.units = 'days since 2000-01-01'
+            time[:] = np.arange(start, start + size)
+            var = nc.createVariable('v', 'f4', ('time','x'), chunksizes=(2,6))
+            var[:] = np.arange(start*6, (start + size)*6, dtype='f4').reshape(size, 6)
+        paths.append(path)
+        start += size
+
+    ds = open_active_mfdataset(
+            paths, 
+            active_options={'chunks':{'time':4}, 'chunk_limits':False})
+    ref = xr.open_mfdataset(paths)
+
+    # A single array is built for all files, where no partition spans two files.
+    assert ds['v'].shape == (15, 6)
+    assert ds['v'].data.chunks[0] == (4, 1, 4, 3, 3)
+    assert (ds['time'].to_numpy() == np.arange(15)).all()
+
+    assert np.allclose(ds['v'][3:9].to_numpy(), ref['v'][3:9].to_numpy())
+    for method in ['mean', 'max', 'min', 'sum']:
+        assert np.isclose(
+            getattr(ds['v'], method)().to_numpy(), getattr(ref['v'], method)().to_numpy())
+        assert np.allclose(
+            getattr(ds['v'], method)(dim='time').to_numpy(), 
+            getattr(ref['v'], method)(dim='time').to_numpy())
+
+def test_active_mfdataset_decoding(tmp_path):
+
+    import netCDF4
+    from XarrayActive import open_active_mfdataset
+
+    def write(path, start, fill_value=-999.0):
+        with netCDF4.Dataset(path, mode='w') as nc:
+            nc.createDimension('time', None)
+            nc.createDimension('x', 4)
+            time = nc.createVariable('time', 'i4', ('time',))
+            time.units    = f'days since 2000-01-{start:02d}'
+            time.calendar = 'noleap'
+            time[:] = np.arange(3)
+            var = nc.createVariable('v', 'f4', ('time','x'), fill_value=fill_value)
+            var[:] = np.arange(12, dtype='f4').reshape(3, 4) + start
+
+    paths = [str(tmp_path / f'mf_units_{i}.nc') for i in range(2)]
+    write(paths[0], 1)
+    write(paths[1], 4)
+
+    # Times are converted to the units of the first file.
+    ds  = open_active_mfdataset(
+            paths, 
+            decode_times=True,
+            active_options={'chunks':{'time':2}, 'chunk_limits':False})
+    ref = xr.open_mfdataset(paths, decode_times=True)
+    assert (ds['time'].to_numpy() == ref['time'].to_numpy()).all()
+    assert np.allclose(ds['v'].mean(dim='time').to_numpy(), ref['v'].mean(dim='time').to_numpy())
+
+    # Files with different missing values cannot be decoded together.
+    other = str(tmp_path / 'mf_units_fill.nc')
+    write(other, 4, fill_value=-1.0)
+    try:
+        open_active_mfdataset([paths[0], other], active_options={'chunks':{'time':2}})
+    except ValueError:
+        pass
+    else:
+        assert False, 'Files with different missing values were opened'
+
 if __name__ == '__main__':
+    import tempfile
+    from pathlib import Path
+
     test_active()
     test_active_recursive()
     test_active_methods()
+    test_active_hyperslab()
+    test_active_hyperslab_no_axis(Path(tempfile.mkdtemp()))
+    test_active_client_pool()
+    test_active_auto_chunks()
+    test_active_empty(Path(tempfile.mkdtemp()))
+    test_active_graph_cache()
+    test_active_selection()
+    test_active_chunk_index(Path(tempfile.mkdtemp()))
+    test_active_concurrent_requests(Path(tempfile.mkdtemp()))
+    test_active_async()
+    test_active_streaming()
+    test_active_partials()
+    test_active_moments()
+    test_active_arg_reductions()
+    test_active_groupby()
+    test_active_weighted()
+    test_active_weighted_missing(Path(tempfile.mkdtemp()))
+    test_active_missing(Path(tempfile.mkdtemp()))
+    test_active_packed(Path(tempfile.mkdtemp()))
+    test_active_local_server()
+    test_active_stats()
+    test_active_requests_no_axis()
+    test_active_slabs()
+    test_active_memmap(Path(tempfile.mkdtemp()))
+    test_active_mfdataset(Path(tempfile.mkdtemp()))
+    test_active_mfdataset_decoding(Path(tempfile.mkdtemp()))
+    test_active_lazy_open(Path(tempfile.mkdtemp()))
+    test_active_closed_dataset()
+    test_active_metadata_cache(Path(tempfile.mkdtemp()))
+    test_active_result_cache(Path(tempfile.mkdtemp()))
     print('All tests passed!')
\ No newline at end of file